@@ -8,7 +8,8 @@
  *   getId: (row) => row.id,
  *   expandable: true,
  *   rowClass: (row) => row.active ? 'active' : '',
- *   rowStyle: (row) => ({ '--row-color': getColor(row) })
+ *   rowStyle: (row) => ({ '--row-color': getColor(row) }),
+ *   sortData: (rows, field, dir) => presortedOrNull(rows, field, dir)
  * })">
  *   <!-- Use template, see data-table.html for example -->
  * </div>
@@ -24,6 +25,7 @@ export function dataTable(config = {}) {
     rowStyle: config.rowStyle || null,
     onRowClick: config.onRowClick || null,
     onSortChange: config.onSortChange || null,
+    sortData: config.sortData || null, // Optional presorted lookup, null = sort here
     onExpandChange: config.onExpandChange || null,
 
     // === State ===
@@ -44,6 +46,9 @@ export function dataTable(config = {}) {
     get sortedData() {
       if (!this.sortField) return this.data;
 
+      const presorted = this.sortData?.(this.data, this.sortField, this.sortDir);
+      if (presorted) return presorted;
+
       const col = this.columns.find(c => c.key === this.sortField);
       const data = [...this.data];
 
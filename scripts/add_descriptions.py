@@ -1,9 +1,11 @@
 #!/usr/bin/env python3
 """Add description field to all event files."""
 
-import json
+import argparse
 import os
 
+from hpi.pipeline import Pipeline, add_arguments
+
 DESCRIPTIONS = {
     "an_lushan_rebellion": "A devastating civil war in Tang Dynasty China sparked by general An Lushan's rebellion against Emperor Xuanzong. The eight-year conflict destroyed the empire's heartland, caused massive population displacement, and left the Tang Dynasty permanently weakened. Census records suggest one of history's largest population losses.",
 
@@ -116,49 +118,42 @@ DESCRIPTIONS = {
     "yazidi_genocide": "ISIS's systematic campaign to destroy the Yazidi religious minority in Iraq. Thousands of men were executed and buried in mass graves. Women and girls were enslaved and trafficked. The UN recognized the atrocities as genocide; recovery efforts continue."
 }
 
-def add_description_to_file(filepath):
-    """Add description to a single event file."""
+def add_description_to_file(filepath, data, report):
+    """Pipeline transform: add description to a single event."""
     basename = os.path.basename(filepath).replace('.json', '')
 
     if basename not in DESCRIPTIONS:
-        print(f"No description for: {basename}")
-        return False
-
-    with open(filepath, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+        report.log(f"No description for: {basename}")
+        return
 
     # Add description after name
     if 'description' in data:
-        print(f"Already has description: {basename}")
-        return False
-
-    data['description'] = DESCRIPTIONS[basename]
-
-    # Reorder to put description after name
-    ordered = {}
-    for key in data:
-        ordered[key] = data[key]
+        report.log(f"Already has description: {basename}")
+        return
+
+    # Reorder to put description after name (rebuilt in place, since the
+    # pipeline writes the dict it passed in)
+    items = list(data.items())
+    data.clear()
+    for key, value in items:
+        data[key] = value
         if key == 'name':
-            ordered['description'] = DESCRIPTIONS[basename]
-
-    # Write back
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(ordered, f, indent=2, ensure_ascii=False)
+            data['description'] = DESCRIPTIONS[basename]
+    if 'description' not in data:
+        data['description'] = DESCRIPTIONS[basename]
 
-    print(f"Added description: {basename}")
-    return True
+    report.count('added')
+    report.log(f"Added description: {basename}")
 
 def main():
-    events_dir = 'data/events'
-    count = 0
+    parser = argparse.ArgumentParser(description="Add description field to all event files.")
+    add_arguments(parser)
+    args = parser.parse_args()
 
-    for filename in os.listdir(events_dir):
-        if filename.endswith('.json') and not filename.startswith('_'):
-            filepath = os.path.join(events_dir, filename)
-            if add_description_to_file(filepath):
-                count += 1
+    report = Pipeline([('descriptions', add_description_to_file)]).run(dry_run=args.dry_run, jobs=args.jobs)
 
-    print(f"\nAdded descriptions to {count} files")
+    print(f"\nAdded descriptions to {report.counts['added']} files")
+    print(report.summary())
 
 if __name__ == '__main__':
     main()
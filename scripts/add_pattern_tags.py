@@ -11,13 +11,29 @@ Pattern tags are assigned based on analysis of:
 - tier classification
 
 This enables accurate frequency counting instead of fuzzy keyword matching.
+
+Keywords from all PATTERNS are compiled once into an Aho-Corasick automaton
+(hpi.matcher), so each event's text is scanned once regardless of how many
+patterns/keywords exist. `--verify` checks it against the naive scan on the
+corpus, and tests/test_matcher.py adds edge cases (word boundaries,
+overlapping and nested keywords).
+
+Re-tagging is incremental: a sidecar cache (.cache/pattern_tags.json) keeps
+a hash of the PATTERNS rules and, per event, a hash of its searchable text,
+so only events whose text or rules changed are re-tagged. `--full` ignores
+the cache.
 """
 
+import argparse
+import hashlib
 import json
-from pathlib import Path
+import sys
+from bisect import bisect_right
+from functools import partial
 
-ROOT = Path(__file__).parent.parent
-DATA_DIR = ROOT / "data" / "events"
+from hpi.corpus import CACHE_DIR, load_corpus, write_text_atomic
+from hpi.matcher import KeywordMatcher
+from hpi.pipeline import Pipeline, add_arguments
 
 # Standard pattern tags with detection rules
 # WARNING SIGN patterns are detected from text (warning_signs, rationales, etc.)
@@ -120,47 +136,125 @@ PATTERNS = {
 }
 
 
-def get_searchable_text(event):
-    """Extract all searchable text from an event."""
-    texts = []
+def get_searchable_segments(event):
+    """Extract all searchable text from an event as (source field, text) pairs."""
+    segments = []
 
     # Warning signs
     signs = event.get("analysis", {}).get("warning_signs", [])
-    texts.extend(signs)
+    segments.extend((f"analysis.warning_signs[{i}]", sign) for i, sign in enumerate(signs))
 
     # Root causes
     causes = event.get("analysis", {}).get("root_causes", "")
     if causes:
-        texts.append(causes)
+        segments.append(("analysis.root_causes", causes))
 
     # Pattern note
     note = event.get("analysis", {}).get("pattern_note", "")
     if note:
-        texts.append(note)
+        segments.append(("analysis.pattern_note", note))
 
     # Rationales
     rationales = event.get("metrics", {}).get("rationales", {})
-    texts.extend(rationales.values())
+    segments.extend((f"metrics.rationales.{key}", text) for key, text in rationales.items())
 
     # Tags
     tags = event.get("tags", [])
-    texts.extend(tags)
+    segments.extend((f"tags[{i}]", tag) for i, tag in enumerate(tags))
 
     # Tier
     tier = event.get("analysis", {}).get("tier", "")
-    texts.append(tier)
+    segments.append(("analysis.tier", tier))
 
     # Mortality note
     mortality_note = event.get("metrics", {}).get("mortality", {}).get("note", "")
     if mortality_note:
-        texts.append(mortality_note)
+        segments.append(("metrics.mortality.note", mortality_note))
+
+    return segments
+
+
+def get_searchable_text(event):
+    """Extract all searchable text from an event."""
+    return " ".join(text for _, text in get_searchable_segments(event)).lower()
+
+
+def compile_patterns(patterns, word_boundary=False):
+    """Compile a PATTERNS table into (matcher, keyword -> set of pattern ids)."""
+    keyword_patterns = {}
+    for pattern_id, pattern_def in patterns.items():
+        for keyword in pattern_def.get("keywords", []):
+            keyword_patterns.setdefault(keyword, set()).add(pattern_id)
+    return KeywordMatcher(keyword_patterns, word_boundary=word_boundary), keyword_patterns
 
-    return " ".join(texts).lower()
 
+# Built once per process; the word-boundary variant only when first needed
+_compiled = {}
 
-def detect_patterns(event):
+
+def get_compiled(word_boundary=False):
+    """Return the compiled PATTERNS table for the given matching mode."""
+    if word_boundary not in _compiled:
+        _compiled[word_boundary] = compile_patterns(PATTERNS, word_boundary)
+    return _compiled[word_boundary]
+
+
+def detect_patterns(event, word_boundary=False):
     """Detect which patterns apply to an event based on text content only."""
     text = get_searchable_text(event)
+    matcher, keyword_patterns = get_compiled(word_boundary)
+
+    detected = set()
+    for keyword in matcher.matched(text):
+        detected.update(keyword_patterns[keyword])
+
+    return sorted(detected)
+
+
+def detect_patterns_with_evidence(event, word_boundary=False):
+    """
+    Detect patterns and record why, in the same single scan.
+
+    Returns (tags, evidence) where evidence maps each detected pattern to its
+    matches: {"keyword", "field", "start", "end"}, with offsets into the
+    (lower-cased) text of that field. A match that runs across the space
+    joining two fields is attributed to the field it starts in.
+    """
+    segments = get_searchable_segments(event)
+    text = " ".join(field_text for _, field_text in segments).lower()
+    matcher, keyword_patterns = get_compiled(word_boundary)
+
+    # Start offset of each field in the joined text
+    starts = []
+    offset = 0
+    for _, field_text in segments:
+        starts.append(offset)
+        offset += len(field_text.lower()) + 1
+
+    found = {}
+    for start, end, keyword in matcher.finditer(text):
+        index = bisect_right(starts, start) - 1
+        field_start = starts[index]
+        match = {
+            "keyword": keyword,
+            "field": segments[index][0],
+            "start": start - field_start,
+            "end": end - field_start,
+        }
+        for pattern_id in keyword_patterns[keyword]:
+            found.setdefault(pattern_id, []).append((start, keyword, match))
+
+    # Deterministic layout: patterns sorted, matches in text order
+    evidence = {
+        pattern_id: [match for _, _, match in sorted(found[pattern_id], key=lambda m: m[:2])]
+        for pattern_id in sorted(found)
+    }
+    return list(evidence), evidence
+
+
+def detect_patterns_naive(event):
+    """Reference implementation: one substring scan per keyword (used by --verify)."""
+    text = get_searchable_text(event)
     detected = []
 
     for pattern_id, pattern_def in PATTERNS.items():
@@ -173,35 +267,119 @@ def detect_patterns(event):
     return sorted(detected)
 
 
-def process_events():
-    """Process all events and add pattern_tags."""
-    files = sorted(DATA_DIR.glob("*.json"))
+TAG_CACHE_PATH = CACHE_DIR / "pattern_tags.json"
+
+# Loaded lazily, once per process (each --jobs worker reads it on its own)
+_tag_cache = None
+
+
+def rules_hash(word_boundary=False):
+    """Hash of everything besides the event text that affects tagging."""
+    payload = json.dumps({"patterns": PATTERNS, "word_boundary": word_boundary}, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def text_hash(event):
+    """Hash of the text that get_searchable_text produces for an event."""
+    return hashlib.sha256(get_searchable_text(event).encode("utf-8")).hexdigest()
+
 
-    for filepath in files:
-        if "template" in filepath.name:
-            continue
+def load_tag_cache():
+    """Return the sidecar cache: {"rules": hash, "events": {stem: {"text": hash, "tags": [...]}}}."""
+    global _tag_cache
+    if _tag_cache is None:
+        try:
+            with open(TAG_CACHE_PATH, encoding="utf-8") as f:
+                _tag_cache = json.load(f)
+        except (OSError, ValueError):
+            _tag_cache = {"rules": None, "events": {}}
+    return _tag_cache
 
-        with open(filepath, encoding="utf-8") as f:
-            event = json.load(f)
 
-        # Detect patterns
-        patterns = detect_patterns(event)
+def save_tag_cache(report, word_boundary=False):
+    """Write the cache entries collected during a (non dry-run) tagging pass."""
+    cache = {"rules": rules_hash(word_boundary), "events": dict(report.collected["tag_cache"])}
+    TAG_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    write_text_atomic(TAG_CACHE_PATH, json.dumps(cache, indent=1, sort_keys=True))
 
-        # Add to analysis section
-        if "analysis" not in event:
-            event["analysis"] = {}
 
-        event["analysis"]["pattern_tags"] = patterns
+def tag_event(filepath, event, report, word_boundary=False, incremental=True):
+    """Pipeline transform: set analysis.pattern_tags and pattern_evidence from the event text."""
+    digest = text_hash(event)
+    analysis = event.get("analysis", {})
 
-        # Write back
-        with open(filepath, "w", encoding="utf-8") as f:
-            json.dump(event, f, indent=2, ensure_ascii=False)
-            f.write("\n")
+    # Skip events whose text, rules and stored tags match the cache
+    if incremental:
+        cache = load_tag_cache()
+        entry = cache["events"].get(filepath.stem) if cache["rules"] == rules_hash(word_boundary) else None
+        if (entry and entry["text"] == digest and analysis.get("pattern_tags") == entry["tags"]
+                and "pattern_evidence" in analysis):
+            report.count("tagged")
+            report.count("skipped")
+            report.collect("tag_cache", (filepath.stem, entry))
+            report.log(f"{filepath.name}: unchanged ({len(entry['tags'])} tags)")
+            return
 
-        print(f"{filepath.name}: {len(patterns)} tags - {', '.join(patterns)}")
+    # Detect patterns (tags and evidence come from the same scan)
+    patterns, evidence = detect_patterns_with_evidence(event, word_boundary=word_boundary)
+
+    # Add to analysis section
+    if "analysis" not in event:
+        event["analysis"] = {}
+
+    event["analysis"]["pattern_tags"] = patterns
+    event["analysis"]["pattern_evidence"] = evidence
+
+    report.count("tagged")
+    report.count("recomputed")
+    report.collect("tag_cache", (filepath.stem, {"text": digest, "tags": patterns}))
+    report.log(f"{filepath.name}: {len(patterns)} tags - {', '.join(patterns)}")
+
+
+def verify():
+    """Check that the automaton returns the same tags as the naive scan for every event."""
+    mismatches = 0
+    events = load_corpus()
+    for filepath, event in events:
+        fast, naive = detect_patterns(event), detect_patterns_naive(event)
+        with_evidence, _ = detect_patterns_with_evidence(event)
+        if fast != naive or with_evidence != naive:
+            mismatches += 1
+            print(f"✗ {filepath.name}: automaton {fast} / with evidence {with_evidence} != naive {naive}")
+
+    print(f"Verified {len(events)} events: {mismatches} mismatches")
+    return mismatches == 0
+
+
+def tag_summary(report):
+    """One-line skipped/recomputed summary for a tagging pass."""
+    return (f"Pattern tags: {report.counts['recomputed']} recomputed, "
+            f"{report.counts['skipped']} skipped (text and rules unchanged)")
+
+
+def process_events(dry_run=False, jobs=1, word_boundary=False, incremental=True):
+    """Process all events and add pattern_tags."""
+    transform = partial(tag_event, word_boundary=word_boundary, incremental=incremental)
+    report = Pipeline([("pattern_tags", transform)]).run(dry_run=dry_run, jobs=jobs)
+    if not dry_run:
+        save_tag_cache(report, word_boundary)
 
-    print(f"\nProcessed {len(files) - 1} events")
+    print(f"\nProcessed {report.counts['tagged']} events")
+    print(tag_summary(report))
+    print(report.summary())
 
 
 if __name__ == "__main__":
-    process_events()
+    parser = argparse.ArgumentParser(description="Add pattern_tags to all events.")
+    add_arguments(parser)
+    parser.add_argument("--word-boundary", action="store_true",
+                        help="only count keywords that match whole words")
+    parser.add_argument("--full", action="store_true",
+                        help="re-tag every event, ignoring the incremental cache")
+    parser.add_argument("--verify", action="store_true",
+                        help="compare the automaton against the naive keyword scan and exit")
+    args = parser.parse_args()
+    if args.verify:
+        sys.exit(0 if verify() else 1)
+    process_events(dry_run=args.dry_run, jobs=args.jobs, word_boundary=args.word_boundary,
+                   incremental=not args.full)
@@ -4,11 +4,9 @@ Adds rationales (justifications) for score breakdowns to each event.
 Each rationale explains WHY the checkboxes are marked as they are.
 """
 
-import json
-from pathlib import Path
+import argparse
 
-ROOT = Path(__file__).parent.parent
-DATA_DIR = ROOT / "data" / "events"
+from hpi.pipeline import Pipeline, add_arguments
 
 # Rationales for each event - explaining the scoring decisions
 RATIONALES = {
@@ -285,39 +283,38 @@ RATIONALES = {
 }
 
 
-def add_rationales():
-    """Add rationales to all event files."""
-    for filepath in sorted(DATA_DIR.glob("*.json")):
-        if "template" in filepath.name:
-            continue
+def add_rationale(filepath, event, report):
+    """Pipeline transform: set metrics.rationales for one event."""
+    event_id = event.get("id", "").split("_")[:-1]  # Remove year suffix
+    event_key = "_".join(event_id) if event_id else filepath.stem
 
-        with open(filepath, encoding="utf-8") as f:
-            event = json.load(f)
+    # Try different key formats
+    rationale = RATIONALES.get(event_key)
+    if not rationale:
+        rationale = RATIONALES.get(filepath.stem)
+    if not rationale:
+        # Try without year suffix
+        for key in RATIONALES:
+            if filepath.stem.startswith(key):
+                rationale = RATIONALES[key]
+                break
 
-        event_id = event.get("id", "").split("_")[:-1]  # Remove year suffix
-        event_key = "_".join(event_id) if event_id else filepath.stem
+    if rationale:
+        event["metrics"]["rationales"] = rationale
+        report.log(f"Added rationales to {filepath.name}")
+    else:
+        report.log(f"No rationale found for {filepath.name} (key: {event_key})")
 
-        # Try different key formats
-        rationale = RATIONALES.get(event_key)
-        if not rationale:
-            rationale = RATIONALES.get(filepath.stem)
-        if not rationale:
-            # Try without year suffix
-            for key in RATIONALES:
-                if filepath.stem.startswith(key):
-                    rationale = RATIONALES[key]
-                    break
 
-        if rationale:
-            event["metrics"]["rationales"] = rationale
-            with open(filepath, "w", encoding="utf-8") as f:
-                json.dump(event, f, indent=2, ensure_ascii=False)
-                f.write("\n")
-            print(f"Added rationales to {filepath.name}")
-        else:
-            print(f"No rationale found for {filepath.name} (key: {event_key})")
+def add_rationales(dry_run=False, jobs=1):
+    """Add rationales to all event files."""
+    report = Pipeline([("rationales", add_rationale)]).run(dry_run=dry_run, jobs=jobs)
+    print(report.summary())
 
 
 if __name__ == "__main__":
-    add_rationales()
+    parser = argparse.ArgumentParser(description="Add score rationales to all events.")
+    add_arguments(parser)
+    args = parser.parse_args()
+    add_rationales(dry_run=args.dry_run, jobs=args.jobs)
     print("Done!")
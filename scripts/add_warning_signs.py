@@ -4,11 +4,9 @@ Adds warning_signs and root_causes to each event.
 These help identify patterns that could repeat.
 """
 
-import json
-from pathlib import Path
+import argparse
 
-ROOT = Path(__file__).parent.parent
-DATA_DIR = ROOT / "data" / "events"
+from hpi.pipeline import Pipeline, add_arguments
 
 # Warning signs and root causes for each event
 CAUSES = {
@@ -425,30 +423,28 @@ CAUSES = {
 }
 
 
-def add_causes():
-    """Add warning_signs and root_causes to all event files."""
-    for filepath in sorted(DATA_DIR.glob("*.json")):
-        if "template" in filepath.name:
-            continue
-
-        with open(filepath, encoding="utf-8") as f:
-            event = json.load(f)
+def add_event_causes(filepath, event, report):
+    """Pipeline transform: set analysis.warning_signs and root_causes for one event."""
+    # Try to match the file to our causes dict
+    causes = CAUSES.get(filepath.stem)
 
-        # Try to match the file to our causes dict
-        causes = CAUSES.get(filepath.stem)
+    if causes:
+        event["analysis"]["warning_signs"] = causes["warning_signs"]
+        event["analysis"]["root_causes"] = causes["root_causes"]
+        report.log(f"Added causes to {filepath.name}")
+    else:
+        report.log(f"No causes found for {filepath.name}")
 
-        if causes:
-            event["analysis"]["warning_signs"] = causes["warning_signs"]
-            event["analysis"]["root_causes"] = causes["root_causes"]
 
-            with open(filepath, "w", encoding="utf-8") as f:
-                json.dump(event, f, indent=2, ensure_ascii=False)
-                f.write("\n")
-            print(f"Added causes to {filepath.name}")
-        else:
-            print(f"No causes found for {filepath.name}")
+def add_causes(dry_run=False, jobs=1):
+    """Add warning_signs and root_causes to all event files."""
+    report = Pipeline([("warning_signs", add_event_causes)]).run(dry_run=dry_run, jobs=jobs)
+    print(report.summary())
 
 
 if __name__ == "__main__":
-    add_causes()
+    parser = argparse.ArgumentParser(description="Add warning_signs and root_causes to all events.")
+    add_arguments(parser)
+    args = parser.parse_args()
+    add_causes(dry_run=args.dry_run, jobs=args.jobs)
     print("Done!")
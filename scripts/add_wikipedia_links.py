@@ -4,82 +4,56 @@ Add Wikipedia URLs to event JSON files.
 Uses Wikipedia API to find matching articles.
 """
 
-import json
-import os
-import urllib.request
-import urllib.parse
-import time
-
-EVENTS_DIR = os.path.join(os.path.dirname(__file__), '..', 'data', 'events')
-
-def search_wikipedia(query):
-    """Search Wikipedia and return the best matching article URL."""
-    encoded = urllib.parse.quote(query)
-    api_url = f"https://en.wikipedia.org/w/api.php?action=opensearch&search={encoded}&limit=3&format=json"
-
-    try:
-        req = urllib.request.Request(
-            api_url,
-            headers={'User-Agent': 'HistoricalPatternIndex/1.0 (research project)'}
-        )
-        with urllib.request.urlopen(req, timeout=10) as response:
-            data = json.loads(response.read().decode())
-            # data = [query, [titles], [descriptions], [urls]]
-            if len(data) >= 4 and data[3]:
-                return data[1][0], data[3][0]  # title, url
-    except Exception as e:
-        print(f"  Error searching: {e}")
-
-    return None, None
-
-def process_events():
+import argparse
+from functools import partial
+
+from hpi import wikipedia
+from hpi.corpus import load_corpus
+from hpi.pipeline import Pipeline, add_arguments
+
+def add_link(filepath, event, report, matches=None, resolver=None):
+    """Pipeline transform: add wikipedia_url to one event (from prefetched matches if given, else via resolver)."""
+    # Skip if already has wikipedia_url
+    if event.get('wikipedia_url'):
+        report.log(f"✓ {event['name'][:50]} - already has URL")
+        report.count('skipped')
+        return
+
+    report.log(f"\n→ {event['name']}")
+
+    # Search Wikipedia
+    match = matches.get(event['name']) if matches else None
+    title, url, error = match or (resolver or wikipedia.get_resolver()).search(event['name'])
+    if error:
+        report.log(f"  Error searching: {error}")
+
+    if url:
+        report.log(f"  Found: {title}")
+        report.log(f"  URL: {url}")
+
+        # Add to event
+        event['wikipedia_url'] = url
+        report.count('updated')
+    else:
+        report.log(f"  ⚠ No match found - needs manual review")
+        report.collect('manual_review', event['name'])
+
+def process_events(dry_run=False, resolver=None):
     """Process all event files and add Wikipedia URLs."""
-    files = sorted([f for f in os.listdir(EVENTS_DIR) if f.endswith('.json') and f != '_template.json'])
-
-    updated = 0
-    skipped = 0
-    manual_review = []
-
-    for filename in files:
-        filepath = os.path.join(EVENTS_DIR, filename)
-
-        with open(filepath, 'r', encoding='utf-8') as f:
-            event = json.load(f)
-
-        # Skip if already has wikipedia_url
-        if event.get('wikipedia_url'):
-            print(f"✓ {event['name'][:50]} - already has URL")
-            skipped += 1
-            continue
-
-        print(f"\n→ {event['name']}")
-
-        # Search Wikipedia
-        title, url = search_wikipedia(event['name'])
-
-        if url:
-            print(f"  Found: {title}")
-            print(f"  URL: {url}")
-
-            # Add to event
-            event['wikipedia_url'] = url
-
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(event, f, indent=2, ensure_ascii=False)
-                f.write('\n')
-
-            updated += 1
-        else:
-            print(f"  ⚠ No match found - needs manual review")
-            manual_review.append(event['name'])
+    # Resolve every missing link concurrently up front; the pass itself does no I/O
+    resolver = resolver or wikipedia.get_resolver()
+    queries = [event['name'] for _, event in load_corpus() if not event.get('wikipedia_url')]
+    matches = resolver.search_many(queries)
 
-        # Rate limit
-        time.sleep(0.5)
+    report = Pipeline([('wikipedia_url', partial(add_link, matches=matches, resolver=resolver))]).run(dry_run=dry_run)
+    manual_review = report.collected['manual_review']
 
     print(f"\n{'='*50}")
-    print(f"Updated: {updated}")
-    print(f"Skipped (already had URL): {skipped}")
+    print(f"Updated: {report.counts['updated']}")
+    print(f"Skipped (already had URL): {report.counts['skipped']}")
     print(f"Needs manual review: {len(manual_review)}")
+    print(resolver.summary())
+    print(report.summary())
 
     if manual_review:
         print("\nEvents needing manual Wikipedia URLs:")
@@ -87,4 +61,9 @@ def process_events():
             print(f"  - {name}")
 
 if __name__ == '__main__':
-    process_events()
+    parser = argparse.ArgumentParser(description="Add Wikipedia URLs to event JSON files.")
+    add_arguments(parser, jobs=False)  # lookups are concurrent; the file pass is cheap
+    wikipedia.add_arguments(parser)
+    args = parser.parse_args()
+    with wikipedia.from_args(args) as resolver:
+        process_events(dry_run=args.dry_run, resolver=resolver)
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Checks that every event's metrics.scores still match its metrics.breakdowns.
+
+Reports scores that differ from their breakdown, breakdown keys that are not
+in data/schema.json, and out-of-range values. Exits with status 1 if anything
+was found.
+
+--columns audits the columnar export (data/columns.npz, written by
+export_columns.py) with NumPy instead of the event files. It is much faster
+but only checks the scores against the breakdowns (see hpi/audit.py).
+
+Usage:
+  python scripts/audit_scores.py
+  python scripts/audit_scores.py --fix [--dry-run]   # rewrite scores from breakdowns
+  python scripts/audit_scores.py --columns           # audit data/columns.npz
+  python scripts/audit_scores.py --benchmark 100000  # time both audits on a replicated corpus
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+from hpi.audit import audit, audit_columns
+from hpi.columnar import COLUMNS_PATH, ROW_COLUMNS, build_columns, load_columns, save_columns
+from hpi.corpus import load_events
+from hpi.pipeline import Pipeline, Report, add_arguments
+from hpi.scoring import recompute_all
+
+
+def recompute_scores(filepath: Path, event: dict, report: Report) -> None:
+    """Pipeline transform: set every category score from its breakdown."""
+    for _, category, old, new in recompute_all([event]):
+        report.count("fixed")
+        report.log(f"✓ {filepath.stem:40} {category:21} {old} → {new}")
+
+
+def benchmark(events, n):
+    """Time the audit on the corpus replicated to n events, from the dicts and from memory-mapped columns."""
+    copies = (events * (n // len(events) + 1))[:n]
+    start = time.perf_counter()
+    findings = audit(copies)
+    elapsed = time.perf_counter() - start
+    print(f"Audited {len(copies):,} events in {elapsed:.3f}s ({len(findings):,} findings)")
+
+    columns = build_columns(events)  # RuntimeError without NumPy
+    import numpy as np
+
+    reps = n // len(events) + 1
+    tiled = {
+        name: np.tile(array, (reps,) + (1,) * (array.ndim - 1))[:n] if name in ROW_COLUMNS else array
+        for name, array in columns.items()
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "columns.npz"
+        save_columns(tiled, path)
+        start = time.perf_counter()
+        findings = audit_columns(load_columns(path))
+        elapsed = time.perf_counter() - start
+    print(f"Audited {n:,} memory-mapped rows in {elapsed * 1000:.1f} ms ({len(findings):,} findings)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fix", action="store_true", help="recompute stored scores from the breakdowns")
+    parser.add_argument("--columns", action="store_true", help=f"audit {COLUMNS_PATH.name} instead of the event files")
+    parser.add_argument("--benchmark", type=int, metavar="N", help="time the audit on N (replicated) events")
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    if args.fix:
+        report = Pipeline([("scores", recompute_scores)]).run(dry_run=args.dry_run, jobs=args.jobs)
+        print(f"\n✓ Fixed {report.counts['fixed']} scores")
+        print(report.summary())
+        return
+
+    try:
+        if args.columns:
+            columns = load_columns(COLUMNS_PATH)
+            count = len(columns["id"])
+            findings = audit_columns(columns)
+        else:
+            events = load_events()
+            if args.benchmark:
+                benchmark(events, args.benchmark)
+                return
+            count = len(events)
+            findings = audit(events)
+    except (RuntimeError, FileNotFoundError, ValueError) as e:
+        sys.exit(f"❌ {e}")
+
+    for finding in findings:
+        print(finding.format())
+
+    if not findings:
+        print(f"✓ {count} events: all scores match their breakdowns")
+        return
+
+    counts = Counter(finding.kind for finding in findings)
+    print(f"\n{len(findings)} findings in {count} events: "
+          + ", ".join(f"{count} {kind}" for kind, count in sorted(counts.items())))
+    sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
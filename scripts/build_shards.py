@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Builds the summary/detail shards the web app loads.
+
+  data/summary.<hash>.json compact summary of every event + knowledge data (+ .gz,
+                           listed in data/manifest.json, see update_index.write_hashed)
+  data/details/<id>.json   full event record, fetched when a row is expanded
+
+Like the summary, a detail file is only written when its bytes changed, so
+an unchanged event keeps its file (and mtime, for HTTP caching) across builds.
+
+Usage: python scripts/build_shards.py
+"""
+
+import os
+from pathlib import Path
+
+from hpi.corpus import load_events, load_knowledge_lost, load_knowledge_saved, write_bytes_if_changed
+from hpi.joins import Joins
+from hpi.rollup import Rollup
+from hpi.shards import summarize_event, detail_filename
+from update_index import build_bundle, dumps, write_hashed
+
+ROOT = Path(__file__).parent.parent
+DETAILS_DIR = ROOT / "data" / "details"
+
+
+def write_details(events, details_dir=DETAILS_DIR):
+    """
+    Write one detail file per event (only those that changed) and remove stale
+    ones. Returns (total bytes of the records, files written).
+    """
+    details_dir.mkdir(parents=True, exist_ok=True)
+    names = set()
+    total = written = 0
+    for event in events:
+        name = detail_filename(event)
+        data = dumps(event).encode("utf-8")
+        written += write_bytes_if_changed(details_dir / name, data)
+        names.add(name)
+        total += len(data)
+
+    for name in os.listdir(details_dir):
+        if name.endswith(".json") and name not in names:
+            os.remove(details_dir / name)
+
+    return total, written
+
+
+def main():
+    events = load_events()
+    summaries = [summarize_event(e) for e in events]
+
+    # Joins and rollup come from the full records (summaries lack e.g. pattern tags)
+    lost, saved = load_knowledge_lost(), load_knowledge_saved()
+    joins = Joins(events, lost, saved)
+    shard = build_bundle(summaries, lost, saved, joins, Rollup(events, joins))
+    shard["detailPath"] = "data/details/"
+    data = dumps(shard).encode("utf-8")
+    url, written = write_hashed("summary", data)
+
+    full_bytes, details_written = write_details(events)
+    summary_bytes = len(dumps(summaries).encode("utf-8"))
+    saved_pct = round((1 - summary_bytes / full_bytes) * 100) if full_bytes else 0
+
+    print(f"{'Wrote' if written else 'Up to date:'} {url} ({len(data):,} bytes)")
+    print(f"Wrote {details_written} of {len(events)} detail files to {DETAILS_DIR} "
+          f"({len(events) - details_written} unchanged)")
+    print(f"Event payload for the list view: {summary_bytes:,} bytes "
+          f"(full records: {full_bytes:,} bytes, {saved_pct}% smaller)")
+
+
+if __name__ == "__main__":
+    main()
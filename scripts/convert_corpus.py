@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Converts the event corpus between its two storage layouts.
+
+  files   data/events/<name>.json, one pretty-printed event per file
+  jsonl   data/events.jsonl + data/events.idx (id -> line index, hpi/jsonl.py)
+
+The conversion round-trips exactly: file names and the committed file
+formatting are restored. The scripts read whichever layout is present
+(data/events.jsonl is used once data/events/ holds no event files, so pass
+--remove to switch over).
+
+Usage:
+  python scripts/convert_corpus.py --to-jsonl [--remove]   # files -> JSONL (--remove deletes the files)
+  python scripts/convert_corpus.py --to-files [--remove]   # JSONL -> files (--remove deletes the stream)
+  python scripts/convert_corpus.py --check                 # round-trip in a temp dir and compare bytes
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from hpi.corpus import EVENTS_DIR, EVENTS_JSONL, event_paths, write_event
+from hpi.jsonl import JsonlStore, index_path, write_jsonl
+
+
+def files_to_jsonl(events_dir, jsonl_path):
+    """Write every event file into a JSONL stream. Returns the number of events."""
+    items = [(path.name, json_load(path)) for path in event_paths(events_dir)]
+    return write_jsonl(items, jsonl_path)
+
+
+def jsonl_to_files(jsonl_path, events_dir):
+    """Write every event of a JSONL stream back to its own file. Returns the number of events."""
+    events_dir = Path(events_dir)
+    events_dir.mkdir(parents=True, exist_ok=True)
+    count = 0
+    with JsonlStore(jsonl_path) as store:
+        for name, event in store:
+            write_event(events_dir / name, event)
+            count += 1
+    return count
+
+
+def json_load(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def check(events_dir):
+    """Convert to JSONL and back in a temp dir; returns the names of files that differ."""
+    paths = event_paths(events_dir)
+    with tempfile.TemporaryDirectory() as tmp:
+        jsonl_path = Path(tmp) / "events.jsonl"
+        out_dir = Path(tmp) / "events"
+        files_to_jsonl(events_dir, jsonl_path)
+
+        with JsonlStore(jsonl_path) as store:
+            for path in paths:
+                event = json_load(path)
+                if store.get(event.get("id")) is None:
+                    return [f"{path.name} (id {event.get('id')!r} not found in the index)"]
+
+        jsonl_to_files(jsonl_path, out_dir)
+        return [
+            path.name for path in paths
+            if not (out_dir / path.name).exists() or (out_dir / path.name).read_bytes() != path.read_bytes()
+        ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    mode = parser.add_mutually_exclusive_group(required=True)
+    mode.add_argument("--to-jsonl", action="store_true", help="convert data/events/*.json to data/events.jsonl")
+    mode.add_argument("--to-files", action="store_true", help="convert data/events.jsonl to data/events/*.json")
+    mode.add_argument("--check", action="store_true", help="verify that the conversion round-trips exactly")
+    parser.add_argument("--remove", action="store_true", help="delete the source layout after converting")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.check:
+        differing = check(EVENTS_DIR)
+        if differing:
+            sys.exit("❌ Round trip changed: " + ", ".join(differing))
+        print(f"✓ {len(event_paths(EVENTS_DIR))} events round-trip exactly ({time.perf_counter() - start:.2f}s)")
+        return
+
+    if args.to_jsonl:
+        count = files_to_jsonl(EVENTS_DIR, EVENTS_JSONL)
+        print(f"Wrote {count} events to {EVENTS_JSONL} (+ {index_path(EVENTS_JSONL).name})")
+        if args.remove:
+            for path in event_paths(EVENTS_DIR):
+                path.unlink()
+            print(f"Removed the event files from {EVENTS_DIR}")
+        else:
+            print(f"Note: {EVENTS_DIR} still holds the event files, so the scripts keep reading those")
+    else:
+        count = jsonl_to_files(EVENTS_JSONL, EVENTS_DIR)
+        print(f"Wrote {count} event files to {EVENTS_DIR}")
+        if args.remove:
+            EVENTS_JSONL.unlink()
+            index_path(EVENTS_JSONL).unlink()
+            print(f"Removed {EVENTS_JSONL}")
+
+
+if __name__ == "__main__":
+    main()
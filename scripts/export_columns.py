@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Exports the event corpus as typed columns to data/columns.npz (hpi/columnar.py).
+
+Requires NumPy. The archive is uncompressed so hpi.columnar.load_columns()
+can memory-map it.
+
+Usage:
+  python scripts/export_columns.py
+  python scripts/export_columns.py --verify           # cross-check column stats against calc_stats
+  python scripts/export_columns.py --benchmark 1000000  # time stats on N synthetic rows (memory-mapped)
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from hpi.columnar import COLUMNS_PATH, ROW_COLUMNS, build_columns, load_columns, save_columns, stats
+from hpi.corpus import load_events, load_knowledge_lost, load_knowledge_saved
+from hpi.joins import Joins
+
+
+def verify(events, joins, columns):
+    """Compare the column-wise stats with update_readme.calc_stats. Returns the differing keys."""
+    from update_readme import calc_stats
+
+    expected = calc_stats(events, joins)
+    expected["by_denial"] = {status: cell.count for status, cell in expected["rollup"].by("denial_status").items()}
+    actual = stats(columns)
+    return [key for key, value in actual.items() if expected[key] != value]
+
+
+def benchmark(columns, n):
+    """Tile the corpus columns to n rows, write and memory-map them, and time stats()."""
+    import numpy as np
+
+    reps = n // len(columns["id"]) + 1
+    synthetic = {
+        name: np.tile(array, (reps,) + (1,) * (array.ndim - 1))[:n] if name in ROW_COLUMNS else array
+        for name, array in columns.items()
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "columns.npz"
+        size = save_columns(synthetic, path)
+        start = time.perf_counter()
+        mapped = load_columns(path)
+        loaded = time.perf_counter() - start
+        start = time.perf_counter()
+        result = stats(mapped)
+        elapsed = time.perf_counter() - start
+    print(f"{n:,} rows ({size / 1e6:.0f} MB): mapped in {loaded * 1000:.1f} ms, "
+          f"stats in {elapsed * 1000:.1f} ms ({result['deaths_max']:,} max deaths)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--verify", action="store_true", help="cross-check column stats against calc_stats")
+    parser.add_argument("--benchmark", type=int, metavar="N", help="time stats on N synthetic (tiled) rows")
+    args = parser.parse_args()
+
+    events = load_events()
+    joins = Joins(events, load_knowledge_lost(), load_knowledge_saved())
+    try:
+        columns = build_columns(events, joins)
+    except RuntimeError as e:
+        sys.exit(f"❌ {e}")
+
+    if args.benchmark:
+        benchmark(columns, args.benchmark)
+        return
+
+    size = save_columns(columns, COLUMNS_PATH)
+    print(f"Wrote {COLUMNS_PATH} ({len(events)} events, {len(columns)} columns, {size:,} bytes)")
+
+    if args.verify:
+        mismatches = verify(events, joins, load_columns(COLUMNS_PATH))
+        if mismatches:
+            sys.exit(f"❌ Column stats differ from calc_stats: {', '.join(mismatches)}")
+        print("✓ Column stats match calc_stats")
+
+
+if __name__ == "__main__":
+    main()
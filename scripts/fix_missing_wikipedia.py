@@ -3,13 +3,12 @@
 Fix missing Wikipedia URLs with manual search terms.
 """
 
-import json
-import os
-import urllib.request
-import urllib.parse
-import time
+import argparse
+from functools import partial
 
-EVENTS_DIR = os.path.join(os.path.dirname(__file__), '..', 'data', 'events')
+from hpi import wikipedia
+from hpi.corpus import load_corpus
+from hpi.pipeline import Pipeline, add_arguments
 
 # Manual mappings for events that need different search terms
 MANUAL_SEARCH = {
@@ -46,73 +45,58 @@ MANUAL_SEARCH = {
     "The Black War (Tasmania)": "Black War",
 }
 
-def search_wikipedia(query):
-    """Search Wikipedia and return the best matching article URL."""
-    encoded = urllib.parse.quote(query)
-    api_url = f"https://en.wikipedia.org/w/api.php?action=opensearch&search={encoded}&limit=3&format=json"
-
-    try:
-        req = urllib.request.Request(
-            api_url,
-            headers={'User-Agent': 'HistoricalPatternIndex/1.0 (research project)'}
-        )
-        with urllib.request.urlopen(req, timeout=10) as response:
-            data = json.loads(response.read().decode())
-            if len(data) >= 4 and data[3]:
-                return data[1][0], data[3][0]
-    except Exception as e:
-        print(f"  Error: {e}")
-
-    return None, None
-
-def process_events():
+def fix_link(filepath, event, report, matches=None, resolver=None):
+    """Pipeline transform: look up a missing wikipedia_url using MANUAL_SEARCH (prefetched matches, else resolver)."""
+    # Skip if already has URL
+    if event.get('wikipedia_url'):
+        return
+
+    name = event['name']
+    if name not in MANUAL_SEARCH:
+        return
+
+    search_term = MANUAL_SEARCH[name]
+    report.log(f"→ {name}")
+    report.log(f"  Searching: {search_term}")
+
+    match = matches.get(search_term) if matches else None
+    title, url, error = match or (resolver or wikipedia.get_resolver()).search(search_term)
+    if error:
+        report.log(f"  Error: {error}")
+
+    if url:
+        report.log(f"  Found: {url}")
+        event['wikipedia_url'] = url
+        report.count('updated')
+    else:
+        report.log(f"  ⚠ Still not found")
+        report.collect('failed', name)
+
+def process_events(dry_run=False, resolver=None):
     """Process events with manual search terms."""
-    files = sorted([f for f in os.listdir(EVENTS_DIR) if f.endswith('.json') and f != '_template.json'])
-
-    updated = 0
-    failed = []
-
-    for filename in files:
-        filepath = os.path.join(EVENTS_DIR, filename)
-
-        with open(filepath, 'r', encoding='utf-8') as f:
-            event = json.load(f)
-
-        # Skip if already has URL
-        if event.get('wikipedia_url'):
-            continue
-
-        name = event['name']
-        if name not in MANUAL_SEARCH:
-            continue
-
-        search_term = MANUAL_SEARCH[name]
-        print(f"→ {name}")
-        print(f"  Searching: {search_term}")
-
-        title, url = search_wikipedia(search_term)
-
-        if url:
-            print(f"  Found: {url}")
-            event['wikipedia_url'] = url
-
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(event, f, indent=2, ensure_ascii=False)
-                f.write('\n')
-
-            updated += 1
-        else:
-            print(f"  ⚠ Still not found")
-            failed.append(name)
+    resolver = resolver or wikipedia.get_resolver()
+    queries = [
+        MANUAL_SEARCH[event['name']] for _, event in load_corpus()
+        if not event.get('wikipedia_url') and event['name'] in MANUAL_SEARCH
+    ]
+    matches = resolver.search_many(queries)
 
-        time.sleep(0.5)
+    report = Pipeline([('wikipedia_url', partial(fix_link, matches=matches, resolver=resolver))]).run(dry_run=dry_run)
+    failed = report.collected['failed']
 
     print(f"\n{'='*50}")
-    print(f"Updated: {updated}")
+    print(f"Updated: {report.counts['updated']}")
+    print(resolver.summary())
+    print(report.summary())
     if failed:
         print(f"\nStill missing:")
         for name in failed:
             print(f"  - {name}")
 
 if __name__ == '__main__':
-    process_events()
+    parser = argparse.ArgumentParser(description="Fix missing Wikipedia URLs with manual search terms.")
+    add_arguments(parser, jobs=False)  # lookups are concurrent; the file pass is cheap
+    wikipedia.add_arguments(parser)
+    args = parser.parse_args()
+    with wikipedia.from_args(args) as resolver:
+        process_events(dry_run=args.dry_run, resolver=resolver)
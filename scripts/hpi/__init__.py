@@ -0,0 +1,6 @@
+"""
+Shared helpers for the HPI data scripts.
+
+Scripts in scripts/ are run directly (python3 scripts/update_readme.py), which
+puts this directory on sys.path, so modules are imported as `hpi.<module>`.
+"""
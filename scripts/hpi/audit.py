@@ -0,0 +1,198 @@
+"""
+Score/breakdown consistency audit over the whole corpus.
+
+The corpus is loaded into columns (one array per category: packed breakdown
+masks and stored scores), every category score is recomputed from its mask
+with the schema-driven score engine, and the columns are compared in one pass.
+
+Findings:
+  mismatch       stored score differs from the score of its breakdown
+  unknown_key    breakdown key not declared in data/schema.json
+  out_of_range   stored score not an integer in 0-100, or breakdown value not a boolean
+  missing        category has a score but no breakdown, or a breakdown but no score
+
+audit_columns() runs the same score checks on the columnar export
+(hpi.columnar, data/columns.npz) with NumPy: the mask column of each category
+is scored by ScoreEngine.score_array and compared with the stored scores in
+whole-array operations, so only differing rows reach Python. The export keeps
+only packed masks and integer scores, so unknown keys, non-boolean values and
+non-integer scores are reported by audit() alone.
+
+Usage:
+    from hpi.audit import audit, audit_columns
+
+    for finding in audit(events):
+        print(finding.format())
+
+    findings = audit_columns(load_columns())
+"""
+
+from array import array
+from functools import lru_cache
+from itertools import chain, count
+from typing import NamedTuple
+
+from hpi.scoring import get_engine
+
+try:
+    import numpy as np
+except ImportError:  # optional: only audit_columns needs it
+    np = None
+
+
+class Finding(NamedTuple):
+    kind: str
+    event_id: str
+    category: str
+    detail: str
+
+    def format(self):
+        return f"{self.kind:13} {self.event_id:40} {self.category:21} {self.detail}"
+
+
+class ScoreColumns:
+    """Columnar view of the scoring fields: row i is events[i]."""
+
+    def __init__(self, events, engine=None):
+        self.engine = engine = engine or get_engine()
+        self.ids = [event.get("id", "?") for event in events]
+        self.masks = {}          # category -> array of packed breakdowns (0 where absent)
+        self.has_breakdown = {}  # category -> bytearray of 0/1
+        self.stored = {}         # category -> list of stored scores (None where absent)
+        self.unknown = []        # (row, category, key)
+        self.bad_values = []     # (row, category, key, value)
+
+        metrics = [event.get("metrics", {}) for event in events]
+        scores = [m.get("scores", {}) for m in metrics]
+        breakdowns = [m.get("breakdowns", {}) for m in metrics]
+
+        for category, keys in engine.categories.items():
+            self.stored[category] = [s.get(category) for s in scores]
+            column = [b.get(category) for b in breakdowns]
+            self.has_breakdown[category] = bytearray(bd is not None for bd in column)
+
+            # Fast path: a breakdown with exactly the schema keys, in order, maps
+            # straight to its mask through a table of all 2^n value tuples
+            by_values = _masks_by_values(len(keys))
+            masks = [
+                0 if bd is None else by_values.get(tuple(bd.values()), -1) if tuple(bd) == keys else -1
+                for bd in column
+            ]
+
+            # 1 and 0 compare equal to True and False, so the table alone can't
+            # tell them apart; one type scan over the column finds any such rows
+            if set(map(type, chain.from_iterable(map(dict.values, filter(None, column))))) - {bool}:
+                for row, bd in enumerate(column):
+                    if bd and any(type(value) is not bool for value in bd.values()):
+                        masks[row] = -1
+
+            if -1 in masks:
+                for row, mask in enumerate(masks):
+                    if mask == -1:
+                        masks[row] = self._pack_slow(row, category, column[row])
+            self.masks[category] = array("L", masks)
+
+    def _pack_slow(self, row, category, breakdown):
+        """Pack a breakdown that is not in canonical form, recording what is wrong with it."""
+        bits = self.engine.bits[category]
+        mask = 0
+        for key, value in breakdown.items():
+            bit = bits.get(key)
+            if bit is None:
+                self.unknown.append((row, category, key))
+            elif value is True:
+                mask |= bit
+            elif value is not False:
+                self.bad_values.append((row, category, key, value))
+        return mask
+
+    def computed(self, category):
+        """Scores recomputed from the breakdown masks (0 where there is no breakdown)."""
+        return self.engine.score_masks(category, self.masks[category])
+
+
+@lru_cache(maxsize=None)
+def _masks_by_values(n):
+    """{(bool, ...): mask} for every combination of n boolean values."""
+    return {tuple(bool((mask >> i) & 1) for i in range(n)): mask for mask in range(1 << n)}
+
+
+def _valid_score(value):
+    return type(value) is int and 0 <= value <= 100
+
+
+def audit(events, engine=None):
+    """Return the list of Findings for the corpus, in event order within each kind."""
+    columns = ScoreColumns(events, engine)
+    ids = columns.ids
+    findings = []
+
+    for category in columns.engine.categories:
+        stored = columns.stored[category]
+        present = columns.has_breakdown[category]
+        computed = columns.computed(category)
+
+        # Only rows that differ, lack a breakdown or hold a non-integer score
+        # need a closer look; find them with whole-column scans
+        rows = {row for row, old, new in zip(count(), stored, computed) if old != new}
+        if 0 in present:
+            rows.update(row for row, has in enumerate(present) if not has)
+        if set(map(type, stored)) - {int}:
+            rows.update(row for row, old in enumerate(stored) if type(old) is not int)
+
+        for row in sorted(rows):
+            old, new, has = stored[row], computed[row], present[row]
+            if old is None and not has:
+                continue
+            if old is None:
+                findings.append(Finding("missing", ids[row], category, "breakdown without a score"))
+            elif not has:
+                findings.append(Finding("missing", ids[row], category, "score without a breakdown"))
+            elif not _valid_score(old):
+                findings.append(Finding("out_of_range", ids[row], category, f"score {old!r} (expected an integer 0-100)"))
+            elif old != new:
+                findings.append(Finding("mismatch", ids[row], category, f"stored {old}, breakdown gives {new}"))
+
+    for row, category, key in columns.unknown:
+        findings.append(Finding("unknown_key", ids[row], category, key))
+    for row, category, key, value in columns.bad_values:
+        findings.append(Finding("out_of_range", ids[row], category, f"{key} = {value!r} (expected true/false)"))
+
+    return findings
+
+
+def audit_columns(columns, engine=None):
+    """
+    Return the mismatch, missing and out_of_range score Findings for hpi.columnar
+    columns, in the same order as audit(). Needs NumPy.
+    """
+    if np is None:
+        raise RuntimeError("audit_columns needs NumPy (pip install numpy)")
+    engine = engine or get_engine()
+    ids = columns["id"]
+    findings = []
+
+    for j, category in enumerate(map(str, columns["score_categories"])):
+        if category not in engine.categories:
+            continue
+        keys = tuple(map(str, columns[f"breakdown_keys_{category}"]))
+        if keys != engine.categories[category]:
+            raise ValueError(f"{category}: the columns were packed with keys {keys}, "
+                             f"not {engine.categories[category]}; export them again")
+
+        stored = np.asarray(columns["scores"][:, j])
+        computed = engine.score_array(category, columns["breakdowns"][:, j])
+        rows = np.flatnonzero(stored != computed)
+
+        for row, old, new in zip(rows.tolist(), stored[rows].tolist(), computed[rows].tolist()):
+            event_id = str(ids[row])
+            if old == -1:
+                findings.append(Finding("missing", event_id, category, "breakdown without a score"))
+            elif new == -1:
+                findings.append(Finding("missing", event_id, category, "score without a breakdown"))
+            elif not 0 <= old <= 100:
+                findings.append(Finding("out_of_range", event_id, category, f"score {old!r} (expected an integer 0-100)"))
+            else:
+                findings.append(Finding("mismatch", event_id, category, f"stored {old}, breakdown gives {new}"))
+
+    return findings
@@ -0,0 +1,213 @@
+"""
+Columnar (NumPy .npz) export of the event corpus for vectorized analytics.
+
+Each event becomes one row across typed columns:
+
+  id                         unicode
+  period_start, period_end   int32 (end defaults to start)
+  mortality_min/max          int64
+  population_initial         int64, -1 if unknown
+  scores                     int16 (n, 4), SCORE_CATEGORIES order, -1 if missing
+  breakdowns                 int32 (n, 4) bitmasks (hpi.scoring bit order), -1 if missing
+  tags                       bool (n, n_tags) pattern tag incidence
+  tier, region, denial       int16 codes into tier_names, region_names, denial_names
+
+plus the lookup columns score_categories, breakdown_keys_<category> and
+tag_names. Categorical values match the rollup dimensions (hpi.rollup), and
+codes are assigned in order of first appearance.
+
+The archive is written uncompressed, so load_columns() can memory-map every
+member in place: only the pages a computation touches are read. NumPy is an
+optional dependency, needed only for this module.
+
+Usage:
+    from hpi.columnar import export_columns, load_columns, stats
+
+    export_columns(events)          # data/columns.npz
+    columns = load_columns()        # {name: np.memmap}
+    stats(columns)["deaths_max"]
+"""
+
+import os
+import struct
+import zipfile
+
+from hpi.corpus import DATA_DIR
+from hpi.rollup import DIMENSIONS, SCORE_CATEGORIES
+from hpi.scoring import get_engine
+
+try:
+    import numpy as np
+except ImportError:  # optional: only the columnar export needs it
+    np = None
+
+COLUMNS_PATH = DATA_DIR / "columns.npz"
+
+# Columns with one row per event (the rest are lookups for codes, bits and tags)
+ROW_COLUMNS = ("id", "period_start", "period_end", "mortality_min", "mortality_max", "population_initial",
+               "scores", "breakdowns", "tags", "tier", "region", "denial")
+
+# Categorical column -> rollup dimension
+CATEGORICAL = {"tier": "tier", "region": "region", "denial": "denial_status"}
+
+# Fixed part of a zip local file header (signature ... extra field length)
+_LOCAL_HEADER = struct.Struct("<4s5H3I2H")
+
+
+def _require_numpy():
+    if np is None:
+        raise RuntimeError("the columnar export needs NumPy (pip install numpy)")
+
+
+def _codes(values):
+    """(codes, names) for a list of values, codes in order of first appearance."""
+    names = {}
+    codes = [names.setdefault(value, len(names)) for value in values]
+    return np.array(codes, dtype=np.int16), np.array(list(names), dtype=str)
+
+
+def build_columns(events, joins=None):
+    """{name: ndarray} for a list of events (see the module docstring)."""
+    _require_numpy()
+    engine = get_engine()
+    n = len(events)
+
+    period_start = np.zeros(n, dtype=np.int32)
+    period_end = np.zeros(n, dtype=np.int32)
+    mortality_min = np.zeros(n, dtype=np.int64)
+    mortality_max = np.zeros(n, dtype=np.int64)
+    population = np.full(n, -1, dtype=np.int64)
+    scores = np.full((n, len(SCORE_CATEGORIES)), -1, dtype=np.int16)
+    breakdowns = np.full((n, len(SCORE_CATEGORIES)), -1, dtype=np.int32)
+    tag_rows = []
+    tag_names = {}
+
+    for i, event in enumerate(events):
+        period = event.get("period", {})
+        period_start[i] = start = period.get("start", 0)
+        period_end[i] = start if period.get("end") is None else period["end"]
+
+        metrics = event.get("metrics", {})
+        mortality = metrics.get("mortality", {})
+        mortality_min[i] = mortality.get("min", 0)
+        mortality_max[i] = mortality.get("max", 0)
+        if mortality.get("population_initial") is not None:
+            population[i] = mortality["population_initial"]
+
+        event_scores = metrics.get("scores", {})
+        event_breakdowns = metrics.get("breakdowns", {})
+        for j, category in enumerate(SCORE_CATEGORIES):
+            if event_scores.get(category) is not None:
+                scores[i, j] = event_scores[category]
+            if event_breakdowns.get(category) is not None and category in engine.categories:
+                breakdowns[i, j] = engine.pack(category, event_breakdowns[category])[0]
+
+        tag_rows.append([tag_names.setdefault(tag, len(tag_names)) for tag in DIMENSIONS["pattern_tag"](event, joins)])
+
+    tags = np.zeros((n, len(tag_names)), dtype=bool)
+    for i, row in enumerate(tag_rows):
+        tags[i, row] = True
+
+    columns = {
+        "id": np.array([event.get("id", "") for event in events], dtype=str),
+        "period_start": period_start,
+        "period_end": period_end,
+        "mortality_min": mortality_min,
+        "mortality_max": mortality_max,
+        "population_initial": population,
+        "scores": scores,
+        "score_categories": np.array(SCORE_CATEGORIES, dtype=str),
+        "breakdowns": breakdowns,
+        "tags": tags,
+        "tag_names": np.array(list(tag_names), dtype=str),
+    }
+    for category in SCORE_CATEGORIES:
+        columns[f"breakdown_keys_{category}"] = np.array(engine.categories.get(category, []), dtype=str)
+    for name, dimension in CATEGORICAL.items():
+        values = [DIMENSIONS[dimension](event, joins)[0] for event in events]
+        columns[name], columns[f"{name}_names"] = _codes(values)
+    return columns
+
+
+def save_columns(columns, path=COLUMNS_PATH):
+    """Write columns as an uncompressed .npz (atomically). Returns the size in bytes."""
+    _require_numpy()
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        np.savez(f, **columns)
+    os.replace(tmp, path)
+    return path.stat().st_size
+
+
+def export_columns(events, path=COLUMNS_PATH, joins=None):
+    """Flatten events into path. Returns the size in bytes."""
+    return save_columns(build_columns(events, joins), path)
+
+
+def load_columns(path=COLUMNS_PATH, mmap=True):
+    """
+    {name: array} from an .npz written by export_columns.
+
+    With mmap=True every member is an np.memmap over the archive itself
+    (members must be stored uncompressed, as np.savez writes them).
+    """
+    _require_numpy()
+    if not mmap:
+        with np.load(path) as data:
+            return {name: data[name] for name in data.files}
+
+    columns = {}
+    with zipfile.ZipFile(path) as archive, open(path, "rb") as f:
+        for info in archive.infolist():
+            if info.compress_type != zipfile.ZIP_STORED:
+                raise ValueError(f"{path}: {info.filename} is compressed and cannot be memory-mapped")
+            f.seek(info.header_offset)
+            fields = _LOCAL_HEADER.unpack(f.read(_LOCAL_HEADER.size))
+            name_length, extra_length = fields[-2:]
+            f.seek(info.header_offset + _LOCAL_HEADER.size + name_length + extra_length)
+
+            version = np.lib.format.read_magic(f)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+
+            name = info.filename[:-4] if info.filename.endswith(".npy") else info.filename
+            if 0 in shape:
+                columns[name] = np.empty(shape, dtype=dtype)
+            else:
+                columns[name] = np.memmap(path, dtype=dtype, mode="r", shape=shape,
+                                          order="F" if fortran_order else "C", offset=f.tell())
+    return columns
+
+
+def _counts(codes, names):
+    counts = np.bincount(codes, minlength=len(names))
+    return {str(name): int(count) for name, count in zip(names, counts) if count}
+
+
+def stats(columns):
+    """
+    calc_stats-style aggregates computed column-wise.
+
+    Same count, deaths, years and per-tier/region/denial/pattern-tag counts
+    as update_readme.calc_stats (by_denial holds counts, not events).
+    """
+    _require_numpy()
+    count = len(columns["period_start"])
+    years = (columns["period_start"], columns["period_end"])
+    year_min = int(min(column.min() for column in years)) if count else 9999
+    year_max = int(max(column.max() for column in years)) if count else 0
+    tag_counts = columns["tags"].sum(axis=0)
+    return {
+        "count": count,
+        "deaths_min": int(columns["mortality_min"].sum()),
+        "deaths_max": int(columns["mortality_max"].sum()),
+        "year_min": year_min,
+        "year_max": year_max,
+        "year_span": year_max - year_min,
+        "by_tier": _counts(columns["tier"], columns["tier_names"]),
+        "by_region": _counts(columns["region"], columns["region_names"]),
+        "by_denial": _counts(columns["denial"], columns["denial_names"]),
+        "by_pattern_tag": {str(tag): int(n) for tag, n in zip(columns["tag_names"], tag_counts) if n},
+    }
@@ -0,0 +1,353 @@
+"""
+Shared, memoized loader for the event corpus in data/events/.
+
+The corpus is loaded once per process and kept in memory for the rest of the
+run. Parsed events are also kept in a persistent parse cache (.cache/), keyed
+by path, mtime and size, so a run only re-parses files that changed since the
+previous one.
+
+The corpus can also be stored as a single JSONL stream with an id index
+(data/events.jsonl, see hpi/jsonl.py and scripts/convert_corpus.py). It is
+used when it exists and data/events/ holds no event files; events then come
+with the path they would have in data/events/, so callers work unchanged.
+
+Usage:
+    from hpi.corpus import load_events, load_corpus, load_event
+
+    events = load_events()                # list of event dicts
+    for path, event in load_corpus():     # (Path, dict) pairs, sorted by filename
+        ...
+    load_event("holodomor_1932")          # one event by id (index lookup for JSONL)
+
+    # Memory-bounded variants (hpi/records.py), not memoized or cached:
+    load_events(fields=["id", "period", "metrics.mortality"])   # projected dicts
+    load_events(lazy=True)                # LazyRecords, prose parsed on access
+    for event in iter_events(fields=[...]):   # one at a time, for single-pass work
+        ...
+"""
+
+import json
+import os
+import pickle
+import stat
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent.parent
+DATA_DIR = ROOT / "data"
+EVENTS_DIR = DATA_DIR / "events"
+EVENTS_JSONL = DATA_DIR / "events.jsonl"
+KNOWLEDGE_LOST_PATH = DATA_DIR / "knowledge_lost.json"
+KNOWLEDGE_SAVED_PATH = DATA_DIR / "knowledge_saved.json"
+CACHE_DIR = ROOT / ".cache"
+PARSE_CACHE_PATH = CACHE_DIR / "events.pickle"
+
+# Bump when the cache layout changes so stale caches are ignored
+CACHE_VERSION = 1
+
+# corpus source -> [(path, event), ...] for the current process
+_memo = {}
+
+# Counters from the most recent load, for scripts that want to report them
+last_load = {"parsed": 0, "cached": 0}
+
+
+def event_paths(events_dir=EVENTS_DIR):
+    """Return sorted event file paths, skipping templates (_*.json)."""
+    return [
+        path for path in sorted(Path(events_dir).glob("*.json"))
+        if not path.name.startswith("_")
+    ]
+
+
+def events_source(events_dir=EVENTS_DIR):
+    """
+    Where the corpus lives: events_dir, or the events.jsonl next to it if that
+    exists and events_dir has no event files. A .jsonl path is used as is.
+    """
+    path = Path(events_dir)
+    if path.suffix == ".jsonl":
+        return path
+    jsonl = path.with_suffix(".jsonl")
+    if jsonl.exists() and not event_paths(path):
+        return jsonl
+    return path
+
+
+def source_files(events_dir=EVENTS_DIR):
+    """The files the corpus is read from (for change detection)."""
+    source = events_source(events_dir)
+    if source.suffix == ".jsonl":
+        from hpi.jsonl import index_path
+        return [source, index_path(source)]
+    return event_paths(source)
+
+
+def _read_parse_cache(cache_path):
+    """Read the parse cache, returning {} if it is missing or unusable."""
+    try:
+        with open(cache_path, "rb") as f:
+            cache = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+        return {}
+    if not isinstance(cache, dict) or cache.get("version") != CACHE_VERSION:
+        return {}
+    return cache.get("files", {})
+
+
+def _write_parse_cache(cache_path, files):
+    """Atomically replace the parse cache."""
+    cache_path = Path(cache_path)
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=cache_path.parent, prefix=cache_path.name, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump({"version": CACHE_VERSION, "files": files}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        # The cache is an optimization; a read-only checkout still works
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+
+
+def load_corpus(events_dir=EVENTS_DIR, use_cache=True, refresh=False, cache_path=None):
+    """
+    Load all events as (path, event) pairs, sorted by filename.
+
+    The result is memoized per events_dir for the lifetime of the process, so
+    callers share the same event dicts. Pass refresh=True to re-stat the files
+    (e.g. after another process has edited them). cache_path defaults to
+    PARSE_CACHE_PATH.
+    """
+    cache_path = cache_path or PARSE_CACHE_PATH
+    source = events_source(events_dir).resolve()
+    if not refresh and source in _memo:
+        return _memo[source]
+
+    cached_files = _read_parse_cache(cache_path) if use_cache else {}
+    if source.suffix == ".jsonl":
+        corpus, parsed, stale = _load_jsonl(source, cached_files)
+    else:
+        corpus, parsed, stale = _load_files(source, cached_files)
+
+    if use_cache and (parsed or stale):
+        _write_parse_cache(cache_path, cached_files)
+
+    last_load["parsed"] = parsed
+    last_load["cached"] = len(corpus) - parsed
+    _memo[source] = corpus
+    return corpus
+
+
+def _load_files(events_dir, cached_files):
+    """(corpus, files parsed, stale cache entries dropped) for data/events/*.json."""
+    paths = event_paths(events_dir)
+    in_dir = {str(path) for path in paths}
+
+    corpus = []
+    parsed = 0
+    for path in paths:
+        key = str(path)
+        stat = path.stat()
+        entry = cached_files.get(key)
+        if entry is not None and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+            event = entry[2]
+        else:
+            with open(path, encoding="utf-8") as f:
+                event = json.load(f)
+            cached_files[key] = (stat.st_mtime_ns, stat.st_size, event)
+            parsed += 1
+        corpus.append((path, event))
+
+    # Drop cache entries for files removed from this directory
+    stale = [
+        key for key in cached_files
+        if Path(key).parent == events_dir and key not in in_dir
+    ]
+    for key in stale:
+        del cached_files[key]
+    return corpus, parsed, len(stale)
+
+
+def _load_jsonl(source, cached_files):
+    """(corpus, events parsed, 0) for a JSONL stream; the whole stream is one cache entry."""
+    from hpi.jsonl import JsonlStore
+
+    key = str(source)
+    stat = source.stat()
+    entry = cached_files.get(key)
+    if entry is not None and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+        items, parsed = entry[2], 0
+    else:
+        with JsonlStore(source) as store:
+            items = list(store)
+        cached_files[key] = (stat.st_mtime_ns, stat.st_size, items)
+        parsed = len(items)
+
+    # Paths the events would have in the file layout (data/events/<name>)
+    events_dir = source.with_suffix("")
+    return [(events_dir / name, event) for name, event in items], parsed, 0
+
+
+def load_event(event_id, events_dir=EVENTS_DIR):
+    """
+    One event by id, or None. A JSONL corpus answers from its index without
+    loading the rest; the file layout is searched via the memoized corpus.
+    """
+    source = events_source(events_dir)
+    if source.suffix == ".jsonl" and source.resolve() not in _memo:
+        from hpi.jsonl import JsonlStore
+        with JsonlStore(source) as store:
+            return store.get(event_id)
+    return next((event for _, event in load_corpus(events_dir) if event.get("id") == event_id), None)
+
+
+def event_count(events_dir=EVENTS_DIR):
+    """Number of events, without reading them."""
+    source = events_source(events_dir)
+    if source.suffix == ".jsonl":
+        from hpi.jsonl import JsonlStore
+        with JsonlStore(source) as store:
+            return len(store)
+    return len(event_paths(source))
+
+
+def iter_texts(events_dir=EVENTS_DIR, start=0, stop=None):
+    """Yield (path, JSON text) for every event (or events[start:stop]), one at a time, from either layout."""
+    source = events_source(events_dir)
+    if source.suffix == ".jsonl":
+        from hpi.jsonl import JsonlStore
+        events_dir = source.with_suffix("")
+        with JsonlStore(source) as store:
+            for number in range(start, len(store) if stop is None else min(stop, len(store))):
+                yield events_dir / store.name(number), store.line(number)
+    else:
+        for path in event_paths(source)[start:stop]:
+            yield path, path.read_text(encoding="utf-8")
+
+
+def load_events(events_dir=EVENTS_DIR, fields=None, lazy=False, **kwargs):
+    """
+    Load all event dicts, sorted by filename.
+
+    fields=[...] returns only those (dotted) fields of each event, and
+    lazy=True returns LazyRecords; both read the documents one at a time,
+    so memory scales with what is kept rather than the whole corpus.
+    """
+    if fields is None and not lazy:
+        return [event for _, event in load_corpus(events_dir, **kwargs)]
+
+    if fields is not None and events_source(events_dir).resolve() in _memo:
+        from hpi import records
+        tree = records.field_tree(fields)
+        return [records.project_dict(event, tree) for _, event in load_corpus(events_dir)]
+    return list(iter_events(events_dir, fields, lazy))
+
+
+def iter_events(events_dir=EVENTS_DIR, fields=None, lazy=False, start=0, stop=None):
+    """
+    Yield events one at a time, sorted by filename, without keeping them.
+
+    Not memoized or cached: only the event being yielded (projected to
+    `fields`, or a LazyRecord with lazy=True) is alive, so a single pass
+    works on a corpus larger than memory. start/stop select a slice (a
+    shard) without reading the events outside it.
+    """
+    from hpi import records
+    texts = (text for _, text in iter_texts(events_dir, start, stop))
+    if fields is not None:
+        tree = records.field_tree(fields)
+        return (records.project(text, tree) for text in texts)
+    if lazy:
+        return (records.LazyRecord.parse(text) for text in texts)
+    return (json.loads(text) for text in texts)
+
+
+def dump_event(event):
+    """Serialize an event exactly like the committed files (2-space indent, UTF-8, no trailing newline)."""
+    return json.dumps(event, indent=2, ensure_ascii=False)
+
+
+def file_mode(path):
+    """
+    Permission bits for (re)writing path: those of the existing file, or
+    0o666 minus the umask for a new one (mkstemp alone would leave 0600).
+    """
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+
+@contextmanager
+def atomic_write(path, mode="w"):
+    """
+    Open a temp file next to path for writing ("w" text or "wb" bytes) and
+    rename it over path when the block succeeds, so readers never see a
+    partial file. The file keeps its permissions (see file_mode).
+    """
+    path = Path(path)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        os.fchmod(fd, file_mode(path))
+        with os.fdopen(fd, mode, encoding=None if "b" in mode else "utf-8") as f:
+            yield f
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def write_text_atomic(path, text):
+    """Write text to path atomically (see atomic_write)."""
+    with atomic_write(path) as f:
+        f.write(text)
+
+
+def write_bytes_if_changed(path, data):
+    """Write bytes to path atomically unless it already holds them. Returns True if written."""
+    path = Path(path)
+    try:
+        if path.stat().st_size == len(data) and path.read_bytes() == data:
+            return False
+    except FileNotFoundError:
+        pass
+    with atomic_write(path, "wb") as f:
+        f.write(data)
+    return True
+
+
+def write_event(path, event):
+    """Atomically write an event file."""
+    write_text_atomic(path, dump_event(event))
+
+
+def _load_json_list(path):
+    """Load a JSON list, or [] if the file does not exist."""
+    path = Path(path)
+    if not path.exists():
+        return []
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def load_knowledge_lost():
+    """Load data/knowledge_lost.json."""
+    return _load_json_list(KNOWLEDGE_LOST_PATH)
+
+
+def load_knowledge_saved():
+    """Load data/knowledge_saved.json."""
+    return _load_json_list(KNOWLEDGE_SAVED_PATH)
+
+
+def invalidate(events_dir=None):
+    """Forget memoized corpora (all of them if events_dir is None)."""
+    if events_dir is None:
+        _memo.clear()
+    else:
+        _memo.pop(events_source(events_dir).resolve(), None)
@@ -0,0 +1,51 @@
+"""
+Structured (JSON-path level) diff between two versions of an event, used by
+the --dry-run mode of the mutating scripts.
+
+    ~ metrics.scores.ideology: 80 → 60
+    + analysis.pattern_tags: ["DEHUMANIZATION"]
+    - metrics.breakdowns.systematic_intensity.broad_targeting: true
+"""
+
+import json
+
+MAX_VALUE_LEN = 80
+
+
+def format_value(value):
+    """Compact JSON for a diff line, truncated for readability."""
+    text = json.dumps(value, ensure_ascii=False)
+    if len(text) > MAX_VALUE_LEN:
+        text = text[:MAX_VALUE_LEN - 1] + "…"
+    return text
+
+
+def diff_values(old, new, path=""):
+    """Yield diff lines describing how `old` became `new`."""
+    label = path or "(root)"
+
+    if isinstance(old, dict) and isinstance(new, dict):
+        for key in old:
+            child = f"{path}.{key}" if path else key
+            if key not in new:
+                yield f"- {child}: {format_value(old[key])}"
+            else:
+                yield from diff_values(old[key], new[key], child)
+        for key in new:
+            if key not in old:
+                child = f"{path}.{key}" if path else key
+                yield f"+ {child}: {format_value(new[key])}"
+        shared_old = [key for key in old if key in new]
+        shared_new = [key for key in new if key in old]
+        if shared_old != shared_new:
+            yield f"~ {label}: key order changed"
+        return
+
+    if isinstance(old, list) and isinstance(new, list) and len(old) == len(new):
+        for i, (a, b) in enumerate(zip(old, new)):
+            yield from diff_values(a, b, f"{path}[{i}]")
+        return
+
+    # type(...) check keeps 1 vs true vs 1.0 distinct, as in the serialized file
+    if old != new or type(old) is not type(new):
+        yield f"~ {label}: {format_value(old)} → {format_value(new)}"
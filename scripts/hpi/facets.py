@@ -0,0 +1,95 @@
+"""
+Precomputed filter facets and sort orders for the web app's event list.
+
+For every value of the list filters (period, tier, denial, as in
+src/domain/filters.js) the bundle carries a bitset of the matching event
+positions, and for every sortable column of the event table a permutation of
+the positions in ascending and descending order. Filtering in the browser is
+then a bitset intersection, and sorting a walk over a permutation.
+
+Encoding (compact, decoded once by decodeFacets in filters.js):
+  bitset       base64 of little-endian bytes, bit i set = event i matches,
+               padded to a multiple of 4 bytes (read as Uint32 words)
+  permutation  base64 of little-endian uint32 event positions
+
+Sort keys and tie order match the table's sortFn columns in index.html
+(stable sort, so equal keys keep bundle order in both directions).
+
+Usage:
+    from hpi.facets import build_facets
+
+    facets = build_facets(events)   # {"count", "bits": {...}, "order": {...}}
+"""
+
+import base64
+import struct
+
+from hpi.rollup import ERAS, era
+
+# Filter key (store.filters) -> fn(event) returning the value, or None if it never matches
+FACETS = {
+    "period": era,
+    "tier": lambda event: event.get("analysis", {}).get("tier"),
+    "denial": lambda event: event.get("denial_status"),
+}
+
+# Every period option is exported, even empty ones (an unknown period matches everything)
+PERIODS = [name for _, name in ERAS] + ["modern"]
+
+
+def calc_index(event):
+    """Same as calcIndex in src/domain/formatters.js (rounded mean of the four scores)."""
+    scores = event.get("metrics", {}).get("scores") or {}
+    total = sum(scores.get(key) or 0 for key in ("systematic_intensity", "profit", "ideology", "complicity"))
+    return int(total / 4 + 0.5)  # Math.round for non-negative scores
+
+
+# Table column -> sort key
+SORT_KEYS = {
+    "period": lambda event: event.get("period", {}).get("start", 0),
+    "deaths": lambda event: event.get("metrics", {}).get("mortality", {}).get("max") or 0,
+    "index": calc_index,
+}
+
+
+def encode_bitset(positions, count):
+    data = bytearray((count + 31) // 32 * 4)
+    for i in positions:
+        data[i >> 3] |= 1 << (i & 7)
+    return base64.b64encode(bytes(data)).decode("ascii")
+
+
+def encode_permutation(order):
+    return base64.b64encode(struct.pack(f"<{len(order)}I", *order)).decode("ascii")
+
+
+def build_facets(events):
+    """Bitsets per filter value and sort permutations, in bundle form."""
+    count = len(events)
+    positions = {name: {} for name in FACETS}
+    for name in PERIODS:
+        positions["period"][name] = []
+
+    for i, event in enumerate(events):
+        for name, fn in FACETS.items():
+            value = fn(event)
+            if value is not None:
+                positions[name].setdefault(value, []).append(i)
+
+    order = {}
+    for field, key in SORT_KEYS.items():
+        keys = [key(event) for event in events]
+        # sorted() is stable in both directions, like Array.prototype.sort
+        order[field] = {
+            "asc": encode_permutation(sorted(range(count), key=keys.__getitem__)),
+            "desc": encode_permutation(sorted(range(count), key=keys.__getitem__, reverse=True)),
+        }
+
+    return {
+        "count": count,
+        "bits": {
+            name: {str(value): encode_bitset(indexes, count) for value, indexes in values.items()}
+            for name, values in positions.items()
+        },
+        "order": order,
+    }
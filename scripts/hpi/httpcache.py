@@ -0,0 +1,88 @@
+"""
+Persistent HTTP response cache (SQLite) for the Wikipedia scripts.
+
+Responses are stored under their normalized request URL (scheme and host
+lower-cased, query parameters sorted), with the time they were fetched.
+An entry is fresh for `ttl` seconds, or `negative_ttl` seconds if it was a
+negative result (e.g. a search with no matches), which are re-checked
+sooner. Offline callers pass allow_stale=True to get expired entries too,
+since a stale answer beats none when the network is off limits. The cache lives in .cache/http.sqlite3 and is safe to share
+between the resolver's worker threads.
+
+Usage:
+    cache = ResponseCache()
+    key = normalize_url("https://en.wikipedia.org/w/api.php", {"search": "Nakba"})
+    body = cache.get(key)            # bytes, or None on a miss / stale entry
+    body = cache.get(key, allow_stale=True)   # expired entries count as hits
+    cache.put(key, body, negative=False)
+    print(cache.summary())           # "cache: 12 hits, 3 misses (80% hit rate)"
+"""
+
+import sqlite3
+import threading
+import time
+import urllib.parse
+
+from hpi.corpus import CACHE_DIR
+
+HTTP_CACHE_PATH = CACHE_DIR / "http.sqlite3"
+
+DAY = 24 * 60 * 60
+DEFAULT_TTL = 30 * DAY
+DEFAULT_NEGATIVE_TTL = 1 * DAY
+
+
+def normalize_url(base_url, params):
+    """Canonical cache key for a GET request: lower-cased scheme/host, sorted query."""
+    parts = urllib.parse.urlsplit(base_url)
+    query = urllib.parse.urlencode(sorted((str(k), str(v)) for k, v in params.items()))
+    return urllib.parse.urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or "/", query, ""))
+
+
+class ResponseCache:
+    """SQLite-backed response bodies with TTL and negative-result TTL."""
+
+    def __init__(self, path=HTTP_CACHE_PATH, ttl=DEFAULT_TTL, negative_ttl=DEFAULT_NEGATIVE_TTL):
+        self.path = path
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY, body BLOB NOT NULL, negative INTEGER NOT NULL, fetched REAL NOT NULL)"
+        )
+
+    def get(self, key, now=None, allow_stale=False):
+        """Cached body for key if still fresh (or at all, with allow_stale), else None. Counts a hit or miss."""
+        now = time.time() if now is None else now
+        with self._lock:
+            row = self._db.execute("SELECT body, negative, fetched FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                body, negative, fetched = row
+                if allow_stale or now - fetched < (self.negative_ttl if negative else self.ttl):
+                    self.hits += 1
+                    return body
+            self.misses += 1
+            return None
+
+    def put(self, key, body, negative=False, now=None):
+        now = time.time() if now is None else now
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (key, body, negative, fetched) VALUES (?, ?, ?, ?)",
+                (key, body, int(negative), now),
+            )
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def summary(self):
+        total = self.hits + self.misses
+        rate = f"{self.hits / total:.0%}" if total else "n/a"
+        return f"cache: {self.hits} hits, {self.misses} misses ({rate} hit rate)"
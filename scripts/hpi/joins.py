@@ -0,0 +1,66 @@
+"""
+Id-indexed joins between events and knowledge entries.
+
+Both directions are hash lookups built once per corpus:
+
+  event_by_id          event id -> event
+  event_index          event id -> position in the events list (exported to the web app)
+  knowledge_by_event   event id -> [knowledge entry + {"isSaved": bool}, ...]
+
+Knowledge entries whose connected_event matches no event are collected in
+`dangling` instead of being silently dropped.
+
+Usage:
+    from hpi.joins import Joins
+
+    joins = Joins(events, lost_entries, saved_entries)
+    joins.event_name("the_holocaust_1941")
+    joins.knowledge_by_event.get("the_holocaust_1941", [])
+    for entry, is_saved in joins.dangling: ...
+"""
+
+
+class Joins:
+    """Hash indexes over one events list and its knowledge entries."""
+
+    def __init__(self, events, lost_entries=(), saved_entries=()):
+        self.event_by_id = {}
+        self.event_index = {}
+        self.duplicate_ids = []
+        for position, event in enumerate(events):
+            event_id = event.get("id")
+            if event_id in self.event_by_id:
+                self.duplicate_ids.append(event_id)
+                continue
+            self.event_by_id[event_id] = event
+            self.event_index[event_id] = position
+
+        # Same shape as store.buildKnowledgeLookup in the web app
+        self.knowledge_by_event = {}
+        self.dangling = []
+        for entries, is_saved in ((lost_entries, False), (saved_entries, True)):
+            for entry in entries:
+                connected = entry.get("connected_event")
+                if not connected:
+                    continue
+                if connected not in self.event_by_id:
+                    self.dangling.append((entry, is_saved))
+                self.knowledge_by_event.setdefault(connected, []).append({**entry, "isSaved": is_saved})
+
+    def event(self, event_id):
+        """The event with this id, or None."""
+        return self.event_by_id.get(event_id)
+
+    def event_name(self, event_id):
+        """Event name for an id, falling back to the id itself."""
+        event = self.event_by_id.get(event_id)
+        return event.get("name", event_id) if event else event_id
+
+    def warnings(self):
+        """Human-readable problems found while joining."""
+        lines = [f"Duplicate event id: {event_id}" for event_id in self.duplicate_ids]
+        for entry, is_saved in self.dangling:
+            kind = "knowledge_saved" if is_saved else "knowledge_lost"
+            lines.append(f"{kind} entry {entry.get('id', entry.get('name'))!r} "
+                         f"references unknown event {entry['connected_event']!r}")
+        return lines
@@ -0,0 +1,203 @@
+"""
+JSONL storage for the event corpus: one stream plus a binary id index.
+
+An alternative to one file per event (data/events/*.json) for very large
+corpora. data/events.jsonl holds one compact JSON event per line, in the
+same order as the file layout, and data/events.idx maps event ids to the
+(offset, length) of their line:
+
+  header   magic "HPIJ", version, record count, slot count, names size, stream size
+  records  per line: offset u64, length u32, name offset u32, name length u16
+  slots    open-addressing hash table: id hash u64 -> record number + 1 (0 = empty)
+  names    UTF-8 file names of the events ("armenian_genocide.json"), so the
+           file layout can be restored exactly
+
+Both files are memory-mapped, so get(id) is one hash probe and one line
+parse, however large the stream is. Ids are checked against the parsed line,
+so a hash collision costs one extra probe, never a wrong event. With
+duplicate ids the first line wins, as in hpi.joins.
+
+Usage:
+    from hpi.jsonl import JsonlStore, write_jsonl
+
+    write_jsonl([(path.name, event) for path, event in load_corpus()], "data/events.jsonl")
+    with JsonlStore("data/events.jsonl") as store:
+        store.get("armenian_genocide_1915")
+        for name, event in store:
+            ...
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+from pathlib import Path
+
+from hpi.corpus import atomic_write
+
+INDEX_MAGIC = b"HPIJ"
+INDEX_VERSION = 1
+
+_HEADER = struct.Struct("<4sHxxIIIQ")   # magic, version, count, slots, names size, stream size
+_RECORD = struct.Struct("<QIIHxx")      # offset, length, name offset, name length
+_SLOT = struct.Struct("<QIxxxx")        # id hash, record number + 1
+
+
+def index_path(path):
+    """Sidecar index of a JSONL stream (events.jsonl -> events.idx)."""
+    return Path(path).with_suffix(".idx")
+
+
+def dump_line(event):
+    """One event as a JSONL line (compact, UTF-8, without the newline)."""
+    return json.dumps(event, ensure_ascii=False, separators=(",", ":"))
+
+
+def id_hash(event_id):
+    return int.from_bytes(hashlib.blake2b(str(event_id).encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def _slot_count(count):
+    """Power of two with the table at most half full."""
+    slots = 1
+    while slots < count * 2:
+        slots *= 2
+    return slots
+
+
+def write_jsonl(items, path):
+    """
+    Write (file name, event) pairs as a JSONL stream and its index.
+
+    Lines go straight to the stream's temp file as they are encoded; only the
+    index (per line: offsets, name and id) is built in memory. Both files are
+    replaced atomically and keep their permissions. Returns the number of events.
+    """
+    records = bytearray()
+    names = bytearray()
+    ids = []
+    offset = 0
+    with atomic_write(index_path(path), "wb") as index_file:
+        with atomic_write(path, "wb") as stream:
+            for name, event in items:
+                line = dump_line(event).encode("utf-8") + b"\n"
+                encoded_name = name.encode("utf-8")
+                records += _RECORD.pack(offset, len(line) - 1, len(names), len(encoded_name))
+                stream.write(line)
+                offset += len(line)
+                names += encoded_name
+                ids.append(event.get("id"))
+
+        count = len(ids)
+        slots = _slot_count(count)
+        mask = slots - 1
+        table = [None] * slots
+        seen = set()
+        for number, event_id in enumerate(ids):
+            if event_id is None or event_id in seen:
+                continue
+            seen.add(event_id)
+            digest = id_hash(event_id)
+            slot = digest & mask
+            while table[slot] is not None:
+                slot = (slot + 1) & mask
+            table[slot] = (digest, number + 1)
+
+        index_file.write(_HEADER.pack(INDEX_MAGIC, INDEX_VERSION, count, slots, len(names), offset))
+        index_file.write(records)
+        index_file.write(b"".join(_SLOT.pack(*entry) if entry else _SLOT.pack(0, 0) for entry in table))
+        index_file.write(names)
+    return count
+
+
+def _map(path):
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return b""
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+class JsonlStore:
+    """Read-only, memory-mapped view of a JSONL stream and its index."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._stream = _map(self.path)
+        self._index = _map(index_path(self.path))
+
+        magic, version, self.count, self.slots, names_size, stream_size = _HEADER.unpack_from(self._index, 0)
+        if magic != INDEX_MAGIC or version != INDEX_VERSION:
+            raise ValueError(f"{index_path(self.path)}: not an event index (version {INDEX_VERSION})")
+        if stream_size != len(self._stream):
+            raise ValueError(f"{index_path(self.path)} is stale; rebuild it with scripts/convert_corpus.py")
+
+        self._records_at = _HEADER.size
+        self._slots_at = self._records_at + self.count * _RECORD.size
+        self._names_at = self._slots_at + self.slots * _SLOT.size
+
+    def __len__(self):
+        return self.count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        for mapped in (self._stream, self._index):
+            if isinstance(mapped, mmap.mmap):
+                mapped.close()
+
+    def _record(self, number):
+        return _RECORD.unpack_from(self._index, self._records_at + number * _RECORD.size)
+
+    def name(self, number):
+        """File name of the event on line `number`."""
+        _, _, name_offset, name_length = self._record(number)
+        start = self._names_at + name_offset
+        return self._index[start:start + name_length].decode("utf-8")
+
+    def line(self, number):
+        """Raw JSON text of line `number`."""
+        offset, length, _, _ = self._record(number)
+        return self._stream[offset:offset + length].decode("utf-8")
+
+    def _lookup(self, event_id):
+        """(line number, event) for an id, or (None, None)."""
+        if not self.slots:
+            return None, None
+        digest = id_hash(event_id)
+        mask = self.slots - 1
+        slot = digest & mask
+        while True:
+            stored, number = _SLOT.unpack_from(self._index, self._slots_at + slot * _SLOT.size)
+            if not number:
+                return None, None
+            if stored == digest:
+                event = json.loads(self.line(number - 1))
+                if event.get("id") == event_id:
+                    return number - 1, event
+            slot = (slot + 1) & mask
+
+    def find(self, event_id):
+        """Line number of the event with this id, or None."""
+        return self._lookup(event_id)[0]
+
+    def get(self, event_id):
+        """The event with this id (parsed from its line), or None."""
+        return self._lookup(event_id)[1]
+
+    def __contains__(self, event_id):
+        return self.find(event_id) is not None
+
+    def entries(self):
+        """(file name, raw line) for every event, in stream order."""
+        for number in range(self.count):
+            yield self.name(number), self.line(number)
+
+    def __iter__(self):
+        """(file name, event) for every event, in stream order."""
+        for name, line in self.entries():
+            yield name, json.loads(line)
@@ -0,0 +1,80 @@
+"""
+Marker templating for the generated sections of the markdown files.
+
+    <!-- STATS:key -->...<!-- /STATS:key -->
+
+A document is tokenized once into static text and marker blocks (the parse
+is cached per document text), only the generators whose markers occur are
+called, each at most once, and the document is rebuilt with a single join.
+
+Usage:
+    from hpi.markers import render
+
+    content = render(content, {"EVENT_COUNT": lambda: str(len(events))})
+"""
+
+import re
+from functools import lru_cache
+from typing import NamedTuple
+
+MARKER_RE = re.compile(r"<!-- (/?)STATS:([\w-]+) -->")
+
+
+class Block(NamedTuple):
+    """A marker pair; the text between the tags is replaced on render."""
+    key: str
+    open_tag: str
+    body: str
+    close_tag: str
+
+
+@lru_cache(maxsize=16)
+def parse(content):
+    """Split content into a tuple of static strings and Blocks."""
+    tokens = list(MARKER_RE.finditer(content))
+    segments = []
+    pos = 0
+    i = 0
+    while i < len(tokens):
+        token = tokens[i]
+        i += 1
+        closing, key = token.group(1), token.group(2)
+        if closing:
+            continue
+        # The block ends at the first matching close tag; an unclosed marker is static text
+        for j in range(i, len(tokens)):
+            end = tokens[j]
+            if end.group(1) and end.group(2) == key:
+                segments.append(content[pos:token.start()])
+                segments.append(Block(key, token.group(0), content[token.end():end.start()], end.group(0)))
+                pos = end.end()
+                i = j + 1
+                break
+    segments.append(content[pos:])
+    return tuple(segment for segment in segments if segment != "")
+
+
+def keys(content):
+    """Marker keys present in content."""
+    return {segment.key for segment in parse(content) if isinstance(segment, Block)}
+
+
+def render(content, generators):
+    """Replace every block whose key has a generator; other blocks are left as they are."""
+    parts = []
+    generated = {}
+    for segment in parse(content):
+        if isinstance(segment, str):
+            parts.append(segment)
+            continue
+
+        key = segment.key
+        if key not in generators:
+            parts.extend((segment.open_tag, segment.body, segment.close_tag))
+            continue
+        if key not in generated:
+            text = generators[key]()
+            # Inline stats (single values) don't need newlines
+            generated[key] = f"\n{text}\n" if "\n" in text else text
+        parts.extend((segment.open_tag, generated[key], segment.close_tag))
+    return "".join(parts)
@@ -0,0 +1,97 @@
+"""
+Aho-Corasick multi-keyword matcher.
+
+All keywords are compiled once into an automaton that reports every
+occurrence of every keyword (including overlapping ones) in a single linear
+scan of the text, instead of one substring scan per keyword.
+
+Usage:
+    matcher = KeywordMatcher(["famine", "starv", "blockade"])
+    matcher.matched("a blockade caused famine")   # {"blockade", "famine"}
+    for start, end, keyword in matcher.finditer(text):
+        ...
+
+With word_boundary=True a match only counts if it is not preceded or
+followed by a letter/digit, so "animal" no longer matches inside
+"animals". Stem keywords such as "dehumaniz" then only match as whole words.
+"""
+
+
+class KeywordMatcher:
+    """Fixed keyword set compiled into an Aho-Corasick automaton."""
+
+    def __init__(self, keywords, word_boundary=False):
+        self.keywords = list(dict.fromkeys(keywords))  # de-duplicated, order kept
+        self.word_boundary = word_boundary
+        self._build()
+
+    def _build(self):
+        # Trie: goto[state] maps char -> next state; out[state] lists keyword indexes
+        goto = [{}]
+        out = [[]]
+        for index, keyword in enumerate(self.keywords):
+            if not keyword:
+                raise ValueError("Empty keyword")
+            state = 0
+            for ch in keyword:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    out.append([])
+                state = nxt
+            out[state].append(index)
+
+        # Breadth-first failure links; resolve them into a full transition
+        # table (delta) so the scan never has to follow failure links
+        fail = [0] * len(goto)
+        delta = [dict(goto[0])] + [None] * (len(goto) - 1)
+        queue = list(goto[0].values())
+        for state in queue:
+            fail_state = fail[state]
+            out[state] = out[state] + out[fail_state]
+            transitions = dict(delta[fail_state])
+            for ch, nxt in goto[state].items():
+                fail[nxt] = delta[fail_state].get(ch, 0) if state else 0
+                transitions[ch] = nxt
+                queue.append(nxt)
+            delta[state] = transitions
+
+        self._delta = delta
+        self._out = [tuple(indexes) for indexes in out]
+        self._lengths = [len(keyword) for keyword in self.keywords]
+
+    def _is_boundary(self, text, start, end):
+        before = text[start - 1] if start > 0 else " "
+        after = text[end] if end < len(text) else " "
+        return not before.isalnum() and not after.isalnum()
+
+    def finditer(self, text):
+        """Yield (start, end, keyword) for every occurrence, in order of end position."""
+        delta, out, lengths, keywords = self._delta, self._out, self._lengths, self.keywords
+        state = 0
+        for i, ch in enumerate(text):
+            state = delta[state].get(ch, 0)
+            if out[state]:
+                end = i + 1
+                for index in out[state]:
+                    start = end - lengths[index]
+                    if self.word_boundary and not self._is_boundary(text, start, end):
+                        continue
+                    yield start, end, keywords[index]
+
+    def matched(self, text):
+        """Return the set of keywords that occur in text."""
+        if self.word_boundary:
+            return {keyword for _, _, keyword in self.finditer(text)}
+
+        # Fast path: no offsets needed, just collect output sets
+        delta, out = self._delta, self._out
+        found = set()
+        state = 0
+        for ch in text:
+            state = delta[state].get(ch, 0)
+            if out[state]:
+                found.update(out[state])
+        return {self.keywords[index] for index in found}
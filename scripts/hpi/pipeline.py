@@ -0,0 +1,217 @@
+"""
+Single-pass transform pipeline over the event corpus.
+
+Each mutating script exposes a per-event transform:
+
+    def transform(path, event, report):
+        # mutate `event` in place, log via report.log() / report.count()
+
+A Pipeline runs its registered transforms in order over every event file,
+reading each file once and writing it (atomically) at most once. A file is
+only written when its new serialized bytes differ from the bytes on disk, so
+unchanged files keep their mtime. With dry_run=True nothing is written and a
+structured diff is logged per changed file instead.
+
+Transforms must not print; everything goes through the report so output
+stays in file order. That also lets run(jobs=N) shard the files across a
+process pool: each worker reads, transforms and writes its own files and
+returns only its reports, which are merged in file order, so output and logs
+are identical to a serial run. Transforms passed to a parallel run must be
+module-level functions (they are pickled to the workers).
+
+A corpus stored as JSONL (hpi/jsonl.py) is transformed in a single process
+and, if any event changed, the stream and its index are rewritten once at
+the end. Reports still name the per-event files (data/events/<name>).
+
+Usage:
+    pipeline = Pipeline()
+    pipeline.register("rationales", add_rationale)
+    pipeline.register("pattern_tags", tag_event)
+    report = pipeline.run(dry_run=False)
+    print(report.summary())
+"""
+
+import json
+import os
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+from hpi.corpus import (
+    EVENTS_DIR, dump_event, event_paths, events_source, invalidate, write_text_atomic,
+)
+from hpi.diff import diff_values
+from hpi.jsonl import JsonlStore, dump_line, write_jsonl
+
+
+class Report:
+    """Log lines, counters, collected values and written files from transforms."""
+
+    def __init__(self):
+        self.lines = []
+        self.counts = Counter()
+        self.collected = defaultdict(list)
+        self.written = []
+        self.unchanged = 0
+        self.dry_run = False
+
+    def log(self, line):
+        self.lines.append(line)
+
+    def count(self, key, n=1):
+        self.counts[key] += n
+
+    def collect(self, key, value):
+        self.collected[key].append(value)
+
+    def merge(self, other):
+        self.lines.extend(other.lines)
+        self.counts.update(other.counts)
+        for key, values in other.collected.items():
+            self.collected[key].extend(values)
+        self.written.extend(other.written)
+        self.unchanged += other.unchanged
+
+    def summary(self):
+        """One-line summary of what was (or would be) written."""
+        if self.dry_run:
+            return f"Dry run: {len(self.written)} files would change, {self.unchanged} unchanged (nothing written)"
+        return f"Wrote {len(self.written)} files, {self.unchanged} unchanged"
+
+
+def add_arguments(parser, jobs=True):
+    """Add the options shared by every pipeline-backed script."""
+    parser.add_argument("--dry-run", action="store_true",
+                        help="print a per-file diff of what would change without writing anything")
+    if jobs:
+        parser.add_argument("-j", "--jobs", type=int, default=1, metavar="N",
+                            help="worker processes (0 = one per CPU; default: 1)")
+
+
+def _run_shard(transforms, paths, dry_run):
+    """Worker entry point: apply the transforms to a contiguous shard of files."""
+    pipeline = Pipeline(transforms)
+    return [pipeline.apply(path, dry_run=dry_run) for path in paths]
+
+
+def _shards(items, count):
+    """Split items into `count` contiguous, nearly equal slices (order preserved)."""
+    size, extra = divmod(len(items), count)
+    shards, start = [], 0
+    for i in range(count):
+        end = start + size + (1 if i < extra else 0)
+        if end > start:
+            shards.append(items[start:end])
+        start = end
+    return shards
+
+
+class Pipeline:
+    """Ordered list of per-event transforms applied in a single pass."""
+
+    def __init__(self, transforms=None):
+        self.transforms = []
+        for name, fn in transforms or []:
+            self.register(name, fn)
+
+    def register(self, name, fn):
+        """Append a transform; transforms run in registration order."""
+        if any(existing == name for existing, _ in self.transforms):
+            raise ValueError(f"Transform already registered: {name}")
+        self.transforms.append((name, fn))
+
+    def _transform(self, path, event, existing, text_fn, dry_run):
+        """Run all transforms on one event; returns (report, new text or None if unchanged)."""
+        report = Report()
+        report.dry_run = dry_run
+        for _, fn in self.transforms:
+            fn(path, event, report)
+
+        text = text_fn(event)
+        if text == existing:
+            report.unchanged += 1
+            return report, None
+
+        report.written.append(path)
+        if dry_run:
+            report.log(f"--- {path.name}")
+            lines = list(diff_values(json.loads(existing), event)) or ["~ (formatting only)"]
+            for line in lines:
+                report.log(f"  {line}")
+        return report, text
+
+    def apply(self, path, dry_run=False):
+        """
+        Run all transforms on one event file and write it if its bytes changed.
+        The file is read once: the event is parsed from the same text the
+        new serialization is compared with. Returns the file's report.
+        """
+        with open(path, encoding="utf-8") as f:
+            existing = f.read()
+        report, text = self._transform(path, json.loads(existing), existing, dump_event, dry_run)
+        if text is not None and not dry_run:
+            write_text_atomic(path, text)
+        return report
+
+    def run(self, events_dir=EVENTS_DIR, dry_run=False, echo=True, jobs=1):
+        """Apply all transforms to every event. Returns the merged report."""
+        jobs = jobs or os.cpu_count() or 1
+        source = events_source(events_dir)
+        if source.suffix == ".jsonl":
+            file_reports = self._run_jsonl(source, dry_run)
+        elif jobs > 1:
+            file_reports = self._run_parallel(events_dir, dry_run, jobs)
+        else:
+            file_reports = self._run_serial(events_dir, dry_run)
+
+        report = Report()
+        report.dry_run = dry_run
+        for file_report in file_reports:
+            if echo:
+                for line in file_report.lines:
+                    print(line)
+            report.merge(file_report)
+        return report
+
+    def _run_serial(self, events_dir, dry_run):
+        """Yield per-file reports in file order, applying the transforms in this process."""
+        written = False
+        for path in event_paths(events_dir):
+            report = self.apply(path, dry_run=dry_run)
+            written = written or bool(report.written)
+            yield report
+
+        # The files were edited behind the memoized corpus
+        if written and not dry_run:
+            invalidate(events_dir)
+
+    def _run_jsonl(self, source, dry_run):
+        """Yield per-event reports for a JSONL corpus, then rewrite it if anything changed."""
+        events_dir = source.with_suffix("")
+        items = []
+        changed = False
+        with JsonlStore(source) as store:
+            for name, line in store.entries():
+                event = json.loads(line)
+                report, text = self._transform(events_dir / name, event, line, dump_line, dry_run)
+                changed = changed or text is not None
+                items.append((name, event))
+                yield report
+
+        if changed and not dry_run:
+            write_jsonl(items, source)
+            invalidate(source)
+
+    def _run_parallel(self, events_dir, dry_run, jobs):
+        """Yield per-file reports in file order, computed by a process pool."""
+        paths = event_paths(events_dir)
+        # A few shards per worker evens out slow files without much IPC
+        shards = _shards(paths, min(len(paths), jobs * 4)) if paths else []
+
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = [pool.submit(_run_shard, self.transforms, shard, dry_run) for shard in shards]
+            for future in futures:
+                yield from future.result()
+
+        # Workers edited the files; the parent's memoized copy is stale
+        if not dry_run:
+            invalidate(events_dir)
@@ -0,0 +1,197 @@
+"""
+Lazy and field-selective parsing of event JSON.
+
+Most analytics read a handful of small fields (period, mortality, tier,
+region, denial) while the bulk of each document is prose: description,
+sources, rationales, pattern notes. Two ways to avoid holding all of it:
+
+  project(text, fields)   plain dict with only the given (dotted) fields;
+                          everything else is skipped without being parsed
+  LazyRecord.parse(text)  read-only Mapping of the whole event whose
+                          LAZY_FIELDS stay as raw JSON text until first access
+
+Skipped strings (most of the prose) are stepped over with a regex and never
+decoded; skipped lists and objects are decoded and dropped straight away, so
+at most one of them is alive at a time. corpus.load_events() exposes both as
+load_events(fields=[...]) and load_events(lazy=True).
+
+Usage:
+    from hpi.records import LazyRecord, project
+
+    project(text, ["id", "period", "metrics.mortality"])
+    # {"id": ..., "period": {...}, "metrics": {"mortality": {...}}}
+
+    event = LazyRecord.parse(text)
+    event["metrics"]["scores"]          # parsed at load
+    event["description"]                # parsed now, then kept
+    event.to_dict()                     # plain nested dicts
+"""
+
+import json
+import re
+from collections.abc import Mapping
+
+# Fields kept as raw text until accessed; nested dicts mark lazy fields inside an object
+LAZY_FIELDS = {
+    "description": None,
+    "sources": None,
+    "erasure_note": None,
+    "metrics": {"rationales": None, "breakdowns": None},
+    "analysis": {"pattern_note": None, "warning_signs": None, "root_causes": None},
+}
+
+_decode = json.JSONDecoder().raw_decode
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_STRING = re.compile(r'"(?:[^"\\]|\\.)*"', re.DOTALL)
+
+
+def _skip_ws(text, i):
+    return _WHITESPACE.match(text, i).end()
+
+
+def _skip_value(text, i):
+    """Index just past the JSON value starting at text[i]."""
+    if text[i] == '"':
+        return _STRING.match(text, i).end()
+    # Containers go through the C decoder and are dropped at once, which beats
+    # tokenizing them in Python; only one value is ever alive
+    return _decode(text, i)[1]
+
+
+def _walk_object(text, i, visit):
+    """
+    Walk the JSON object starting at text[i]. visit(key, value_start) handles
+    one member and returns the index just past its value. Returns the index
+    just past the object.
+    """
+    if text[i] != "{":
+        raise ValueError(f"Expected a JSON object at {i}")
+    i = _skip_ws(text, i + 1)
+    if text[i] == "}":
+        return i + 1
+    while True:
+        end = _STRING.match(text, i).end()
+        key = text[i + 1:end - 1]
+        if "\\" in key:
+            key = json.loads(text[i:end])
+        i = _skip_ws(text, end)
+        if text[i] != ":":
+            raise ValueError(f"Expected ':' at {i}")
+        i = _skip_ws(text, visit(key, _skip_ws(text, i + 1)))
+        if text[i] == "}":
+            return i + 1
+        if text[i] != ",":
+            raise ValueError(f"Expected ',' or '}}' at {i}")
+        i = _skip_ws(text, i + 1)
+
+
+def field_tree(fields):
+    """["metrics.mortality", "id"] -> {"metrics": {"mortality": None}, "id": None} (None = whole value)."""
+    tree = {}
+    for field in fields:
+        node = tree
+        *parents, leaf = field.split(".")
+        for key in parents:
+            child = node.get(key, {})
+            if child is None:  # an ancestor is already projected whole
+                break
+            node = node.setdefault(key, child)
+        else:
+            node[leaf] = None
+    return tree
+
+
+def _project(text, i, tree):
+    """(projected dict, end index) for the object at text[i]."""
+    result = {}
+
+    def visit(key, start):
+        if key not in tree:
+            return _skip_value(text, start)
+        subtree = tree[key]
+        if subtree is None or text[start] != "{":
+            result[key], end = _decode(text, start)
+        else:
+            result[key], end = _project(text, start, subtree)
+        return end
+
+    return result, _walk_object(text, i, visit)
+
+
+def project(text, fields):
+    """Only the given dotted fields of an event's JSON text, as nested dicts."""
+    tree = fields if isinstance(fields, dict) else field_tree(fields)
+    return _project(text, _skip_ws(text, 0), tree)[0]
+
+
+def project_dict(event, fields):
+    """Same projection for an already parsed event."""
+    def walk(value, tree):
+        return {
+            key: value[key] if subtree is None or not isinstance(value[key], dict) else walk(value[key], subtree)
+            for key, subtree in tree.items() if key in value
+        }
+    return walk(event, field_tree(fields) if not isinstance(fields, dict) else fields)
+
+
+class _Raw:
+    """Unparsed JSON text of a lazy field."""
+
+    __slots__ = ("text",)
+
+    def __init__(self, text):
+        self.text = text
+
+
+class LazyRecord(Mapping):
+    """Read-only event mapping whose lazy fields are parsed on first access."""
+
+    __slots__ = ("_values",)
+
+    def __init__(self, values):
+        self._values = values
+
+    @classmethod
+    def parse(cls, text, lazy=LAZY_FIELDS):
+        """Record for an event's JSON text; `lazy` fields are kept unparsed."""
+        return cls._parse(text, _skip_ws(text, 0), lazy)[0]
+
+    @classmethod
+    def _parse(cls, text, i, lazy):
+        values = {}
+
+        def visit(key, start):
+            subtree = lazy.get(key, False)
+            if subtree is None:
+                end = _skip_value(text, start)
+                values[key] = _Raw(text[start:end])
+            elif subtree and text[start] == "{":
+                values[key], end = cls._parse(text, start, subtree)
+            else:
+                values[key], end = _decode(text, start)
+            return end
+
+        return cls(values), _walk_object(text, i, visit)
+
+    def __getitem__(self, key):
+        value = self._values[key]
+        if isinstance(value, _Raw):
+            value = self._values[key] = json.loads(value.text)
+        return value
+
+    def __iter__(self):
+        return iter(self._values)
+
+    def __len__(self):
+        return len(self._values)
+
+    def __contains__(self, key):
+        return key in self._values
+
+    def __repr__(self):
+        pending = sum(isinstance(value, _Raw) for value in self._values.values())
+        return f"<LazyRecord {self._values.get('id')!r}: {len(self._values)} fields, {pending} unparsed>"
+
+    def to_dict(self):
+        """The full event as plain nested dicts (parses everything left)."""
+        return {key: value.to_dict() if isinstance(value, LazyRecord) else value for key, value in self.items()}
@@ -0,0 +1,210 @@
+"""
+Group-by aggregation over the event corpus, materialized as a rollup cube.
+
+Every cell aggregates a group of events: count, summed mortality min/max,
+earliest and latest year (over starts and ends), and per-category score means. A Rollup
+is built in one pass over any iterable (a list or a generator) and holds:
+
+  total                 the cell of all events
+  by(dimension)         {value: cell} for every dimension in DIMENSIONS
+  cell(era=..., ...)    any combination of the CUBE dimensions, "all" = rolled up
+
+The cube dimensions mirror the web app's filters (period, tier, denial), so
+the front end's stats read a precomputed cell for any filter combination.
+
+Dimensions (multi-valued ones put an event in several groups):
+  tier, region (canonical), century, era, denial_status,
+  pattern_tag (analysis.pattern_tags), driver (drivers of linked knowledge entries)
+
+Usage:
+    from hpi.rollup import Rollup, group_by
+
+    rollup = Rollup(events, joins)
+    rollup.total.deaths_max
+    {tier: cell.count for tier, cell in rollup.by("tier").items()}
+    rollup.cell(era="modern", denial_status="denied").count
+    group_by(events, "century", "tier")   # ad-hoc {(century, tier): cell}
+
+    # Over a stream: cells keep only their aggregates, not the events
+    Rollup(corpus.iter_events(fields=[...]), keep_events=False)
+"""
+
+from itertools import product
+
+SCORE_CATEGORIES = ("systematic_intensity", "profit", "ideology", "complicity")
+
+# (start year bound, era) in the same order and bounds as matchesPeriod in src/domain/filters.js
+ERAS = ((500, "ancient"), (1500, "medieval"), (1900, "colonial"))
+
+ALL = "all"
+
+
+def canonical_region(event):
+    """First region name, without sub-regions ("/") or notes ("(...)")."""
+    return event.get("geography", {}).get("region", "Unknown").split("/")[0].split("(")[0].strip()
+
+
+def century(event):
+    """First year of the century the event started in (1915 -> 1900, -146 -> -200)."""
+    return event.get("period", {}).get("start", 0) // 100 * 100
+
+
+def era(event):
+    start = event.get("period", {}).get("start", 0)
+    for bound, name in ERAS:
+        if start < bound:
+            return name
+    return "modern"
+
+
+def _pattern_tags(event, joins):
+    return list(dict.fromkeys(event.get("analysis", {}).get("pattern_tags", [])))
+
+
+def _drivers(event, joins):
+    if joins is None:
+        return []
+    entries = joins.knowledge_by_event.get(event.get("id"), [])
+    return list(dict.fromkeys(entry["driver"] for entry in entries if entry.get("driver")))
+
+
+# name -> fn(event, joins) returning the list of groups the event belongs to
+DIMENSIONS = {
+    "tier": lambda event, joins: [event.get("analysis", {}).get("tier", "Unknown")],
+    "region": lambda event, joins: [canonical_region(event)],
+    "century": lambda event, joins: [century(event)],
+    "era": lambda event, joins: [era(event)],
+    "denial_status": lambda event, joins: [event.get("denial_status", "unknown")],
+    "pattern_tag": _pattern_tags,
+    "driver": _drivers,
+}
+
+# Dimensions materialized with all their roll-up combinations (see store.js filters)
+CUBE = ("era", "tier", "denial_status")
+
+
+class Cell:
+    """Aggregates of one group of events (the events themselves are kept too, unless keep_events=False)."""
+
+    __slots__ = ("events", "count", "deaths_min", "deaths_max", "year_min", "year_max", "score_sums")
+
+    def __init__(self, keep_events=True):
+        self.events = [] if keep_events else None
+        self.count = 0
+        self.deaths_min = 0
+        self.deaths_max = 0
+        self.year_min = None
+        self.year_max = None
+        self.score_sums = dict.fromkeys(SCORE_CATEGORIES, 0)
+
+    def add(self, event):
+        if self.events is not None:
+            self.events.append(event)
+        self.count += 1
+
+        metrics = event.get("metrics", {})
+        mortality = metrics.get("mortality", {})
+        self.deaths_min += mortality.get("min", 0)
+        self.deaths_max += mortality.get("max", 0)
+
+        # Earliest and latest of all start and end years, as calcStats in
+        # src/domain/formatters.js takes them
+        period = event.get("period", {})
+        for year in (period.get("start"), period.get("end")):
+            if year is None:
+                continue
+            if self.year_min is None or year < self.year_min:
+                self.year_min = year
+            if self.year_max is None or year > self.year_max:
+                self.year_max = year
+
+        scores = metrics.get("scores", {})
+        for category in SCORE_CATEGORIES:
+            self.score_sums[category] += scores.get(category, 0)
+
+    def score_mean(self, category):
+        return self.score_sums[category] / self.count if self.count else 0
+
+    def to_json(self):
+        """Compact, camelCase form used in the bundle."""
+        return {
+            "count": self.count,
+            "deathsMin": self.deaths_min,
+            "deathsMax": self.deaths_max,
+            "yearMin": self.year_min,
+            "yearMax": self.year_max,
+            "scoreMeans": {category: round(self.score_mean(category), 1) for category in SCORE_CATEGORIES},
+        }
+
+
+def group_by(events, *dimensions, joins=None):
+    """{(value, ...): Cell} grouped by the given dimensions, in one pass."""
+    extractors = [DIMENSIONS[name] for name in dimensions]
+    cells = {}
+    for event in events:
+        for key in product(*(fn(event, joins) for fn in extractors)):
+            cell = cells.get(key)
+            if cell is None:
+                cell = cells[key] = Cell()
+            cell.add(event)
+    return cells
+
+
+class Rollup:
+    """Totals, every single-dimension grouping and the CUBE, computed in one pass."""
+
+    def __init__(self, events, joins=None, dimensions=tuple(DIMENSIONS), cube=CUBE, keep_events=True):
+        self.keep_events = keep_events
+        self.dimensions = tuple(dimensions)
+        self.cube_dimensions = tuple(cube)
+        self.total = Cell(keep_events)
+        self.groups = {name: {} for name in self.dimensions}
+        self.cube = {}
+
+        extractors = [(name, DIMENSIONS[name]) for name in self.dimensions]
+        cube_index = [self.dimensions.index(name) if name in self.dimensions else None for name in cube]
+        cube_extractors = [DIMENSIONS[name] for name in cube]
+
+        for event in events:
+            self.total.add(event)
+
+            values = []
+            for name, fn in extractors:
+                groups = self.groups[name]
+                event_values = fn(event, joins)
+                values.append(event_values)
+                for value in event_values:
+                    cell = groups.get(value)
+                    if cell is None:
+                        cell = groups[value] = Cell(keep_events)
+                    cell.add(event)
+
+            # Each cube dimension contributes its own value(s) and "all"
+            axes = [
+                (values[index] if index is not None else fn(event, joins)) + [ALL]
+                for index, fn in zip(cube_index, cube_extractors)
+            ]
+            for key in product(*axes):
+                cell = self.cube.get(key)
+                if cell is None:
+                    cell = self.cube[key] = Cell(keep_events)
+                cell.add(event)
+
+    def by(self, dimension):
+        """{value: Cell} for one dimension, in order of first appearance."""
+        return self.groups[dimension]
+
+    def cell(self, **filters):
+        """Cube cell for the given dimension values (missing ones are rolled up); None if empty."""
+        return self.cube.get(tuple(filters.get(name, ALL) for name in self.cube_dimensions))
+
+    def to_json(self):
+        """Bundle form: {"dimensions", "cells": {"v1|v2|v3": cell}, "groups": {dim: {value: cell}}}."""
+        return {
+            "dimensions": list(self.cube_dimensions),
+            "cells": {"|".join(map(str, key)): cell.to_json() for key, cell in self.cube.items()},
+            "groups": {
+                name: {str(value): cell.to_json() for value, cell in groups.items()}
+                for name, groups in self.groups.items()
+            },
+        }
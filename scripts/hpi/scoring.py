@@ -0,0 +1,182 @@
+"""
+Score engine: category scores computed from their boolean breakdowns.
+
+The breakdown keys of each category, and their order, come from
+data/schema.json (metrics.breakdowns.<category>.properties), so the
+denominator is always the number of keys the schema defines rather than a
+constant in each script. A breakdown is packed into an integer bitmask (bit i
+= i-th schema key is true) and its score is
+
+    popcount(mask) * 100 // len(keys)
+
+which is the same as the historical int(true_count / n * 100).
+
+recompute_all() packs the whole corpus into one column of masks per category
+and scores each column through a lookup table (mask -> score), one plain-Python
+lookup per mask, instead of walking the nested dicts once per rescore script.
+Columns that are already NumPy arrays (the breakdowns of hpi.columnar) are
+scored with score_array(), a single vectorized lookup; NumPy is optional and
+only that method needs it.
+
+Usage:
+    from hpi.scoring import get_engine
+
+    engine = get_engine()
+    engine.score_breakdown("ideology", event["metrics"]["breakdowns"]["ideology"])
+    changes = engine.recompute_all(events)   # [(event_id, category, old, new), ...]
+    engine.score_array("ideology", columns["breakdowns"][:, 2])   # NumPy masks, -1 = none
+"""
+
+import json
+
+from hpi.corpus import DATA_DIR
+
+try:
+    import numpy as np
+except ImportError:  # optional: only score_array needs it
+    np = None
+
+SCHEMA_PATH = DATA_DIR / "schema.json"
+
+# Masks up to this many keys are scored through a precomputed table
+MAX_TABLE_BITS = 16
+
+_engine = None
+
+
+def load_categories(schema_path=SCHEMA_PATH):
+    """{category: (key, ...)} in schema order, for every breakdown category with declared keys."""
+    with open(schema_path, encoding="utf-8") as f:
+        schema = json.load(f)
+
+    breakdowns = schema["properties"]["metrics"]["properties"]["breakdowns"]["properties"]
+    return {
+        category: tuple(spec["properties"])
+        for category, spec in breakdowns.items()
+        if spec.get("properties")
+    }
+
+
+def popcount(mask):
+    return bin(mask).count("1")
+
+
+class ScoreEngine:
+    """Packs breakdowns into bitmasks and scores them, per schema-defined category."""
+
+    def __init__(self, categories=None):
+        self.categories = categories if categories is not None else load_categories()
+        self.bits = {
+            category: {key: 1 << i for i, key in enumerate(keys)}
+            for category, keys in self.categories.items()
+        }
+        self._tables = {
+            category: [popcount(mask) * 100 // len(keys) for mask in range(1 << len(keys))]
+            for category, keys in self.categories.items()
+            if keys and len(keys) <= MAX_TABLE_BITS
+        }
+        self._arrays = {}  # category -> the table as a NumPy array, built by score_array
+
+    def pack(self, category, breakdown):
+        """Return (mask, unknown_keys) for one breakdown. Only `True` values set bits."""
+        bits = self.bits[category]
+        mask = 0
+        unknown = []
+        for key, value in breakdown.items():
+            bit = bits.get(key)
+            if bit is None:
+                unknown.append(key)
+            elif value is True:
+                mask |= bit
+        return mask, unknown
+
+    def score(self, category, mask):
+        """Score (0-100) for a packed breakdown."""
+        table = self._tables.get(category)
+        if table is not None:
+            return table[mask]
+        return popcount(mask) * 100 // len(self.categories[category])
+
+    def score_breakdown(self, category, breakdown):
+        """Score (0-100) for a breakdown dict; keys outside the schema are ignored."""
+        return self.score(category, self.pack(category, breakdown)[0])
+
+    def pack_all(self, events):
+        """{category: [mask or None, ...]} with one entry per event (None = no breakdown)."""
+        columns = {category: [] for category in self.categories}
+        for event in events:
+            breakdowns = event.get("metrics", {}).get("breakdowns", {})
+            for category, column in columns.items():
+                breakdown = breakdowns.get(category)
+                column.append(None if breakdown is None else self.pack(category, breakdown)[0])
+        return columns
+
+    def score_masks(self, category, masks):
+        """Scores for a list of masks (None stays None), one table lookup per mask."""
+        table = self._tables.get(category)
+        if table is None:
+            return [None if mask is None else self.score(category, mask) for mask in masks]
+        if None not in masks:
+            return list(map(table.__getitem__, masks))
+        return [None if mask is None else table[mask] for mask in masks]
+
+    def score_array(self, category, masks):
+        """
+        Scores for a NumPy array of masks, computed in one vectorized pass.
+
+        Negative masks (the "no breakdown" marker of hpi.columnar) score -1.
+        Returns an int16 array of the same shape.
+        """
+        if np is None:
+            raise RuntimeError("score_array needs NumPy (pip install numpy)")
+        masks = np.asarray(masks)
+        present = masks >= 0
+        packed = np.where(present, masks, 0)
+        table = self._arrays.get(category)
+        if table is None and category in self._tables:
+            table = self._arrays[category] = np.array(self._tables[category], dtype=np.int16)
+        if table is not None:
+            scores = table[packed]
+        else:
+            keys = len(self.categories[category])
+            bits = sum((packed >> i) & 1 for i in range(keys))
+            scores = (bits * 100 // keys).astype(np.int16)
+        return np.where(present, scores, np.int16(-1))
+
+    def score_all(self, events):
+        """{category: [score or None, ...]}, computed from the breakdowns in one pass."""
+        return {category: self.score_masks(category, masks) for category, masks in self.pack_all(events).items()}
+
+    def recompute_all(self, events, apply=True):
+        """
+        Recompute every category score from its breakdown.
+
+        Returns [(event_id, category, old_score, new_score), ...] for each stored
+        score that differs; with apply=True the events are updated in place.
+        Events without a breakdown for a category keep their stored score.
+        """
+        changes = []
+        for category, column in self.score_all(events).items():
+            for event, new in zip(events, column):
+                if new is None:
+                    continue
+                scores = event.setdefault("metrics", {}).setdefault("scores", {})
+                old = scores.get(category)
+                if old != new:
+                    changes.append((event.get("id"), category, old, new))
+                    if apply:
+                        scores[category] = new
+        return changes
+
+
+def get_engine():
+    """Process-wide engine built from data/schema.json."""
+    global _engine
+    if _engine is None:
+        _engine = ScoreEngine()
+    return _engine
+
+
+def recompute_all(events, apply=True):
+    """Recompute all category scores with the schema-derived engine (see ScoreEngine.recompute_all)."""
+    return get_engine().recompute_all(events, apply=apply)
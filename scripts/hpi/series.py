@@ -0,0 +1,107 @@
+"""
+Time series over the event corpus, precomputed for charts (data/series.json).
+
+For each resolution (decade, century) the series covers every bucket from
+the earliest start to the latest end year, as parallel arrays:
+
+  buckets     first year of each bucket (-150, -140, ... / -200, -100, ...)
+  started     events that started in the bucket
+  active      events under way at some point in the bucket (concurrency)
+  deathsMin   summed mortality of the events that started in the bucket
+  deathsMax
+  byTier      {tier: {"started": [...], "deathsMax": [...]}}
+  byDriver    {driver: {...}}, drivers of linked knowledge entries (hpi.joins)
+
+Buckets follow the rollup's century() convention (floor division, so
+-146 falls in the -150 decade and the -200 century). The web app does not
+load the file yet; it is an artifact for charting the corpus elsewhere.
+
+Usage:
+    from hpi.series import build_series
+
+    series = build_series(events, joins)
+    series["resolutions"]["century"]["active"]
+"""
+
+from hpi.rollup import DIMENSIONS
+
+# Bump when the layout changes
+SERIES_VERSION = 1
+
+RESOLUTIONS = {"decade": 10, "century": 100}
+
+# Series key -> rollup dimension the events are split by
+SPLITS = {"byTier": "tier", "byDriver": "driver"}
+
+
+def _span(event):
+    period = event.get("period", {})
+    start = period.get("start", 0)
+    end = period.get("end")
+    return start, start if end is None or end < start else end
+
+
+def _split(started, deaths_max):
+    return {"started": started, "deathsMax": deaths_max}
+
+
+def build_resolution(events, width, joins=None):
+    """Series for one bucket width (in years), as described in the module docstring."""
+    if not events:
+        return {"width": width, "buckets": [], "started": [], "active": [], "deathsMin": [], "deathsMax": [],
+                **{key: {} for key in SPLITS}}
+
+    spans = [_span(event) for event in events]
+    first = min(start for start, _ in spans) // width
+    last = max(end for _, end in spans) // width
+    size = last - first + 1
+
+    started = [0] * size
+    deaths_min = [0] * size
+    deaths_max = [0] * size
+    # Concurrency via a difference array: +1 where an event begins, -1 after it ends
+    delta = [0] * (size + 1)
+    splits = {key: {} for key in SPLITS}
+
+    for event, (start, end) in zip(events, spans):
+        i = start // width - first
+        mortality = event.get("metrics", {}).get("mortality", {})
+        started[i] += 1
+        deaths_min[i] += mortality.get("min", 0)
+        deaths_max[i] += mortality.get("max", 0)
+        delta[i] += 1
+        delta[end // width - first + 1] -= 1
+
+        for key, dimension in SPLITS.items():
+            for value in DIMENSIONS[dimension](event, joins):
+                split = splits[key].get(value)
+                if split is None:
+                    split = splits[key][value] = _split([0] * size, [0] * size)
+                split["started"][i] += 1
+                split["deathsMax"][i] += mortality.get("max", 0)
+
+    active = []
+    running = 0
+    for step in delta[:size]:
+        running += step
+        active.append(running)
+
+    return {
+        "width": width,
+        "buckets": [(first + i) * width for i in range(size)],
+        "started": started,
+        "active": active,
+        "deathsMin": deaths_min,
+        "deathsMax": deaths_max,
+        **splits,
+    }
+
+
+def build_series(events, joins=None, resolutions=RESOLUTIONS):
+    """{"version", "resolutions": {name: series}} for data/series.json."""
+    return {
+        "version": SERIES_VERSION,
+        "resolutions": {
+            name: build_resolution(events, width, joins) for name, width in resolutions.items()
+        },
+    }
@@ -0,0 +1,68 @@
+"""
+Summary/detail split of event records for the web app.
+
+The list view only needs a handful of fields per event; everything else
+(descriptions, rationales, warning_signs, sources, ...) is loaded per event
+when a row is expanded. Search reads fields the summary drops
+(description, pattern_note, country), so each summary carries them as one
+precomputed, lower-cased searchText string.
+"""
+
+# Nested paths kept in the summary record. The shape is preserved so the
+# front-end formatters (calcIndex, formatPeriod, getTier, ...) work unchanged.
+SUMMARY_FIELDS = [
+    ("id",),
+    ("name",),
+    ("short_name",),
+    ("period", "start"),
+    ("period", "end"),
+    ("geography", "region"),
+    ("participants", "perpetrators"),
+    ("participants", "victims"),
+    ("metrics", "mortality", "min"),
+    ("metrics", "mortality", "max"),
+    ("metrics", "scores"),
+    ("analysis", "tier"),
+    ("denial_status",),
+]
+
+
+def search_text(event):
+    """The string matchesSearch in src/domain/filters.js searches, built the same way."""
+    geography = event.get("geography", {})
+    analysis = event.get("analysis", {})
+    participants = event.get("participants", {})
+    fields = [
+        event.get("name"),
+        geography.get("region"),
+        geography.get("country"),
+        analysis.get("tier"),
+        analysis.get("pattern_note"),
+        event.get("description"),
+        *(participants.get("perpetrators") or []),
+        *(participants.get("victims") or []),
+    ]
+    return " ".join(field for field in fields if field).lower()
+
+
+def summarize_event(event):
+    """Project an event onto SUMMARY_FIELDS, keeping the nested layout, plus its searchText."""
+    summary = {}
+    for path in SUMMARY_FIELDS:
+        value = event
+        for key in path:
+            if not isinstance(value, dict) or key not in value:
+                break
+            value = value[key]
+        else:
+            target = summary
+            for key in path[:-1]:
+                target = target.setdefault(key, {})
+            target[path[-1]] = value
+    summary["searchText"] = search_text(event)
+    return summary
+
+
+def detail_filename(event):
+    """File name of an event's detail shard (matches detailPath in the store)."""
+    return f"{event['id']}.json"
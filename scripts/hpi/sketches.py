@@ -0,0 +1,349 @@
+"""
+Mergeable approximate sketches for aggregates over very large corpora.
+
+Exact distinct counts need every value in a set, and exact quantiles need
+every value sorted; on multi-million-row corpora both grow with the data.
+These sketches have a fixed size and merge losslessly with sketches of the
+same parameters, so shards can be sketched in parallel and combined:
+
+  HyperLogLog(precision=12)   distinct count; 2^precision one-byte registers
+                              (4 KB). Relative standard error 1.04 / sqrt(2^p)
+                              = 1.6% at p=12, so within 3 standard errors
+                              (4.9%) 99.7% of the time. Sets below 2.5 * 2^p
+                              use linear counting, which is much tighter.
+                              Merging takes the register-wise max, which gives
+                              exactly the sketch of the combined stream.
+
+  TDigest(compression=100)    quantiles (merging t-digest, k1 scale
+                              function). At most ~compression centroids.
+                              The rank of quantile(q) is off by at most about
+                              pi * sqrt(q * (1 - q)) / compression of the
+                              count (1.6% at the median, 0.3% at q=0.99), plus
+                              one item. min and max are exact. Merged digests
+                              keep the same bound in practice, but the centroid
+                              order then depends on the merge order.
+
+StatsSketch bundles the ones calc_stats can add (calc_stats(sketches=True)):
+distinct participants.perpetrators and victims, both overall and per region
+(canonical region, as in the rollup), and digests of metrics.mortality min
+and max. exact_summary() computes the same numbers exactly, and check()
+compares the two against the bounds above (see scripts/sketch_stats.py --check
+and tests/test_sketches.py).
+
+Usage:
+    from hpi.sketches import StatsSketch
+
+    sketch = StatsSketch()
+    for event in events:
+        sketch.add(event)
+    sketch.merge(other_shard_sketch)
+    sketch.summary()["by_region"]["Europe"]["perpetrators"]
+"""
+
+import hashlib
+import math
+from bisect import bisect_left, bisect_right
+
+from hpi.rollup import canonical_region
+
+HLL_PRECISION = 12
+TDIGEST_COMPRESSION = 100
+
+# Quantiles reported by StatsSketch.summary()
+QUANTILES = (0.5, 0.9, 0.99)
+
+# Distinct-count fields (participants.<role>)
+ROLES = ("perpetrators", "victims")
+
+# Event fields a StatsSketch reads
+SKETCH_FIELDS = ["geography.region", "participants", "metrics.mortality"]
+
+
+def _hash64(value):
+    return int.from_bytes(hashlib.blake2b(str(value).encode("utf-8"), digest_size=8).digest(), "little")
+
+
+class HyperLogLog:
+    """Distinct-count sketch (see the module docstring for the error bound)."""
+
+    __slots__ = ("precision", "registers")
+
+    def __init__(self, precision=HLL_PRECISION):
+        if not 4 <= precision <= 16:
+            raise ValueError(f"HyperLogLog precision must be 4-16, got {precision}")
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+
+    def add(self, value):
+        h = _hash64(value)
+        rest_bits = 64 - self.precision
+        rest = h & ((1 << rest_bits) - 1)
+        rank = rest_bits - rest.bit_length() + 1  # leading zeros of the remaining bits + 1
+        index = h >> rest_bits
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def update(self, values):
+        for value in values:
+            self.add(value)
+
+    def merge(self, other):
+        """Fold another sketch with the same precision into this one. Returns self."""
+        if other.precision != self.precision:
+            raise ValueError(f"Cannot merge HyperLogLog precision {other.precision} into {self.precision}")
+        self.registers = bytearray(map(max, self.registers, other.registers))
+        return self
+
+    @property
+    def relative_error(self):
+        """Relative standard error of count()."""
+        return 1.04 / math.sqrt(len(self.registers))
+
+    def count(self):
+        """Estimated number of distinct values added."""
+        m = len(self.registers)
+        alpha = {16: 0.673, 32: 0.697, 64: 0.709}.get(m, 0.7213 / (1 + 1.079 / m))
+        estimate = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)  # linear counting for small sets
+        return round(estimate)
+
+
+class TDigest:
+    """Quantile sketch (see the module docstring for the error bound)."""
+
+    __slots__ = ("compression", "centroids", "_buffer", "count", "min", "max")
+
+    def __init__(self, compression=TDIGEST_COMPRESSION):
+        self.compression = compression
+        self.centroids = []  # (mean, weight), sorted by mean
+        self._buffer = []
+        self.count = 0
+        self.min = None
+        self.max = None
+
+    def add(self, value, weight=1):
+        self._buffer.append((value, weight))
+        self.count += weight
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+        if len(self._buffer) >= 5 * self.compression:
+            self._compress()
+
+    def update(self, values):
+        for value in values:
+            self.add(value)
+
+    def merge(self, other):
+        """Fold another digest into this one. Returns self."""
+        if not other.count:
+            return self
+        self._buffer.extend(other.centroids)
+        self._buffer.extend(other._buffer)
+        self.count += other.count
+        self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = other.max if self.max is None else max(self.max, other.max)
+        self._compress()
+        return self
+
+    def _k(self, q):
+        return self.compression / (2 * math.pi) * math.asin(2 * q - 1)
+
+    def _q(self, k):
+        return (math.sin(k * 2 * math.pi / self.compression) + 1) / 2
+
+    def _compress(self):
+        """Merge the buffer into the centroids, each spanning at most 1 on the k scale."""
+        if not self._buffer:
+            return
+        points = sorted(self.centroids + self._buffer)
+        self._buffer = []
+        total = self.count
+        merged = []
+        done = 0
+        q_limit = self._q(self._k(0) + 1)
+        mean, weight = points[0]
+        for point_mean, point_weight in points[1:]:
+            if (done + weight + point_weight) / total <= q_limit:
+                weight += point_weight
+                mean += (point_mean - mean) * point_weight / weight
+            else:
+                merged.append((mean, weight))
+                done += weight
+                q_limit = self._q(min(self._k(done / total) + 1, self.compression / 4))
+                mean, weight = point_mean, point_weight
+        merged.append((mean, weight))
+        self.centroids = merged
+
+    def quantile(self, q):
+        """Estimated value at quantile q (0-1); None if empty."""
+        self._compress()
+        if not self.centroids:
+            return None
+        if q <= 0:
+            return self.min
+        if q >= 1:
+            return self.max
+
+        # Interpolate between centroid centers; the outer halves run to min and max
+        index = q * self.count
+        first_mean, first_weight = self.centroids[0]
+        if index < first_weight / 2:
+            return self.min + (first_mean - self.min) * index / (first_weight / 2)
+        position = first_weight / 2
+        for (left, left_weight), (right, right_weight) in zip(self.centroids, self.centroids[1:]):
+            step = (left_weight + right_weight) / 2
+            if position + step > index:
+                return left + (right - left) * (index - position) / step
+            position += step
+        last_mean, last_weight = self.centroids[-1]
+        return last_mean + (self.max - last_mean) * min((index - position) / (last_weight / 2), 1)
+
+    def rank_error(self, q):
+        """Bound on |true rank of quantile(q) - q| as a fraction of the count."""
+        return math.pi * math.sqrt(q * (1 - q)) / self.compression + 1 / max(self.count, 1)
+
+
+def _participants(event, role):
+    return event.get("participants", {}).get(role, [])
+
+
+class StatsSketch:
+    """Sketches of one shard of events (distinct participants, mortality quantiles)."""
+
+    def __init__(self, precision=HLL_PRECISION, compression=TDIGEST_COMPRESSION):
+        self.precision = precision
+        self.distinct = {role: HyperLogLog(precision) for role in ROLES}
+        self.by_region = {}  # region -> {role: HyperLogLog}
+        self.mortality = {bound: TDigest(compression) for bound in ("min", "max")}
+
+    def _region(self, name):
+        region = self.by_region.get(name)
+        if region is None:
+            region = self.by_region[name] = {role: HyperLogLog(self.precision) for role in ROLES}
+        return region
+
+    def add(self, event):
+        region = self._region(canonical_region(event))
+        for role in ROLES:
+            names = _participants(event, role)
+            self.distinct[role].update(names)
+            region[role].update(names)
+
+        mortality = event.get("metrics", {}).get("mortality", {})
+        for bound, digest in self.mortality.items():
+            digest.add(mortality.get(bound, 0))
+
+    def update(self, events):
+        for event in events:
+            self.add(event)
+        return self
+
+    def merge(self, other):
+        """Fold another shard's sketch into this one. Returns self."""
+        for role in ROLES:
+            self.distinct[role].merge(other.distinct[role])
+        for name, sketches in other.by_region.items():
+            region = self._region(name)
+            for role in ROLES:
+                region[role].merge(sketches[role])
+        for bound, digest in self.mortality.items():
+            digest.merge(other.mortality[bound])
+        return self
+
+    def summary(self, quantiles=QUANTILES):
+        """{"perpetrators", "victims", "by_region": {region: {role: n}}, "mortality_min"/"max": {q: value}}."""
+        result = {role: sketch.count() for role, sketch in self.distinct.items()}
+        result["by_region"] = {
+            name: {role: sketch.count() for role, sketch in sketches.items()}
+            for name, sketches in self.by_region.items()
+        }
+        for bound, digest in self.mortality.items():
+            result[f"mortality_{bound}"] = {q: digest.quantile(q) for q in quantiles}
+        return result
+
+
+def exact_values(events):
+    """Exact sets and sorted values behind a StatsSketch: (distinct, by_region, mortality)."""
+    distinct = {role: set() for role in ROLES}
+    by_region = {}
+    mortality = {"min": [], "max": []}
+    for event in events:
+        region = by_region.setdefault(canonical_region(event), {role: set() for role in ROLES})
+        for role in ROLES:
+            names = _participants(event, role)
+            distinct[role].update(names)
+            region[role].update(names)
+        event_mortality = event.get("metrics", {}).get("mortality", {})
+        for bound, values in mortality.items():
+            values.append(event_mortality.get(bound, 0))
+    for values in mortality.values():
+        values.sort()
+    return distinct, by_region, mortality
+
+
+def exact_summary(events, quantiles=QUANTILES):
+    """StatsSketch.summary() computed exactly (nearest-rank quantiles)."""
+    distinct, by_region, mortality = exact_values(events)
+    result = {role: len(values) for role, values in distinct.items()}
+    result["by_region"] = {
+        name: {role: len(values) for role, values in sets.items()} for name, sets in by_region.items()
+    }
+    for bound, values in mortality.items():
+        result[f"mortality_{bound}"] = {
+            q: values[min(max(math.ceil(q * len(values)) - 1, 0), len(values) - 1)] if values else None
+            for q in quantiles
+        }
+    return result
+
+
+def _rank_range(values, x):
+    """
+    Ranks (fractions of len(values)) that x stands for in sorted values: those
+    of x itself, or of its two neighbours when x is interpolated between them.
+    """
+    n = len(values)
+    first, last = bisect_left(values, x), bisect_right(values, x)
+    if first == last:
+        below = values[first - 1] if first else x
+        above = values[first] if first < n else x
+        first, last = bisect_left(values, below), bisect_right(values, above)
+    return first / n, last / n
+
+
+def check(sketch, events, quantiles=QUANTILES, sigmas=3):
+    """
+    Cross-check a sketch of `events` against exact values.
+
+    Distinct counts must be within `sigmas` relative standard errors, and
+    each quantile estimate's true rank within TDigest.rank_error(q) of q (an
+    estimate between two values counts as either one's rank).
+    Returns the list of violations (empty when every estimate is in bounds).
+    """
+    distinct, by_region, mortality = exact_values(events)
+    problems = []
+
+    def compare(label, hll, exact):
+        estimate = hll.count()
+        if abs(estimate - exact) > sigmas * hll.relative_error * exact:
+            problems.append(f"{label}: estimated {estimate:,} distinct, exact {exact:,}")
+
+    for role in ROLES:
+        compare(role, sketch.distinct[role], len(distinct[role]))
+    for name, sets in by_region.items():
+        for role in ROLES:
+            compare(f"{name} {role}", sketch.by_region[name][role], len(sets[role]))
+
+    for bound, values in mortality.items():
+        digest = sketch.mortality[bound]
+        for q in quantiles:
+            estimate = digest.quantile(q)
+            low, high = _rank_range(values, estimate)
+            error = 0 if low <= q <= high else min(abs(q - low), abs(q - high))
+            if error > digest.rank_error(q):
+                problems.append(f"mortality {bound} q={q}: estimate {estimate:,.0f} is at rank "
+                                f"{low:.4f}-{high:.4f} (bound ±{digest.rank_error(q):.4f})")
+    return problems
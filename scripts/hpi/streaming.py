@@ -0,0 +1,65 @@
+"""
+Generator helpers for single-pass, constant-memory work over the corpus.
+
+corpus.iter_events() yields events one at a time; these helpers let several
+consumers share that one pass without collecting the events:
+
+  tap(events, fn)       pass events through, calling fn(event) on each
+  chunks(events, size)  lists of at most `size` events (for batch consumers like audit)
+  TopN(n, key)          bounded min-heap of the n items with the largest key
+
+Usage:
+    from hpi.streaming import TopN, tap
+
+    deadliest = TopN(10, key=lambda e: e["metrics"]["mortality"]["max"])
+    rollup = Rollup(tap(corpus.iter_events(fields=[...]), deadliest.push), keep_events=False)
+    deadliest.items()   # largest first
+"""
+
+import heapq
+from itertools import count, islice
+
+
+def tap(events, fn):
+    """Yield every event unchanged after calling fn(event)."""
+    for event in events:
+        fn(event)
+        yield event
+
+
+def chunks(events, size):
+    """Yield lists of up to `size` consecutive events."""
+    events = iter(events)
+    while chunk := list(islice(events, size)):
+        yield chunk
+
+
+class TopN:
+    """
+    The n items with the largest key seen so far, in O(n) memory.
+
+    Ties keep the items pushed first, so items() matches a stable
+    sorted(all_items, key=lambda x: -key(x))[:n].
+    """
+
+    def __init__(self, n, key):
+        self.n = n
+        self.key = key
+        self._heap = []  # (key, -sequence, item); the root is the item to evict next
+        self._sequence = count()
+
+    def push(self, item):
+        if self.n <= 0:
+            return
+        entry = (self.key(item), -next(self._sequence), item)
+        if len(self._heap) < self.n:
+            heapq.heappush(self._heap, entry)
+        elif entry[:2] > self._heap[0][:2]:
+            heapq.heapreplace(self._heap, entry)
+
+    def __len__(self):
+        return len(self._heap)
+
+    def items(self):
+        """Kept items, largest key first (ties in push order)."""
+        return [item for _, _, item in sorted(self._heap, key=lambda entry: entry[:2], reverse=True)]
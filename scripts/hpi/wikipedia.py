@@ -0,0 +1,330 @@
+"""
+Concurrent, rate-limited Wikipedia opensearch resolver.
+
+Lookups run on a bounded thread pool that lives as long as the resolver,
+so a whole run shares it. Each worker thread keeps one keep-alive HTTP
+connection to the API host across calls, and all workers draw from a
+shared token bucket, so the request rate stays under `rate` per second
+however many workers there are.
+
+The API base URL is configurable (--api-url, or the HPI_WIKIPEDIA_API
+environment variable), so the scripts can run against a local stand-in
+server that answers `?action=opensearch&search=...&limit=3&format=json`
+like Wikipedia does: [query, [titles], [descriptions], [urls]].
+
+Responses can be kept in a persistent cache (hpi.httpcache, on by default in
+the scripts): repeat runs only hit the network for new or expired queries,
+and --offline answers from the cache alone (expired entries included),
+never touching the network.
+
+Usage:
+    from hpi.wikipedia import WikipediaResolver
+
+    resolver = WikipediaResolver(rate=5, workers=4)
+    match = resolver.search("Holodomor")              # Match(title, url, error)
+    matches = resolver.search_many(["Nakba", "Mfecane"])  # {query: Match}
+    pages = resolver.query_titles(["Armenian Genocide"])  # {title: Page(title, missing, error)}
+    resolver.close()                                  # or use it as a context manager
+"""
+
+import http.client
+import json
+import os
+import threading
+import time
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple, Optional
+
+from hpi.httpcache import DAY, DEFAULT_NEGATIVE_TTL, DEFAULT_TTL, ResponseCache, normalize_url
+
+DEFAULT_API_URL = "https://en.wikipedia.org/w/api.php"
+USER_AGENT = "HistoricalPatternIndex/1.0 (research project)"
+
+# Most titles the API accepts in one action=query request
+QUERY_BATCH = 50
+
+# Requests per second across all workers, and the number of workers
+DEFAULT_RATE = 5.0
+DEFAULT_WORKERS = 4
+DEFAULT_TIMEOUT = 10
+
+_resolver = None
+
+
+class Match(NamedTuple):
+    title: Optional[str]
+    url: Optional[str]
+    error: Optional[str] = None
+
+
+class Page(NamedTuple):
+    """Where a title ends up after normalization and redirects (title is None if missing)."""
+    title: Optional[str]
+    missing: bool = False
+    error: Optional[str] = None
+
+
+class NotCached(OSError):
+    """Raised in offline mode for a request that is not in the cache."""
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens per second, at most `burst` saved up."""
+
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available (no-op when rate <= 0)."""
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class ConnectionPool:
+    """One keep-alive HTTP(S) connection per thread to a single host."""
+
+    def __init__(self, base_url, timeout=DEFAULT_TIMEOUT):
+        parts = urllib.parse.urlsplit(base_url)
+        if parts.scheme not in ("http", "https"):
+            raise ValueError(f"Unsupported API URL: {base_url}")
+        self.connection_class = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+        self.host = parts.netloc
+        self.path = parts.path or "/"
+        self.timeout = timeout
+        self.opened = 0
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections = set()
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self.connection_class(self.host, timeout=self.timeout)
+            with self._lock:
+                self.opened += 1
+                self._connections.add(conn)
+        return conn
+
+    def _discard(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+            with self._lock:
+                self._connections.discard(conn)
+
+    def close(self):
+        """Close every thread's connection (call once no requests are in flight)."""
+        with self._lock:
+            connections, self._connections = self._connections, set()
+        for conn in connections:
+            conn.close()
+
+    def get(self, params, headers=None):
+        """GET path?params and return (status, body bytes)."""
+        target = f"{self.path}?{urllib.parse.urlencode(params)}"
+        # A reused connection may have been closed by the server; retry once on a fresh one
+        for attempt in range(2):
+            conn = self._connection()
+            try:
+                conn.request("GET", target, headers=headers or {})
+                response = conn.getresponse()
+                body = response.read()
+            except (http.client.HTTPException, OSError):
+                self._discard()
+                if attempt:
+                    raise
+                continue
+            if response.will_close:
+                self._discard()
+            return response.status, body
+
+
+class WikipediaResolver:
+    """Resolves search terms to (title, url) through the opensearch API."""
+
+    def __init__(self, api_url=None, rate=DEFAULT_RATE, workers=DEFAULT_WORKERS, timeout=DEFAULT_TIMEOUT,
+                 cache=None, offline=False):
+        self.api_url = api_url or os.environ.get("HPI_WIKIPEDIA_API") or DEFAULT_API_URL
+        self.workers = max(1, workers)
+        self.bucket = TokenBucket(rate, burst=self.workers)
+        self.pool = ConnectionPool(self.api_url, timeout)
+        self.cache = cache
+        self.offline = offline
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Stop the worker threads and close their connections."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown()
+        self.pool.close()
+
+    def _map(self, fn, items):
+        """pool.map over the resolver's worker threads, started on first use."""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="wikipedia")
+            executor = self._executor
+        return executor.map(fn, items)
+
+    def request(self, params, is_negative=None):
+        """
+        GET against the API returning decoded JSON (raises on HTTP errors).
+
+        Served from the cache when fresh (or at all, offline); otherwise
+        rate-limited and stored, flagged negative if is_negative(data) is true.
+        """
+        key = normalize_url(self.api_url, params)
+        if self.cache is not None:
+            body = self.cache.get(key, allow_stale=self.offline)
+            if body is not None:
+                return json.loads(body.decode("utf-8"))
+        if self.offline:
+            raise NotCached("not in cache (offline mode)")
+
+        self.bucket.acquire()
+        with self._lock:
+            self.requests += 1
+        status, body = self.pool.get(params, {"User-Agent": USER_AGENT, "Accept-Encoding": "identity"})
+        if status != 200:
+            raise OSError(f"HTTP {status}")
+        data = json.loads(body.decode("utf-8"))
+
+        if self.cache is not None:
+            self.cache.put(key, body, negative=bool(is_negative and is_negative(data)))
+        return data
+
+    def search(self, query):
+        """Best opensearch match for a query; errors are returned, not raised."""
+        params = {"action": "opensearch", "search": query, "limit": 3, "format": "json"}
+        try:
+            data = self.request(params, is_negative=lambda data: not _has_match(data))
+        except (OSError, http.client.HTTPException, ValueError) as e:
+            return Match(None, None, str(e) or type(e).__name__)
+
+        if _has_match(data):
+            return Match(data[1][0], data[3][0])
+        return Match(None, None)
+
+    def search_many(self, queries):
+        """{query: Match} for every distinct query, resolved concurrently."""
+        unique = list(dict.fromkeys(queries))
+        return dict(zip(unique, self._map(self.search, unique)))
+
+    def query_titles(self, titles):
+        """
+        {title: Page} for every distinct title, resolved in batches of QUERY_BATCH.
+
+        Each batch is one action=query request that follows normalizations
+        ("armenian_Genocide" -> "Armenian genocide") and redirects in bulk.
+        Titles are sorted before batching so repeat runs reuse cached batches.
+        """
+        unique = sorted(set(titles))
+        batches = [unique[i:i + QUERY_BATCH] for i in range(0, len(unique), QUERY_BATCH)]
+        pages = {}
+        for result in self._map(self._query_batch, batches):
+            pages.update(result)
+        return pages
+
+    def _query_batch(self, titles):
+        valid = [title for title in titles if title and "|" not in title]
+        pages = {title: Page(None, missing=True, error="invalid title") for title in titles if title not in valid}
+        if not valid:
+            return pages
+
+        params = {"action": "query", "titles": "|".join(valid), "redirects": 1,
+                  "format": "json", "formatversion": 2}
+        try:
+            data = self.request(params, is_negative=lambda data: any(
+                page.get("missing") or page.get("invalid") for page in data.get("query", {}).get("pages", [])
+            ))
+        except (OSError, http.client.HTTPException, ValueError) as e:
+            pages.update((title, Page(None, error=str(e) or type(e).__name__)) for title in valid)
+            return pages
+
+        query = data.get("query", {})
+        normalized = {item["from"]: item["to"] for item in query.get("normalized", [])}
+        redirects = {item["from"]: item["to"] for item in query.get("redirects", [])}
+        by_title = {page["title"]: page for page in query.get("pages", [])}
+
+        for title in valid:
+            target = normalized.get(title, title)
+            seen = {target}
+            while target in redirects and redirects[target] not in seen:
+                target = redirects[target]
+                seen.add(target)
+            page = by_title.get(target)
+            if page is None or page.get("missing") or page.get("invalid"):
+                pages[title] = Page(None, missing=True)
+            else:
+                pages[title] = Page(page["title"])
+        return pages
+
+    def summary(self):
+        limit = f"≤{self.bucket.rate:g}/s" if self.bucket.rate > 0 else "no rate limit"
+        line = f"{self.requests} API requests over {self.pool.opened} connection(s) ({self.workers} workers, {limit})"
+        if self.cache is not None:
+            line += f"; {self.cache.summary()}"
+        if self.offline:
+            line += "; offline"
+        return line
+
+
+def _has_match(data):
+    # data = [query, [titles], [descriptions], [urls]]
+    return len(data) >= 4 and bool(data[3])
+
+
+def add_arguments(parser):
+    """Add the resolver options shared by the Wikipedia scripts."""
+    parser.add_argument("--api-url", help=f"Wikipedia API endpoint (default: $HPI_WIKIPEDIA_API or {DEFAULT_API_URL})")
+    parser.add_argument("--rate", type=float, default=DEFAULT_RATE,
+                        help=f"max requests per second, all workers combined (default: {DEFAULT_RATE:g}; 0 = unlimited)")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help=f"concurrent lookups (default: {DEFAULT_WORKERS})")
+    parser.add_argument("--offline", action="store_true",
+                        help="answer from the response cache only, expired entries included; never touch the network")
+    parser.add_argument("--no-cache", action="store_true", help="don't read or write the response cache")
+    parser.add_argument("--cache-ttl", type=float, default=DEFAULT_TTL / DAY, metavar="DAYS",
+                        help=f"reuse cached responses for this long (default: {DEFAULT_TTL / DAY:g})")
+    parser.add_argument("--negative-ttl", type=float, default=DEFAULT_NEGATIVE_TTL / DAY, metavar="DAYS",
+                        help=f"reuse cached no-match responses for this long (default: {DEFAULT_NEGATIVE_TTL / DAY:g})")
+
+
+def from_args(args):
+    """Resolver configured from add_arguments() options."""
+    cache = None if args.no_cache else ResponseCache(ttl=args.cache_ttl * DAY, negative_ttl=args.negative_ttl * DAY)
+    return WikipediaResolver(args.api_url, rate=args.rate, workers=args.workers, cache=cache, offline=args.offline)
+
+
+def get_resolver():
+    """Process-wide resolver with default settings (cached)."""
+    global _resolver
+    if _resolver is None:
+        _resolver = WikipediaResolver(cache=ResponseCache())
+    return _resolver
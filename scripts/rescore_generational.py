@@ -11,11 +11,11 @@ This distinguishes:
 - Extermination (we want to end their future)
 """
 
-import json
+import argparse
 from pathlib import Path
 
-ROOT = Path(__file__).parent.parent
-DATA_DIR = ROOT / "data" / "events"
+from hpi.pipeline import Pipeline, Report, add_arguments
+from hpi.scoring import get_engine
 
 # New values based on historical analysis
 # True = children/reproduction specifically targeted to eliminate future
@@ -101,16 +101,13 @@ GENERATIONAL_TARGETING = {
 }
 
 
-def rescore_event(filepath: Path) -> bool:
-    """Update generational_targeting for a single event."""
+def rescore_event(filepath: Path, event: dict, report: Report) -> None:
+    """Pipeline transform: update generational_targeting for a single event."""
     stem = filepath.stem
 
     if stem not in GENERATIONAL_TARGETING:
-        print(f"⚠️  No mapping for {stem}")
-        return False
-
-    with open(filepath, encoding="utf-8") as f:
-        event = json.load(f)
+        report.log(f"⚠️  No mapping for {stem}")
+        return
 
     new_value = GENERATIONAL_TARGETING[stem]
     sys_breakdown = event["metrics"]["breakdowns"]["systematic_intensity"]
@@ -136,25 +133,19 @@ def rescore_event(filepath: Path) -> bool:
     event["metrics"]["breakdowns"]["systematic_intensity"] = new_breakdown
 
     # Recalculate systematic_intensity score
-    true_count = sum(1 for v in new_breakdown.values() if v is True)
-    new_score = int((true_count / 9) * 100)
+    new_score = get_engine().score_breakdown("systematic_intensity", new_breakdown)
     old_score = event["metrics"]["scores"]["systematic_intensity"]
     event["metrics"]["scores"]["systematic_intensity"] = new_score
 
-    # Write back
-    with open(filepath, "w", encoding="utf-8") as f:
-        json.dump(event, f, indent=2, ensure_ascii=False)
-        f.write("\n")
-
     # Report change
     val_change = "T→T" if old_value and new_value else "T→F" if old_value and not new_value else "F→T" if not old_value and new_value else "F→F"
     score_change = new_score - old_score
     symbol = "↑" if score_change > 0 else "↓" if score_change < 0 else "="
 
+    report.count("modified")
     if old_value != new_value:
-        print(f"{'✓' if score_change != 0 else '·'} {stem:40} {val_change}  {old_score:3}% → {new_score:3}% ({symbol}{abs(score_change)})")
-
-    return True
+        report.count("changes")
+        report.log(f"{'✓' if score_change != 0 else '·'} {stem:40} {val_change}  {old_score:3}% → {new_score:3}% ({symbol}{abs(score_change)})")
 
 
 def main():
@@ -162,27 +153,17 @@ def main():
     print("Question: Were children/reproduction specifically targeted")
     print("          to eliminate the group's future?\n")
 
-    modified = 0
-    changes = 0
-
-    for filepath in sorted(DATA_DIR.glob("*.json")):
-        if "template" in filepath.name:
-            continue
-
-        stem = filepath.stem
-        if stem in GENERATIONAL_TARGETING:
-            with open(filepath) as f:
-                d = json.load(f)
-            old_val = d["metrics"]["breakdowns"]["systematic_intensity"].get("broad_targeting", False)
-            new_val = GENERATIONAL_TARGETING[stem]
-            if old_val != new_val:
-                changes += 1
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_arguments(parser)
+    args = parser.parse_args()
 
-        if rescore_event(filepath):
-            modified += 1
+    report = Pipeline([("generational_targeting", rescore_event)]).run(dry_run=args.dry_run, jobs=args.jobs)
+    modified = report.counts["modified"]
+    changes = report.counts["changes"]
 
     print(f"\n✓ Modified {modified} events")
     print(f"✓ Changed {changes} values from True to False")
+    print(report.summary())
 
 
 if __name__ == "__main__":
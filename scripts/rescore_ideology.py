@@ -9,11 +9,11 @@ Replaces:
 Based on historical analysis of each event.
 """
 
-import json
+import argparse
 from pathlib import Path
 
-ROOT = Path(__file__).parent.parent
-DATA_DIR = ROOT / "data" / "events"
+from hpi.pipeline import Pipeline, Report, add_arguments
+from hpi.scoring import get_engine
 
 # New ideology values based on historical analysis
 # Format: event_stem -> (dehumanization, mass_mobilization)
@@ -95,38 +95,26 @@ NEW_VALUES = {
 }
 
 
-def rescore_event(filepath: Path) -> bool:
-    """Update ideology items for a single event. Returns True if modified."""
+def rescore_event(filepath: Path, event: dict, report: Report) -> None:
+    """Pipeline transform: update ideology items for a single event."""
     stem = filepath.stem
 
     if stem not in NEW_VALUES:
-        print(f"⚠️  No mapping for {stem}")
-        return False
-
-    with open(filepath, encoding="utf-8") as f:
-        event = json.load(f)
+        report.log(f"⚠️  No mapping for {stem}")
+        return
 
     dehumanization, mass_mobilization = NEW_VALUES[stem]
 
     ideology = event["metrics"]["breakdowns"].get("ideology", {})
 
-    # Get existing values we're keeping
-    purity_ideal = ideology.get("purity_ideal", False)
-    victim_narrative = ideology.get("victim_narrative", False)
-    utopianism = ideology.get("utopianism", False)
-
-    # Build new ideology breakdown
-    new_ideology = {
-        "purity_ideal": purity_ideal,
-        "dehumanization": dehumanization,
-        "mass_mobilization": mass_mobilization,
-        "victim_narrative": victim_narrative,
-        "utopianism": utopianism
-    }
+    # Build new ideology breakdown in schema key order, keeping the other items
+    engine = get_engine()
+    new_ideology = {key: ideology.get(key, False) for key in engine.categories["ideology"]}
+    new_ideology["dehumanization"] = dehumanization
+    new_ideology["mass_mobilization"] = mass_mobilization
 
     # Calculate new score
-    true_count = sum(1 for v in new_ideology.values() if v)
-    new_score = int((true_count / 5) * 100)
+    new_score = engine.score_breakdown("ideology", new_ideology)
 
     old_score = event["metrics"]["scores"]["ideology"]
 
@@ -134,16 +122,10 @@ def rescore_event(filepath: Path) -> bool:
     event["metrics"]["breakdowns"]["ideology"] = new_ideology
     event["metrics"]["scores"]["ideology"] = new_score
 
-    # Write back
-    with open(filepath, "w", encoding="utf-8") as f:
-        json.dump(event, f, indent=2, ensure_ascii=False)
-        f.write("\n")
-
     change = new_score - old_score
     symbol = "↑" if change > 0 else "↓" if change < 0 else "="
-    print(f"{'✓' if change != 0 else '·'} {stem:40} {old_score:3}% → {new_score:3}% ({symbol}{abs(change)})")
-
-    return True
+    report.count("modified")
+    report.log(f"{'✓' if change != 0 else '·'} {stem:40} {old_score:3}% → {new_score:3}% ({symbol}{abs(change)})")
 
 
 def main():
@@ -151,14 +133,14 @@ def main():
     print("Replacing: historical_claim → dehumanization")
     print("Replacing: higher_purpose → mass_mobilization\n")
 
-    modified = 0
-    for filepath in sorted(DATA_DIR.glob("*.json")):
-        if "template" in filepath.name:
-            continue
-        if rescore_event(filepath):
-            modified += 1
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    report = Pipeline([("ideology", rescore_event)]).run(dry_run=args.dry_run, jobs=args.jobs)
 
-    print(f"\n✓ Modified {modified} events")
+    print(f"\n✓ Modified {report.counts['modified']} events")
+    print(report.summary())
 
 
 if __name__ == "__main__":
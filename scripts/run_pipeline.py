@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Runs the per-event data transforms in a single pass over the corpus.
+
+Each event file is read once, every selected transform is applied in memory
+in the order below, and the file is written (atomically) at most once.
+
+Usage:
+  python scripts/run_pipeline.py                      # all transforms
+  python scripts/run_pipeline.py rationales pattern_tags
+  python scripts/run_pipeline.py --dry-run            # show diffs, write nothing
+  python scripts/run_pipeline.py --jobs 0             # one worker process per CPU
+  python scripts/run_pipeline.py --list
+"""
+
+import argparse
+
+from hpi.pipeline import Pipeline, add_arguments
+
+import add_descriptions
+import add_pattern_tags
+import add_rationales
+import add_warning_signs
+import rescore_generational
+import rescore_ideology
+
+# Order matters: pattern tags are detected from the text written by the
+# earlier transforms (warning_signs, rationales, ...), so they run last.
+TRANSFORMS = [
+    ("descriptions", add_descriptions.add_description_to_file),
+    ("rationales", add_rationales.add_rationale),
+    ("warning_signs", add_warning_signs.add_event_causes),
+    ("generational_targeting", rescore_generational.rescore_event),
+    ("ideology", rescore_ideology.rescore_event),
+    ("pattern_tags", add_pattern_tags.tag_event),
+]
+
+
+def build_pipeline(names=None):
+    """Pipeline with the selected transforms (all if names is empty), in TRANSFORMS order."""
+    known = [name for name, _ in TRANSFORMS]
+    unknown = [name for name in names or [] if name not in known]
+    if unknown:
+        raise SystemExit(f"Unknown transform(s): {', '.join(unknown)} (choose from {', '.join(known)})")
+
+    return Pipeline([(name, fn) for name, fn in TRANSFORMS if not names or name in names])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("transforms", nargs="*", help="transforms to run (default: all)")
+    parser.add_argument("--list", action="store_true", help="list available transforms and exit")
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    if args.list:
+        for name, _ in TRANSFORMS:
+            print(name)
+        return
+
+    pipeline = build_pipeline(args.transforms)
+    print(f"Running: {', '.join(name for name, _ in pipeline.transforms)}\n")
+
+    report = pipeline.run(dry_run=args.dry_run, jobs=args.jobs)
+    if "pattern_tags" in dict(pipeline.transforms):
+        if not args.dry_run:
+            add_pattern_tags.save_tag_cache(report)
+        print(f"\n{add_pattern_tags.tag_summary(report)}")
+
+    print(f"\n{report.summary()}")
+
+
+if __name__ == "__main__":
+    main()
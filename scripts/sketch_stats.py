@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Approximate distinct-participant counts and mortality quantiles (hpi/sketches.py).
+
+Prints distinct participants.perpetrators/victims (overall and per region)
+and quantiles of metrics.mortality min/max, from HyperLogLog and t-digest
+sketches. Events are streamed (only the sketched fields are parsed) in
+contiguous shards, which are sketched in parallel with --jobs and merged.
+
+Usage:
+  python scripts/sketch_stats.py
+  python scripts/sketch_stats.py --jobs 4          # sketch shards in 4 processes, then merge
+  python scripts/sketch_stats.py --check           # cross-check against exact values and the error bounds,
+                                                   # and against calc_stats(sketches=True)
+  python scripts/sketch_stats.py --synthetic 1000000 --jobs 0 --check
+                                                   # N synthetic events derived from the corpus
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from hpi import corpus
+from hpi.sketches import QUANTILES, ROLES, SKETCH_FIELDS, StatsSketch, check, exact_summary
+from update_readme import calc_stats
+
+# Distinct names per participant in the synthetic corpus (each copy draws one)
+SYNTHETIC_NAMES = 100_000
+
+
+def synthetic_events(base, start, stop):
+    """
+    Events start..stop of a synthetic corpus that cycles through `base`, with
+    each participant name suffixed from a pool of SYNTHETIC_NAMES and the
+    mortality scaled by a log-normal factor. Deterministic per index.
+    """
+    for i in range(start, stop):
+        event = base[i % len(base)]
+        rng = random.Random(i)
+        mortality = event.get("metrics", {}).get("mortality", {})
+        yield {
+            "geography": event.get("geography", {}),
+            "participants": {
+                role: [f"{name} #{rng.randrange(SYNTHETIC_NAMES)}" for name in event.get("participants", {}).get(role, [])]
+                for role in ROLES
+            },
+            "metrics": {"mortality": {bound: round(mortality.get(bound, 0) * rng.lognormvariate(0, 1))
+                                      for bound in ("min", "max")}},
+        }
+
+
+def shard_events(synthetic, start, stop):
+    """Events of one shard: a slice of the corpus, or of the synthetic corpus built on it."""
+    if synthetic:
+        return synthetic_events(corpus.load_events(fields=SKETCH_FIELDS), start, stop)
+    return corpus.iter_events(fields=SKETCH_FIELDS, start=start, stop=stop)
+
+
+def sketch_shard(synthetic, start, stop):
+    """Worker entry point: sketch one contiguous shard."""
+    return StatsSketch().update(shard_events(synthetic, start, stop))
+
+
+def shard_ranges(count, shards):
+    """Split range(count) into `shards` contiguous, nearly equal ranges."""
+    bounds = [count * i // shards for i in range(shards + 1)]
+    return [range(start, stop) for start, stop in zip(bounds, bounds[1:]) if stop > start]
+
+
+def sketch_all(count, synthetic, jobs):
+    """Sketch `count` events in `jobs` shards (in parallel when jobs > 1) and merge them."""
+    shards = shard_ranges(count, jobs)
+    if jobs == 1:
+        sketches = [sketch_shard(synthetic, shard.start, shard.stop) for shard in shards]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = [pool.submit(sketch_shard, synthetic, shard.start, shard.stop) for shard in shards]
+            sketches = [future.result() for future in futures]
+    merged = StatsSketch()
+    for sketch in sketches:
+        merged.merge(sketch)
+    return merged
+
+
+def compare_distinct(sketch, other):
+    """
+    Differences between the distinct-count registers of two sketches of the
+    same events. HyperLogLog merges are exact, so a merge of shard sketches
+    must equal a single-pass sketch register for register.
+    """
+    pairs = [(role, sketch.distinct[role], other.distinct[role]) for role in ROLES]
+    for region in sketch.by_region.keys() | other.by_region.keys():
+        for role in ROLES:
+            pairs.append((f"{region} {role}", sketch.by_region.get(region, {}).get(role),
+                          other.by_region.get(region, {}).get(role)))
+    return [f"{label}: merged shards differ from calc_stats(sketches=True)"
+            for label, hll, other_hll in pairs
+            if hll is None or other_hll is None or hll.registers != other_hll.registers]
+
+
+def format_quantiles(values):
+    return "  ".join(f"p{q * 100:g}={value:,.0f}" for q, value in values.items() if value is not None)
+
+
+def print_summary(summary, exact=None):
+    """Print a summary; with `exact` (an exact_summary), the exact numbers go alongside."""
+    def show(estimate, exact_value):
+        return f"{estimate:,}" if exact is None else f"{estimate:,} (exact {exact_value:,})"
+
+    for role in ROLES:
+        print(f"Distinct {role}: {show(summary[role], exact and exact[role])}")
+    print("By region:")
+    for region, counts in sorted(summary["by_region"].items(), key=lambda item: -item[1]["perpetrators"]):
+        exact_counts = exact["by_region"][region] if exact else {}
+        print(f"  {region:30} " + "  ".join(
+            f"{role} {show(counts[role], exact_counts.get(role))}" for role in ROLES))
+    for bound in ("min", "max"):
+        key = f"mortality_{bound}"
+        print(f"Mortality {bound}: {format_quantiles(summary[key])}")
+        if exact is not None:
+            print(f"     exact: {format_quantiles(exact[key])}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-j", "--jobs", type=int, default=1, metavar="N",
+                        help="worker processes, one shard each (0 = one per CPU; default: 1)")
+    parser.add_argument("--check", action="store_true",
+                        help="compare with exact values and fail if an estimate is outside its error bound")
+    parser.add_argument("--synthetic", type=int, metavar="N", help="sketch N synthetic events instead of the corpus")
+    args = parser.parse_args()
+
+    jobs = args.jobs or os.cpu_count()
+    count = args.synthetic if args.synthetic else corpus.event_count()
+
+    start = time.perf_counter()
+    sketch = sketch_all(count, args.synthetic, jobs)
+    print(f"Sketched {count:,} events in {jobs} shard(s) ({time.perf_counter() - start:.1f}s)\n")
+
+    if not args.check:
+        print_summary(sketch.summary())
+        return
+
+    print_summary(sketch.summary(), exact_summary(shard_events(args.synthetic, 0, count)))
+    problems = check(sketch, shard_events(args.synthetic, 0, count), QUANTILES)
+
+    # The sketch calc_stats builds in its one pass must agree with the shards
+    single = calc_stats(shard_events(args.synthetic, 0, count), stream=True, sketches=True)["sketches"]
+    problems += compare_distinct(sketch, single)
+    problems += [f"calc_stats: {problem}" for problem in check(single, shard_events(args.synthetic, 0, count), QUANTILES)]
+    if problems:
+        sys.exit("❌ Outside the error bounds:\n  " + "\n  ".join(problems))
+    print("\n✓ Every estimate is within its error bound, and matches calc_stats(sketches=True)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,41 +1,163 @@
 #!/usr/bin/env python3
 """
 Updates data/index.json with the list of all event files in data/events/.
+
+Also writes the bundled dataset the web app loads in a single request:
+  data/bundle.<hash>.json       events + knowledge + id→event and event→knowledge lookups
+                                + rollup cube of precomputed stats (hpi/rollup.py)
+                                + filter bitsets and sort permutations (hpi/facets.py)
+  data/bundle.<hash>.json.gz    the same, pre-gzipped (for gzip_static-style serving)
+  data/manifest.json            {"bundle": "data/bundle.<hash>.json", ...}, read first
+                                by src/app/store.js (never cache this one)
+  data/series.json              per-decade/century chart series (hpi/series.py)
+
+The hash in the name is that of the file's content, so the bundle can be
+cached forever; a build that produces the same bytes writes nothing.
+
+With a JSONL corpus (data/events.jsonl, see scripts/convert_corpus.py)
+index.json lists the files that `convert_corpus.py --to-files` restores, so
+it still tracks the corpus. Those files do not exist while the corpus is
+JSONL, so the web app's per-file fallback (used when data/manifest.json is
+missing) cannot load it; deploy the bundle.
 """
 
+import gzip
+import hashlib
 import json
-import glob
 import os
+import re
+from pathlib import Path
+
+from hpi.corpus import (EVENTS_DIR, event_paths, events_source, load_events, load_knowledge_lost,
+                        load_knowledge_saved, write_bytes_if_changed)
+from hpi.facets import build_facets
+from hpi.joins import Joins
+from hpi.rollup import Rollup
+from hpi.series import build_series
 
 ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-EVENTS_DIR = os.path.join(ROOT_DIR, "data", "events")
-INDEX_FILE = os.path.join(ROOT_DIR, "data", "index.json")
+DATA_DIR = os.path.join(ROOT_DIR, "data")
+INDEX_FILE = os.path.join(DATA_DIR, "index.json")
+MANIFEST_FILE = os.path.join(DATA_DIR, "manifest.json")
+SERIES_FILE = os.path.join(DATA_DIR, "series.json")
+
+# Bump when the bundle layout changes (checked by src/app/store.js)
+BUNDLE_VERSION = 2
+
+
+def build_bundle(events, lost_entries, saved_entries, joins=None, rollup=None):
+    """Assemble the bundle payload."""
+    joins = joins or Joins(events, lost_entries, saved_entries)
+    rollup = rollup or Rollup(events, joins)
+    return {
+        "version": BUNDLE_VERSION,
+        "events": events,
+        "knowledgeLost": lost_entries,
+        "knowledgeSaved": saved_entries,
+        "knowledgeByEvent": joins.knowledge_by_event,
+        "eventIndex": joins.event_index,
+        "rollup": rollup.to_json(),
+        "facets": build_facets(events),
+    }
+
+
+def dumps(data):
+    """Compact JSON, as served to the browser."""
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+
+def write_hashed(name, data):
+    """
+    Write data as data/<name>.<hash>.json plus its .json.gz, unless that
+    content is already there, then remove older builds of <name> and point
+    the manifest at it. Returns (path relative to the site root, written).
+    """
+    content_hash = hashlib.sha256(data).hexdigest()[:12]
+    filename = f"{name}.{content_hash}.json"
+    path = Path(DATA_DIR) / filename
+    written = write_bytes_if_changed(path, data)
+    written |= write_bytes_if_changed(path.with_name(filename + ".gz"), gzip.compress(data, mtime=0))
+
+    built = re.compile(re.escape(name) + r"\.[0-9a-f]{12}\.json(\.gz)?")
+    for old in Path(DATA_DIR).iterdir():
+        if built.fullmatch(old.name) and not old.name.startswith(filename):
+            old.unlink()
+
+    url = f"data/{filename}"
+    update_manifest(name, url)
+    return url, written
+
+
+def update_manifest(name, url):
+    """Set data/manifest.json's entry for a hashed file (see write_hashed)."""
+    try:
+        with open(MANIFEST_FILE, encoding="utf-8") as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        manifest = {}
+    manifest[name] = url
+    write_bytes_if_changed(MANIFEST_FILE, json.dumps(manifest, indent=2, sort_keys=True).encode("utf-8"))
+
+
+def write_bundle(bundle):
+    """Write the hashed bundle (see write_hashed). Returns (url, size, written)."""
+    data = dumps(bundle).encode("utf-8")
+    url, written = write_hashed("bundle", data)
+    return url, len(data), written
+
+
+def write_series(series):
+    """Write data/series.json (only if it changed). Returns (size in bytes, written)."""
+    data = dumps(series).encode("utf-8")
+    return len(data), write_bytes_if_changed(SERIES_FILE, data)
+
+
+def update_index_file():
+    """Write data/index.json, the list of event files (only if it changed)."""
+    # Find all event JSON files in data/events/ (templates are skipped), or
+    # the files a JSONL corpus converts back to
+    source = events_source()
+    if source.suffix == ".jsonl":
+        from hpi.jsonl import JsonlStore
+
+        with JsonlStore(source) as store:
+            paths = [EVENTS_DIR / store.name(number) for number in range(len(store))]
+    else:
+        paths = event_paths()
 
-def main():
-    # Find all JSON files in data/events/
-    pattern = os.path.join(EVENTS_DIR, "*.json")
-    files = glob.glob(pattern)
-    
-    # Filter out templates and sort
     event_files = []
-    for f in files:
-        filename = os.path.basename(f)
-        if filename == "_template.json":
-            continue
-        
+    for f in paths:
         # Create relative path from project root (e.g., "data/events/event.json")
         rel_path = os.path.relpath(f, ROOT_DIR)
         # Use forward slashes for JSON compatibility
         rel_path = rel_path.replace(os.sep, "/")
         event_files.append(rel_path)
-    
+
     event_files.sort()
-    
-    # Write to index.json
+
+    # Write to index.json (only if it changed, to keep its mtime stable)
     print(f"Found {len(event_files)} events.")
-    with open(INDEX_FILE, "w", encoding="utf-8") as f:
-        json.dump(event_files, f, indent=2)
-    print(f"Updated {INDEX_FILE}")
+    if write_bytes_if_changed(INDEX_FILE, json.dumps(event_files, indent=2).encode("utf-8")):
+        print(f"Updated {INDEX_FILE}")
+    else:
+        print(f"{INDEX_FILE} is up to date")
+
+
+def main():
+    update_index_file()
+
+    # Write the single-request bundle
+    events, lost, saved = load_events(), load_knowledge_lost(), load_knowledge_saved()
+    joins = Joins(events, lost, saved)
+    for warning in joins.warnings():
+        print(f"⚠️  {warning}")
+    bundle = build_bundle(events, lost, saved, joins)
+    url, size, written = write_bundle(bundle)
+    print(f"{'Updated' if written else 'Up to date:'} {url} ({size:,} bytes)")
+
+    # Write the chart series
+    size, written = write_series(build_series(events, joins))
+    print(f"{'Updated' if written else 'Up to date:'} {SERIES_FILE} ({size:,} bytes)")
 
 if __name__ == "__main__":
     main()
@@ -2,84 +2,118 @@
 """
 Updates README.md, KNOWLEDGE_LOST.md, and KNOWLEDGE_SAVED.md with statistics.
 
-Usage: python scripts/update_readme.py
+Usage: python scripts/update_readme.py [--dry-run] [--force] [--stream]
 
 Markers in markdown files:
   <!-- STATS:key -->...<!-- /STATS:key -->
 
 Replaces content between markers with generated statistics.
+
+A file is only regenerated when its inputs (event files, knowledge JSON, the
+generator code, or the file itself) changed since the last run; the hashes
+are kept in .cache/readme_state.json, with each input file's mtime and size,
+so a file is only read and hashed again once those change.
+
+With --stream the corpus is read in one pass, an event at a time, and never
+held in memory (see stream_corpus), for corpora larger than RAM; the output
+is the same, except that the denied table lists only the DENIED_TABLE_ROWS
+deadliest denied events.
 """
 
+import argparse
+import difflib
+import hashlib
 import json
-import glob
+import os
 import re
 from pathlib import Path
 
+from hpi import corpus, markers
+from hpi.audit import audit
+from hpi.joins import Joins
+from hpi.rollup import Rollup
+from hpi.sketches import StatsSketch
+from hpi.streaming import TopN, chunks, tap
+
 ROOT = Path(__file__).parent.parent
-DATA_DIR = ROOT / "data" / "events"
 README_PATH = ROOT / "README.md"
 KNOWLEDGE_LOST_PATH = ROOT / "KNOWLEDGE_LOST.md"
 KNOWLEDGE_SAVED_PATH = ROOT / "KNOWLEDGE_SAVED.md"
-KNOWLEDGE_LOST_JSON = ROOT / "data" / "knowledge_lost.json"
-KNOWLEDGE_SAVED_JSON = ROOT / "data" / "knowledge_saved.json"
-
-
-def load_events():
-    """Load all event JSON files."""
-    events = []
-    for filepath in sorted(DATA_DIR.glob("*.json")):
-        if "template" in filepath.name:
-            continue
-        with open(filepath, encoding="utf-8") as f:
-            events.append(json.load(f))
-    return events
 
 
-def calc_stats(events):
-    """Calculate statistics from events."""
-    total_deaths_min = 0
-    total_deaths_max = 0
-    year_min = 9999
-    year_max = 0
+# Every event field the generators, joins and audit read; the prose is never loaded
+README_FIELDS = [
+    "id", "name", "period", "denial_status",
+    "geography.region", "participants.perpetrators",
+    "metrics.mortality", "metrics.scores", "metrics.breakdowns",
+    "analysis.tier", "analysis.pattern_tags",
+]
 
-    by_tier = {}
-    by_region = {}
-    by_denial = {"denied": [], "partial": [], "acknowledged": [], "disputed": [], "suppressed": []}
+# Denied events kept for the denied table in --stream mode (the deadliest ones);
+# the in-memory mode lists them all
+DENIED_TABLE_ROWS = 25
 
-    for e in events:
-        # Deaths
-        mortality = e.get("metrics", {}).get("mortality", {})
-        total_deaths_min += mortality.get("min", 0)
-        total_deaths_max += mortality.get("max", 0)
+# Dimensions calc_stats reads from the rollup
+STATS_DIMENSIONS = ("tier", "region", "denial_status", "pattern_tag")
 
-        # Years
-        period = e.get("period", {})
-        year_min = min(year_min, period.get("start", 9999))
-        year_max = max(year_max, period.get("end", 0))
+# Events audited at a time by stream_corpus
+AUDIT_CHUNK = 1_000
 
-        # Tier
-        tier = e.get("analysis", {}).get("tier", "Unknown")
-        by_tier[tier] = by_tier.get(tier, 0) + 1
 
-        # Region
-        region = e.get("geography", {}).get("region", "Unknown").split("/")[0].split("(")[0].strip()
-        by_region[region] = by_region.get(region, 0) + 1
+def load_events():
+    """Load the README_FIELDS of every event (via the shared corpus loader)."""
+    return corpus.load_events(fields=README_FIELDS)
+
+
+def max_deaths(event):
+    return event.get("metrics", {}).get("mortality", {}).get("max", 0)
+
+
+def calc_stats(events, joins=None, stream=False, sketches=False):
+    """
+    Calculate statistics from events (read from a one-pass rollup).
+
+    With stream=True, events can be any iterable (e.g. corpus.iter_events())
+    and are not kept: the rollup holds only its aggregates, and by_denial
+    holds just the DENIED_TABLE_ROWS deadliest denied events, collected in a
+    bounded heap. denial_counts has the full per-status counts either way.
+
+    With sketches=True, stats["sketches"] is a mergeable hpi.sketches.StatsSketch
+    of the same pass (approximate distinct perpetrators/victims per region and
+    mortality quantiles; events need the SKETCH_FIELDS for it).
+    """
+    sketch = StatsSketch() if sketches else None
+    if sketches:
+        events = tap(events, sketch.add)
+    if stream:
+        denied = TopN(DENIED_TABLE_ROWS, key=max_deaths)
+        events = tap(events, lambda event: denied.push(event) if event.get("denial_status") == "denied" else None)
+        rollup = Rollup(events, joins, dimensions=STATS_DIMENSIONS, cube=(), keep_events=False)
+    else:
+        rollup = Rollup(events, joins)
+    total = rollup.total
+    by_denial = rollup.by("denial_status")
 
-        # Denial status
-        denial = e.get("denial_status", "unknown")
-        if denial in by_denial:
-            by_denial[denial].append(e)
+    year_min = total.year_min if total.year_min is not None else 9999
+    year_max = total.year_max if total.year_max is not None else 0
 
     return {
-        "count": len(events),
-        "deaths_min": total_deaths_min,
-        "deaths_max": total_deaths_max,
+        "count": total.count,
+        "deaths_min": total.deaths_min,
+        "deaths_max": total.deaths_max,
         "year_min": year_min,
         "year_max": year_max,
         "year_span": year_max - year_min,
-        "by_tier": by_tier,
-        "by_region": by_region,
-        "by_denial": by_denial,
+        "by_tier": {tier: cell.count for tier, cell in rollup.by("tier").items()},
+        "by_region": {region: cell.count for region, cell in rollup.by("region").items()},
+        "by_denial": {"denied": denied.items()} if stream else {
+            status: by_denial[status].events if status in by_denial else []
+            for status in ("denied", "partial", "acknowledged", "disputed", "suppressed")
+        },
+        "denial_counts": {status: cell.count for status, cell in by_denial.items()},
+        "by_pattern_tag": {tag: cell.count for tag, cell in rollup.by("pattern_tag").items()},
+        "rollup": rollup,
+        "sketches": sketch,
     }
 
 
@@ -124,34 +158,41 @@ def calc_index(event):
 
 def generate_events_table(events):
     """Generate main events table."""
+    return format_events_table(event_row(e) for e in events)
+
+
+def format_events_table(rows):
+    """Events table from event_row() tuples."""
     # Sort chronologically (by start year) to show historical patterns
-    sorted_events = sorted(events, key=lambda e: e.get("period", {}).get("start", 0))
+    sorted_rows = sorted(rows, key=lambda row: row[0])
 
     lines = ["| Event | Period | Deaths | Index | Denied? |", "|-------|--------|--------|-------|---------|"]
+    lines.extend(line for _, line in sorted_rows)
+    return "\n".join(lines)
 
-    for e in sorted_events:
-        name = e.get("name", "Unknown")
-        period = e.get("period", {})
-        period_str = f"{period.get('start', '?')}-{period.get('end', '?')}"
 
-        mortality = e.get("metrics", {}).get("mortality", {})
-        deaths = format_deaths(mortality.get("min", 0), mortality.get("max", 0))
+def event_row(e):
+    """(start year, table line) for one event."""
+    name = e.get("name", "Unknown")
+    period = e.get("period", {})
+    period_str = f"{period.get('start', '?')}-{period.get('end', '?')}"
 
-        index = calc_index(e)
-        index_str = f"{index}%"
+    mortality = e.get("metrics", {}).get("mortality", {})
+    deaths = format_deaths(mortality.get("min", 0), mortality.get("max", 0))
 
-        denial = e.get("denial_status", "unknown")
-        denial_str = {
-            "denied": "**Denied**",
-            "partial": "Partial",
-            "acknowledged": "No",
-            "disputed": "Disputed",
-            "suppressed": "Suppressed"
-        }.get(denial, denial)
+    index = calc_index(e)
+    index_str = f"{index}%"
 
-        lines.append(f"| {name} | {period_str} | {deaths} | {index_str} | {denial_str} |")
+    denial = e.get("denial_status", "unknown")
+    denial_str = {
+        "denied": "**Denied**",
+        "partial": "Partial",
+        "acknowledged": "No",
+        "disputed": "Disputed",
+        "suppressed": "Suppressed"
+    }.get(denial, denial)
 
-    return "\n".join(lines)
+    return period.get("start", 0), f"| {name} | {period_str} | {deaths} | {index_str} | {denial_str} |"
 
 
 def generate_denied_table(stats):
@@ -162,7 +203,7 @@ def generate_denied_table(stats):
 
     lines = ["| Event | Denier | Deaths |", "|-------|--------|--------|"]
 
-    for e in sorted(denied_events, key=lambda x: -x.get("metrics", {}).get("mortality", {}).get("max", 0)):
+    for e in sorted(denied_events, key=lambda x: -max_deaths(x)):
         name = e.get("name", "Unknown")
         perpetrators = e.get("participants", {}).get("perpetrators", ["Unknown"])
         denier = perpetrators[0] if perpetrators else "Unknown"
@@ -185,7 +226,7 @@ def generate_tier_breakdown(stats):
     return "\n".join(lines)
 
 
-def generate_patterns_table(events):
+def generate_patterns_table(stats):
     """Generate recurring warning signs patterns table from pattern_tags."""
     # Map pattern tags to human-readable labels
     PATTERN_LABELS = {
@@ -203,14 +244,8 @@ def generate_patterns_table(events):
         "DELIBERATE_STARVATION": "Deliberate starvation"
     }
 
-    total_events = len(events)
-    tag_counts = {tag: 0 for tag in PATTERN_LABELS}
-
-    for event in events:
-        pattern_tags = event.get("analysis", {}).get("pattern_tags", [])
-        for tag in pattern_tags:
-            if tag in tag_counts:
-                tag_counts[tag] += 1
+    total_events = stats["count"]
+    tag_counts = {tag: stats["by_pattern_tag"].get(tag, 0) for tag in PATTERN_LABELS}
 
     # Sort by frequency
     sorted_tags = sorted(tag_counts.items(), key=lambda x: -x[1])
@@ -228,33 +263,20 @@ def generate_patterns_table(events):
 
 
 def update_markdown(content, generators):
-    """Update markdown content with generated statistics."""
-    for key, generator in generators.items():
-        pattern = rf"(<!-- STATS:{key} -->).*?(<!-- /STATS:{key} -->)"
-        generated = generator()
-
-        def make_replacement(match, gen=generated):
-            # Inline stats (single values) don't need newlines
-            if "\n" not in gen:
-                return f"{match.group(1)}{gen}{match.group(2)}"
-            else:
-                return f"{match.group(1)}\n{gen}\n{match.group(2)}"
-
-        content = re.sub(pattern, make_replacement, content, flags=re.DOTALL)
-
-    return content
+    """Update markdown content with generated statistics (only generators whose markers are present run)."""
+    return markers.render(content, generators)
 
 
-def update_readme(content, events, stats):
-    """Update README content with generated statistics."""
+def update_readme(content, events, stats, rows=None):
+    """Update README content with generated statistics (rows: event_row()s to use instead of events)."""
     generators = {
         "SUMMARY": lambda: generate_summary(events, stats),
-        "EVENTS_TABLE": lambda: generate_events_table(events),
+        "EVENTS_TABLE": lambda: format_events_table(rows) if rows is not None else generate_events_table(events),
         "DENIED_TABLE": lambda: generate_denied_table(stats),
-        "DENIED_COUNT": lambda: str(len(stats["by_denial"].get("denied", []))),
+        "DENIED_COUNT": lambda: str(stats["denial_counts"].get("denied", 0)),
         "EVENT_COUNT": lambda: str(stats["count"]),
         "TIER_BREAKDOWN": lambda: generate_tier_breakdown(stats),
-        "PATTERNS_TABLE": lambda: generate_patterns_table(events),
+        "PATTERNS_TABLE": lambda: generate_patterns_table(stats),
     }
     return update_markdown(content, generators)
 
@@ -265,26 +287,12 @@ def update_readme(content, events, stats):
 
 def load_knowledge_lost():
     """Load knowledge_lost.json."""
-    if not KNOWLEDGE_LOST_JSON.exists():
-        return []
-    with open(KNOWLEDGE_LOST_JSON, encoding="utf-8") as f:
-        return json.load(f)
+    return corpus.load_knowledge_lost()
 
 
 def load_knowledge_saved():
     """Load knowledge_saved.json."""
-    if not KNOWLEDGE_SAVED_JSON.exists():
-        return []
-    with open(KNOWLEDGE_SAVED_JSON, encoding="utf-8") as f:
-        return json.load(f)
-
-
-def get_event_name(event_id, events):
-    """Look up event name from event ID."""
-    for e in events:
-        if e.get("id") == event_id:
-            return e.get("name", event_id)
-    return event_id
+    return corpus.load_knowledge_saved()
 
 
 def format_knowledge_year(entry):
@@ -349,7 +357,7 @@ def generate_lost_data_table(lost_entries):
     return "\n".join(lines)
 
 
-def generate_lost_connection_table(lost_entries, events):
+def generate_lost_connection_table(lost_entries, joins):
     """Generate connection to main index table for KNOWLEDGE_LOST.md."""
     lines = ["| Knowledge lost | Connected genocide |",
              "|----------------|-------------------|"]
@@ -358,7 +366,7 @@ def generate_lost_connection_table(lost_entries, events):
         connected = entry.get("connected_event")
         if connected:
             name = entry.get("name", "Unknown")
-            event_name = get_event_name(connected, events)
+            event_name = joins.event_name(connected)
             # Clean up event name (remove dates, parentheses)
             event_name = re.sub(r'\s*\([^)]*\)', '', event_name)
             event_name = re.sub(r'\s*\d{4}.*', '', event_name)
@@ -476,7 +484,7 @@ def generate_saved_recovered_table(saved_entries):
     return "\n".join(lines)
 
 
-def generate_saved_connection_table(saved_entries, events):
+def generate_saved_connection_table(saved_entries, joins):
     """Generate connection to main index table for KNOWLEDGE_SAVED.md."""
     lines = ["| Knowledge saved | Connected event | What changed? |",
              "|-----------------|-----------------|---------------|"]
@@ -485,7 +493,7 @@ def generate_saved_connection_table(saved_entries, events):
         connected = entry.get("connected_event")
         if connected:
             name = entry.get("name", "Unknown")
-            event_name = get_event_name(connected, events)
+            event_name = joins.event_name(connected)
             # Clean up event name
             event_name = re.sub(r'\s*\([^)]*\)', '', event_name)
 
@@ -507,25 +515,25 @@ def generate_saved_connection_table(saved_entries, events):
     return "\n".join(lines)
 
 
-def update_knowledge_lost(content, lost_entries, events):
+def update_knowledge_lost(content, lost_entries, joins):
     """Update KNOWLEDGE_LOST.md with generated statistics."""
     generators = {
         "LOST_DRIVER_TABLE": lambda: generate_lost_driver_table(lost_entries),
         "LOST_DATA_TABLE": lambda: generate_lost_data_table(lost_entries),
-        "LOST_CONNECTION_TABLE": lambda: generate_lost_connection_table(lost_entries, events),
+        "LOST_CONNECTION_TABLE": lambda: generate_lost_connection_table(lost_entries, joins),
         "LOST_COUNT": lambda: str(len(lost_entries)),
         "LOST_SOURCES": lambda: generate_lost_sources(lost_entries),
     }
     return update_markdown(content, generators)
 
 
-def update_knowledge_saved(content, lost_entries, saved_entries, events):
+def update_knowledge_saved(content, lost_entries, saved_entries, joins):
     """Update KNOWLEDGE_SAVED.md with generated statistics."""
     generators = {
         "SAVED_DRIVER_SUMMARY": lambda: generate_saved_driver_summary(lost_entries, saved_entries),
         "SAVED_RESCUED_TABLE": lambda: generate_saved_rescued_table(saved_entries),
         "SAVED_RECOVERED_TABLE": lambda: generate_saved_recovered_table(saved_entries),
-        "SAVED_CONNECTION_TABLE": lambda: generate_saved_connection_table(saved_entries, events),
+        "SAVED_CONNECTION_TABLE": lambda: generate_saved_connection_table(saved_entries, joins),
         "SAVED_COUNT": lambda: str(len(saved_entries)),
         "SAVED_RESCUED_COUNT": lambda: str(len([e for e in saved_entries if e.get("saved_by") != "hidden_and_recovered"])),
         "SAVED_RECOVERED_COUNT": lambda: str(len([e for e in saved_entries if e.get("saved_by") == "hidden_and_recovered"])),
@@ -534,9 +542,18 @@ def update_knowledge_saved(content, lost_entries, saved_entries, events):
     return update_markdown(content, generators)
 
 
-def update_file(path, content, new_content, name):
-    """Write file if content changed."""
+def update_file(path, content, new_content, name, dry_run=False):
+    """Write file if content changed (print a diff instead on a dry run)."""
     if new_content != content:
+        if dry_run:
+            print(f"  Would write {name}:")
+            diff = difflib.unified_diff(
+                content.splitlines(), new_content.splitlines(),
+                fromfile=f"a/{name}", tofile=f"b/{name}", lineterm="",
+            )
+            for line in diff:
+                print(f"    {line}")
+            return True
         print(f"  Writing {name}...")
         with open(path, "w", encoding="utf-8") as f:
             f.write(new_content)
@@ -544,44 +561,202 @@ def update_file(path, content, new_content, name):
     return False
 
 
+# =============================================================================
+# Build state (skip regeneration when nothing changed)
+# =============================================================================
+
+BUILD_STATE_PATH = corpus.CACHE_DIR / "readme_state.json"
+
+# Code that shapes the generated markdown: this script and the whole hpi
+# package (loading alone goes through corpus, jsonl and records, the stats
+# through rollup and sketches), so no module it depends on can be left out
+GENERATOR_FILES = [Path(__file__)] + sorted(Path(markers.__file__).parent.glob("*.py"))
+
+# Inputs each target is generated from; the generator code is an input of every target
+TARGET_INPUTS = {
+    "README.md": ("events",),
+    "KNOWLEDGE_LOST.md": ("events", "knowledge_lost"),
+    "KNOWLEDGE_SAVED.md": ("events", "knowledge_lost", "knowledge_saved"),
+}
+
+
+def file_digest(path, known, files):
+    """
+    sha256 of a file's bytes, or None if it is missing.
+
+    known is {path: [mtime_ns, size, digest]} from the last run; a file whose
+    mtime and size still match is not read again. This run's entries go into
+    files, so files that no longer exist drop out of the state.
+    """
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    entry = known.get(str(path))
+    if entry is None or entry[0] != stat.st_mtime_ns or entry[1] != stat.st_size:
+        digest = hashlib.sha256()
+        # Read in blocks, so a JSONL corpus is never held in memory whole
+        with open(path, "rb") as f:
+            while block := f.read(1 << 20):
+                digest.update(block)
+        entry = [stat.st_mtime_ns, stat.st_size, digest.hexdigest()]
+    files[str(path)] = entry
+    return entry[2]
+
+
+def hash_files(paths, known, files):
+    """Combined sha256 of the names and contents of the given files (missing files hash as absent)."""
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(f"{Path(path).name}:{file_digest(path, known, files) or '-'}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def input_hashes(known):
+    """
+    (hashes, files): a hash of every input a target can depend on, and the
+    file entries to keep for the next run (see file_digest).
+    """
+    files = {}
+    hashes = {
+        "code": hash_files(GENERATOR_FILES, known, files),
+        "events": hash_files(corpus.source_files(), known, files),
+        "knowledge_lost": hash_files([corpus.KNOWLEDGE_LOST_PATH], known, files),
+        "knowledge_saved": hash_files([corpus.KNOWLEDGE_SAVED_PATH], known, files),
+    }
+    return hashes, files
+
+
+def target_digest(name, inputs, content):
+    """Digest of a target's inputs plus its current text (so hand edits are noticed)."""
+    parts = [inputs["code"]] + [inputs[key] for key in TARGET_INPUTS[name]]
+    parts.append(hashlib.sha256(content.encode("utf-8")).hexdigest())
+    return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+
+
+def load_build_state():
+    """{"targets": {target name: digest}, "files": {path: [mtime_ns, size, digest]}} from the last run."""
+    try:
+        with open(BUILD_STATE_PATH, encoding="utf-8") as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        state = {}
+    if not isinstance(state.get("targets"), dict) or not isinstance(state.get("files"), dict):
+        return {"targets": {}, "files": {}}
+    return state
+
+
+def save_build_state(state):
+    BUILD_STATE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    corpus.write_text_atomic(BUILD_STATE_PATH, json.dumps(state, indent=1, sort_keys=True))
+
+
+def stream_corpus(lost, saved, events_dir=corpus.EVENTS_DIR):
+    """
+    One pass over the corpus for --stream: (stats, event rows, joins, audit finding count).
+
+    Events are read one at a time (README_FIELDS only) and flow through the
+    audit (in AUDIT_CHUNK batches) and calc_stats(stream=True). What is kept
+    is the aggregates, the denied-table heap, one event_row() per event (the
+    events table lists every event) and the events knowledge entries link
+    to, which is all the joins need. Duplicate ids are therefore only
+    reported among those linked events.
+    """
+    connected = {entry.get("connected_event") for entry in (*lost, *saved)}
+    rows = []
+    linked = []
+    findings = 0
+
+    def visit(event):
+        rows.append(event_row(event))
+        if event.get("id") in connected:
+            linked.append(event)
+
+    def audited(events):
+        nonlocal findings
+        for chunk in chunks(events, AUDIT_CHUNK):
+            findings += len(audit(chunk))
+            yield from chunk
+
+    events = tap(corpus.iter_events(events_dir, fields=README_FIELDS), visit)
+    stats = calc_stats(audited(events), stream=True)
+    return stats, rows, Joins(linked, lost, saved), findings
+
+
 def main():
+    parser = argparse.ArgumentParser(description="Update README.md and KNOWLEDGE_*.md statistics.")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="print a diff of what would change without writing anything")
+    parser.add_argument("--force", action="store_true",
+                        help="regenerate every file even if its inputs are unchanged")
+    parser.add_argument("--stream", action="store_true",
+                        help="read the corpus in one pass without holding it in memory (for very large corpora)")
+    args = parser.parse_args()
+
+    targets = {
+        "README.md": README_PATH,
+        "KNOWLEDGE_LOST.md": KNOWLEDGE_LOST_PATH,
+        "KNOWLEDGE_SAVED.md": KNOWLEDGE_SAVED_PATH,
+    }
+    contents = {name: path.read_text(encoding="utf-8") for name, path in targets.items() if path.exists()}
+
+    state = load_build_state()
+    inputs, state["files"] = input_hashes(state["files"])
+    stale = [
+        name for name, content in contents.items()
+        if args.force or state["targets"].get(name) != target_digest(name, inputs, content)
+    ]
+    if not stale:
+        if not args.dry_run:
+            save_build_state(state)  # newly hashed files
+        print("No changes needed (inputs unchanged since the last run).")
+        return
+
     print("Loading data...")
-    events = load_events()
     lost = load_knowledge_lost()
     saved = load_knowledge_saved()
-    print(f"  {len(events)} events, {len(lost)} lost, {len(saved)} saved")
-
-    print("Calculating statistics...")
-    stats = calc_stats(events)
+    if args.stream:
+        events = None
+        stats, rows, joins, findings = stream_corpus(lost, saved)
+        count = stats["count"]
+    else:
+        events = load_events()
+        stats = rows = None
+        joins = Joins(events, lost, saved)
+        findings = len(audit(events))
+        count = len(events)
+    print(f"  {count} events, {len(lost)} lost, {len(saved)} saved")
+
+    for warning in joins.warnings():
+        print(f"  ⚠️  {warning}")
+    # The index is the average of the stored scores, so warn if they have drifted
+    if findings:
+        print(f"  ⚠️  {findings} score/breakdown inconsistencies (see scripts/audit_scores.py)")
+
+    renderers = {
+        "README.md": lambda content: update_readme(content, events, stats or calc_stats(events, joins), rows),
+        "KNOWLEDGE_LOST.md": lambda content: update_knowledge_lost(content, lost, joins),
+        "KNOWLEDGE_SAVED.md": lambda content: update_knowledge_saved(content, lost, saved, joins),
+    }
 
     updated = []
-
-    # Update README.md
-    print("Processing README.md...")
-    with open(README_PATH, encoding="utf-8") as f:
-        content = f.read()
-    new_content = update_readme(content, events, stats)
-    if update_file(README_PATH, content, new_content, "README.md"):
-        updated.append("README.md")
-
-    # Update KNOWLEDGE_LOST.md
-    if KNOWLEDGE_LOST_PATH.exists():
-        print("Processing KNOWLEDGE_LOST.md...")
-        with open(KNOWLEDGE_LOST_PATH, encoding="utf-8") as f:
-            content = f.read()
-        new_content = update_knowledge_lost(content, lost, events)
-        if update_file(KNOWLEDGE_LOST_PATH, content, new_content, "KNOWLEDGE_LOST.md"):
-            updated.append("KNOWLEDGE_LOST.md")
-
-    # Update KNOWLEDGE_SAVED.md
-    if KNOWLEDGE_SAVED_PATH.exists():
-        print("Processing KNOWLEDGE_SAVED.md...")
-        with open(KNOWLEDGE_SAVED_PATH, encoding="utf-8") as f:
-            content = f.read()
-        new_content = update_knowledge_saved(content, lost, saved, events)
-        if update_file(KNOWLEDGE_SAVED_PATH, content, new_content, "KNOWLEDGE_SAVED.md"):
-            updated.append("KNOWLEDGE_SAVED.md")
-
+    for name in stale:
+        print(f"Processing {name}...")
+        content = contents[name]
+        new_content = renderers[name](content)
+        if update_file(targets[name], content, new_content, name, args.dry_run):
+            updated.append(name)
+        state["targets"][name] = target_digest(name, inputs, new_content)
+
+    skipped = [name for name in contents if name not in stale]
+    if skipped:
+        print(f"Unchanged inputs, skipped: {', '.join(skipped)}")
+
+    if args.dry_run:
+        print(f"Dry run: would update {', '.join(updated)} (nothing written)" if updated else "No changes needed.")
+        return
+
+    save_build_state(state)
     if updated:
         print(f"Done! Updated: {', '.join(updated)}")
     else:
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Verify existing Wikipedia URLs and update stale ones.
+
+Every wikipedia_url in the events and knowledge files is checked with
+batched action=query requests (up to 50 titles each), which follow
+normalizations and redirects in bulk. URLs whose article was renamed are
+rewritten to the current title; missing articles are retried with the
+MANUAL_SEARCH override term for the event, if there is one, and otherwise
+listed for manual review.
+
+Knowledge entries are updated with a textual replacement of the URL, so the
+hand-formatted knowledge files keep their layout; they are reported through
+the same pipeline Report as the events.
+
+tests/fixtures/wikipedia_api.py is a local stand-in for the API (see
+--api-url) with a few renamed and missing articles.
+"""
+
+import argparse
+import json
+import re
+import urllib.parse
+from functools import partial
+from pathlib import Path
+
+from fix_missing_wikipedia import MANUAL_SEARCH
+from hpi import wikipedia
+from hpi.corpus import EVENTS_DIR, KNOWLEDGE_LOST_PATH, KNOWLEDGE_SAVED_PATH, load_corpus, write_text_atomic
+from hpi.pipeline import Pipeline, Report, add_arguments
+
+
+def title_from_url(url):
+    """Article title in a /wiki/ URL ("…/wiki/Timur%27s_conquests" -> "Timur's conquests"), or None."""
+    path = urllib.parse.urlsplit(url).path
+    if "/wiki/" not in path:
+        return None
+    return urllib.parse.unquote(path.split("/wiki/", 1)[1]).replace("_", " ") or None
+
+
+def url_for_title(url, title):
+    """url pointed at another title on the same wiki, keeping any #fragment."""
+    parts = urllib.parse.urlsplit(url)
+    prefix = parts.path.split("/wiki/", 1)[0]
+    path = f"{prefix}/wiki/{urllib.parse.quote(title.replace(' ', '_'), safe='()')}"
+    return urllib.parse.urlunsplit((parts.scheme, parts.netloc, path, parts.query, parts.fragment))
+
+
+def resolve_urls(records, resolver):
+    """
+    {url: new url or None} for every URL whose title no longer resolves as written.
+
+    records are (name, url) pairs. None means the article is missing and no
+    MANUAL_SEARCH override found it either. URLs that are current, or could
+    not be checked (network errors, offline misses), are left out.
+    """
+    titles = {url: title_from_url(url) for _, url in records}
+    pages = resolver.query_titles(title for title in titles.values() if title)
+
+    updates, retry = {}, {}
+    for name, url in records:
+        title = titles[url]
+        page = pages.get(title)
+        if page is None or page.error:
+            continue
+        if page.missing:
+            if name in MANUAL_SEARCH:
+                retry[url] = MANUAL_SEARCH[name]
+            else:
+                updates[url] = None
+        elif page.title != title:
+            updates[url] = url_for_title(url, page.title)
+
+    # Second round: the override terms, batched the same way
+    if retry:
+        pages = resolver.query_titles(retry.values())
+        for url, term in retry.items():
+            page = pages[term]
+            if page.error:
+                continue
+            updates[url] = url_for_title(url, page.title) if page.title else None
+    return updates
+
+
+def verify_link(filepath, event, report, updates=None):
+    """Pipeline transform: rewrite a stale wikipedia_url from the resolved updates."""
+    url = event.get('wikipedia_url')
+    if not url or url not in updates:
+        return
+
+    new_url = updates[url]
+    if new_url:
+        report.log(f"→ {event['name']}")
+        report.log(f"  {url}\n  → {new_url}")
+        event['wikipedia_url'] = new_url
+        report.count('updated')
+    else:
+        report.collect('missing', event['name'])
+
+
+def update_knowledge_file(path, updates, report):
+    """Rewrite stale URLs in a knowledge file in place, logging to report like verify_link."""
+    original = text = path.read_text(encoding="utf-8")
+    entries = json.loads(text)
+    for url in dict.fromkeys(entry.get('wikipedia_url') for entry in entries):
+        if not url or url not in updates:
+            continue
+        names = [entry['name'] for entry in entries if entry.get('wikipedia_url') == url]
+        new_url = updates[url]
+        if new_url is None:
+            for name in names:
+                report.collect('missing', name)
+            continue
+
+        # Every entry with this URL is rewritten at once
+        pattern = re.compile(r'("wikipedia_url":\s*)' + re.escape(json.dumps(url, ensure_ascii=False)))
+        text, n = pattern.subn(lambda m: m.group(1) + json.dumps(new_url, ensure_ascii=False), text)
+        if n:
+            for name in names:
+                report.log(f"→ {name}")
+                report.log(f"  {url}\n  → {new_url}")
+            report.count('updated', n)
+
+    if text == original:
+        report.unchanged += 1
+        return
+    report.written.append(path)
+    if not report.dry_run:
+        write_text_atomic(path, text)
+
+
+def process_events(dry_run=False, resolver=None, events_dir=EVENTS_DIR,
+                   knowledge_paths=(KNOWLEDGE_LOST_PATH, KNOWLEDGE_SAVED_PATH)):
+    """Verify every wikipedia_url in the events and knowledge files. Returns the merged report."""
+    resolver = resolver or wikipedia.get_resolver()
+    knowledge = {Path(path): json.loads(Path(path).read_text(encoding="utf-8")) for path in knowledge_paths}
+    records = [(event['name'], event['wikipedia_url']) for _, event in load_corpus(events_dir)
+               if event.get('wikipedia_url')]
+    records += [
+        (entry['name'], entry['wikipedia_url'])
+        for entries in knowledge.values() for entry in entries if entry.get('wikipedia_url')
+    ]
+    updates = resolve_urls(records, resolver)
+
+    report = Pipeline([('wikipedia_url', partial(verify_link, updates=updates))]).run(events_dir, dry_run=dry_run)
+    for path in knowledge:
+        file_report = Report()
+        file_report.dry_run = dry_run
+        update_knowledge_file(path, updates, file_report)
+        for line in file_report.lines:
+            print(line)
+        report.merge(file_report)
+    missing = report.collected['missing']
+    updated = report.counts['updated']
+
+    print(f"\n{'='*50}")
+    print(f"Checked: {len(records)} URLs")
+    print(f"Updated: {updated}{' (dry run)' if dry_run else ''}")
+    print(resolver.summary())
+    print(report.summary())
+    if missing:
+        print(f"\nMissing articles (need manual review):")
+        for name in missing:
+            print(f"  - {name}")
+    return report
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Verify existing Wikipedia URLs and update stale ones.")
+    add_arguments(parser, jobs=False)  # lookups are batched and concurrent; the file pass is cheap
+    wikipedia.add_arguments(parser)
+    args = parser.parse_args()
+    with wikipedia.from_args(args) as resolver:
+        process_events(dry_run=args.dry_run, resolver=resolver)
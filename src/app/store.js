@@ -4,14 +4,20 @@
  */
 
 import {
-  filterEvents,
+  filterEventsIndexed,
+  sortEventsIndexed,
+  decodeFacets,
   filterKnowledge,
   sortKnowledge,
   calcStats,
+  statsFromRollup,
   getTier,
   getDriver
 } from '../domain/index.js';
 
+// Must match BUNDLE_VERSION in scripts/update_index.py
+const BUNDLE_VERSION = 2;
+
 /**
  * Initialize the HPI Alpine store
  */
@@ -22,6 +28,12 @@ export function initStore(Alpine) {
     knowledgeLost: [],
     knowledgeSaved: [],
     knowledgeByEvent: {},
+    eventIndex: {},             // event id → position in events
+    rollup: null,               // Precomputed stats cube (bundle only)
+    facets: null,               // Filter bitsets and sort permutations (bundle only)
+    detailPath: null,           // Set when events are summaries (data/summary.<hash>.json)
+    manifest: {},               // Hashed build outputs (data/manifest.json)
+    loadedDetails: {},
     loading: true,
     error: null,
 
@@ -48,7 +60,7 @@ export function initStore(Alpine) {
 
     // === Computed Getters ===
     get filteredEvents() {
-      return filterEvents(this.events, {
+      return filterEventsIndexed(this.events, this.facets, {
         ...this.filters,
         search: this.search
       });
@@ -77,11 +89,21 @@ export function initStore(Alpine) {
     },
 
     get stats() {
-      return calcStats(this.events);
+      return statsFromRollup(this.rollup) || calcStats(this.events);
     },
 
     get filteredStats() {
-      return calcStats(this.filteredEvents);
+      // The cube covers the period/tier/denial filters; search needs a rescan
+      const cached = this.search ? null : statsFromRollup(this.rollup, this.filters);
+      return cached || calcStats(this.filteredEvents);
+    },
+
+    /**
+     * Sort event rows by a precomputed permutation; null if there is none
+     * for the field (the table then sorts itself)
+     */
+    sortRows(rows, field, direction) {
+      return sortEventsIndexed(rows, this.events, this.facets, this.eventIndex, field, direction);
     },
 
     // === Actions ===
@@ -133,6 +155,7 @@ export function initStore(Alpine) {
      */
     toggleEvent(id) {
       this.selectedEvent = this.selectedEvent === id ? null : id;
+      if (this.selectedEvent) this.loadEventDetail(id);
       this.syncToURL();
     },
 
@@ -141,6 +164,7 @@ export function initStore(Alpine) {
      */
     selectEvent(id) {
       this.selectedEvent = id;
+      this.loadEventDetail(id);
       this.syncToURL();
     },
 
@@ -194,7 +218,10 @@ export function initStore(Alpine) {
       const params = Object.fromEntries(new URLSearchParams(hash));
 
       if (params.view) this.currentView = params.view;
-      if (params.event) this.selectedEvent = params.event;
+      if (params.event) {
+        this.selectedEvent = params.event;
+        this.loadEventDetail(params.event);
+      }
       if (params.period) this.filters.period = params.period;
       if (params.tier) this.filters.tier = params.tier;
       if (params.denial) this.filters.denial = params.denial;
@@ -227,6 +254,25 @@ export function initStore(Alpine) {
       return lookup;
     },
 
+    /**
+     * Build id lookup: event_id → position in events
+     */
+    buildEventIndex() {
+      const index = {};
+      this.events.forEach((event, i) => {
+        if (!(event.id in index)) index[event.id] = i;
+      });
+      return index;
+    },
+
+    /**
+     * Get an event by id
+     */
+    getEvent(id) {
+      const i = this.eventIndex[id];
+      return i === undefined ? null : this.events[i];
+    },
+
     /**
      * Get linked knowledge for an event
      */
@@ -239,38 +285,117 @@ export function initStore(Alpine) {
      */
     getConnectedEvent(entry) {
       if (!entry.connected_event) return null;
-      return this.events.find(e => e.id === entry.connected_event);
+      return this.getEvent(entry.connected_event);
     },
 
     /**
-     * Initialize the store (load data)
+     * Load data/manifest.json, which names the current hashed bundle files.
+     * It is revalidated on every load; the files it names never change.
      */
-    async init() {
+    async loadManifest() {
+      const response = await fetch('data/manifest.json', { cache: 'no-cache' }).catch(() => null);
+      this.manifest = response?.ok ? await response.json() : {};
+    },
+
+    /**
+     * Load a prebuilt bundle (scripts/update_index.py, scripts/build_shards.py).
+     * Returns false if it is not deployed or has an unknown layout.
+     */
+    async loadBundle(url) {
+      if (!url) return false;
+      const response = await fetch(url);
+      if (!response.ok) return false;
+
+      const bundle = await response.json();
+      if (bundle.version !== BUNDLE_VERSION) return false;
+
+      this.events = bundle.events;
+      this.knowledgeLost = bundle.knowledgeLost;
+      this.knowledgeSaved = bundle.knowledgeSaved;
+      this.knowledgeByEvent = bundle.knowledgeByEvent;
+      this.eventIndex = bundle.eventIndex;
+      this.rollup = bundle.rollup || null;
+      this.facets = decodeFacets(bundle.facets);
+      this.detailPath = bundle.detailPath || null;
+      return true;
+    },
+
+    /**
+     * Load the full record of a summary event (summary shard only)
+     */
+    async loadEventDetail(id) {
+      if (!this.detailPath || this.loadedDetails[id]) return;
+      this.loadedDetails[id] = true;
+
+      const event = this.getEvent(id);
+      if (!event) return;
+
       try {
-        this.loading = true;
-        this.error = null;
+        const response = await fetch(`${this.detailPath}${id}.json`);
+        Object.assign(event, await response.json());
+      } catch (err) {
+        console.error(`Failed to load details for ${id}:`, err);
+        this.loadedDetails[id] = false;
+      }
+    },
 
-        // Load event index
-        const indexResponse = await fetch('data/index.json');
-        const eventUrls = await indexResponse.json();
+    /**
+     * Full event records for export (the summary shard only holds list fields)
+     */
+    async getFullEvents() {
+      if (!this.detailPath) return this.events;
 
-        // Load all events in parallel
-        const eventPromises = eventUrls.map(url => fetch(url).then(r => r.json()));
-        this.events = await Promise.all(eventPromises);
+      const response = this.manifest.bundle ? await fetch(this.manifest.bundle).catch(() => null) : null;
+      if (response?.ok) return (await response.json()).events;
 
-        // Load knowledge data
-        const [lostResponse, savedResponse] = await Promise.all([
-          fetch('data/knowledge_lost.json'),
-          fetch('data/knowledge_saved.json')
-        ]);
+      await Promise.all(this.events.map(e => this.loadEventDetail(e.id)));
+      return this.events;
+    },
 
-        this.knowledgeLost = await lostResponse.json();
-        this.knowledgeSaved = await savedResponse.json();
+    /**
+     * Load the index, every event file and the knowledge files separately
+     */
+    async loadFiles() {
+      // Load event index
+      const indexResponse = await fetch('data/index.json');
+      const eventUrls = await indexResponse.json();
+
+      // Load all events in parallel
+      const eventPromises = eventUrls.map(url => fetch(url).then(r => r.json()));
+      this.events = await Promise.all(eventPromises);
+
+      // Load knowledge data
+      const [lostResponse, savedResponse] = await Promise.all([
+        fetch('data/knowledge_lost.json'),
+        fetch('data/knowledge_saved.json')
+      ]);
+
+      this.knowledgeLost = await lostResponse.json();
+      this.knowledgeSaved = await savedResponse.json();
+
+      // Build lookups
+      this.knowledgeByEvent = this.buildKnowledgeLookup();
+      this.eventIndex = this.buildEventIndex();
+    },
 
-        // Build lookup
-        this.knowledgeByEvent = this.buildKnowledgeLookup();
+    /**
+     * Initialize the store (load data)
+     */
+    async init() {
+      try {
+        this.loading = true;
+        this.error = null;
+
+        // Prefer the summary shard (fewest bytes), then the full bundle
+        // (one request), then one request per file
+        await this.loadManifest();
+        const bundled = await this.loadBundle(this.manifest.summary).catch(() => false)
+          || await this.loadBundle(this.manifest.bundle).catch(() => false);
+        if (!bundled) {
+          await this.loadFiles();
+        }
 
-        // Apply URL state
+        // Apply URL state (also fetches the details of a linked event)
         this.applyURLState();
 
         // Restore view from localStorage if not in URL
@@ -83,12 +83,13 @@ function matchesDenial(event, denial) {
 }
 
 /**
- * Check if event matches search query
+ * Check if event matches search query. Summary records (scripts/build_shards.py)
+ * lack some searched fields and carry them precomputed in searchText.
  */
 function matchesSearch(event, query) {
   if (!query) return true;
 
-  const searchFields = [
+  const searchFields = event.searchText ?? [
     event.name,
     event.geography?.region,
     event.geography?.country,
@@ -117,6 +118,95 @@ export function filterEvents(events, filters = {}) {
   });
 }
 
+/**
+ * Decode the bundle's precomputed facets (scripts/hpi/facets.py):
+ * base64 bitsets become Uint32Array words, base64 permutations Uint32Arrays.
+ * Returns null if there are no facets.
+ */
+export function decodeFacets(facets) {
+  if (!facets) return null;
+
+  const decode = (b64) => {
+    const bytes = Uint8Array.from(atob(b64), c => c.charCodeAt(0));
+    return new Uint32Array(bytes.buffer, 0, bytes.length >> 2);
+  };
+  const mapValues = (obj, fn) => Object.fromEntries(Object.entries(obj).map(([k, v]) => [k, fn(v)]));
+
+  return {
+    count: facets.count,
+    bits: mapValues(facets.bits, values => mapValues(values, decode)),
+    order: mapValues(facets.order, dirs => mapValues(dirs, decode))
+  };
+}
+
+/**
+ * Filter events with precomputed facets: period/tier/denial become a bitset
+ * intersection, search is only checked on the events left (matchesSearch,
+ * so summary records are searched through their searchText). Same result as
+ * filterEvents on the full records, which it falls back to if facets don't
+ * match events (checked by tests/check_filters.mjs).
+ */
+export function filterEventsIndexed(events, facets, filters = {}) {
+  if (!facets || facets.count !== events.length) return filterEvents(events, filters);
+  const { search = '' } = filters;
+
+  let words = null;
+  for (const key of ['period', 'tier', 'denial']) {
+    const value = filters[key] ?? 'all';
+    if (value === 'all') continue;
+
+    const set = facets.bits[key]?.[value];
+    if (!set) {
+      // matchesPeriod lets unknown periods through; unknown tiers/denials match nothing
+      if (key === 'period') continue;
+      return [];
+    }
+    if (words) {
+      for (let i = 0; i < words.length; i++) words[i] &= set[i];
+    } else {
+      words = set.slice();
+    }
+  }
+
+  if (!words) return search ? events.filter(e => matchesSearch(e, search)) : events;
+
+  const result = [];
+  for (let w = 0; w < words.length; w++) {
+    let word = words[w];
+    while (word) {
+      const bit = 31 - Math.clz32(word & -word);
+      const event = events[w * 32 + bit];
+      if (!search || matchesSearch(event, search)) result.push(event);
+      word &= word - 1;
+    }
+  }
+  return result;
+}
+
+/**
+ * Sort a subset of events by a precomputed permutation (period, deaths,
+ * index). eventIndex maps event id → position in events. Returns null if
+ * there is no permutation for the field, so callers can fall back to sorting.
+ */
+export function sortEventsIndexed(rows, events, facets, eventIndex, field, direction = 'asc') {
+  const order = facets?.count === events.length ? facets.order[field]?.[direction] : null;
+  if (!order) return null;
+  if (rows.length === events.length) return Array.from(order, i => events[i]);
+
+  const member = new Uint8Array(events.length);
+  for (const row of rows) {
+    const i = eventIndex[row.id];
+    if (i === undefined || member[i]) return null;
+    member[i] = 1;
+  }
+
+  const sorted = [];
+  for (const i of order) {
+    if (member[i]) sorted.push(events[i]);
+  }
+  return sorted;
+}
+
 /**
  * Check if knowledge entry matches driver filter
  */
@@ -3,6 +3,8 @@
  * Pure functions for formatting event data
  */
 
+import { periodOptions } from './filters.js';
+
 /**
  * Format a number with locale-aware separators
  */
@@ -87,9 +89,10 @@ export function calcStats(events) {
     return { count: 0, years: 0, deathsMin: 0, deathsMax: 0, denied: 0 };
   }
 
-  const years = events.flatMap(e => [e.period.start, e.period.end]);
-  const minYear = Math.min(...years);
-  const maxYear = Math.max(...years);
+  // Open-ended periods have no end year
+  const years = events.flatMap(e => [e.period.start, e.period.end]).filter(year => year != null);
+  const minYear = years.length ? Math.min(...years) : 0;
+  const maxYear = years.length ? Math.max(...years) : 0;
 
   let totalDeathsMin = 0;
   let totalDeathsMax = 0;
@@ -109,6 +112,34 @@ export function calcStats(events) {
   };
 }
 
+/**
+ * Read calcStats-shaped statistics from a precomputed rollup cube
+ * (scripts/hpi/rollup.py). Filters default to 'all' (rolled up).
+ * Returns null if there is no rollup.
+ */
+export function statsFromRollup(rollup, { period = 'all', tier = 'all', denial = 'all' } = {}) {
+  if (!rollup) return null;
+
+  // filterEvents lets unknown periods through (matchesPeriod), so they read
+  // the rolled-up cell; unknown tiers and denials match nothing, as there
+  if (!periodOptions.some(option => option.value === period)) period = 'all';
+
+  const cell = rollup.cells[[period, tier, denial].join('|')];
+  if (!cell) return { count: 0, years: 0, deathsMin: 0, deathsMax: 0, denied: 0 };
+
+  const deniedCell = denial === 'all' || denial === 'denied'
+    ? rollup.cells[[period, tier, 'denied'].join('|')]
+    : null;
+
+  return {
+    count: cell.count,
+    years: cell.yearMax - cell.yearMin,
+    deathsMin: cell.deathsMin,
+    deathsMax: cell.deathsMax,
+    denied: deniedCell?.count || 0
+  };
+}
+
 /**
  * Format period string from event
  */
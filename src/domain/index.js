@@ -31,6 +31,7 @@ export {
   calcIndex,
   formatIndex,
   calcStats,
+  statsFromRollup,
   formatPeriod,
   formatEventDeaths,
   getRegion,
@@ -55,7 +56,10 @@ export {
   eventFilterConfig,
   knowledgeFilterConfig,
   filterEvents,
+  filterEventsIndexed,
   filterKnowledge,
   sortEvents,
+  sortEventsIndexed,
+  decodeFacets,
   sortKnowledge
 } from './filters.js';
@@ -0,0 +1,99 @@
+/**
+ * Cross-check the indexed event list (filterEventsIndexed/sortEventsIndexed
+ * over the summary shard and its facets) against filterEvents over the full
+ * records in the bundle (both as listed in data/manifest.json), sorted as the event table sorts them itself
+ * (the column sortFn in src/domain/columns.js, as lib/components/data-table.js
+ * applies it).
+ *
+ * Every search query (word prefixes from the full records) is combined with
+ * every period, tier and denial value, and every filtered list is sorted by
+ * each precomputed order. The rollup stats (statsFromRollup) are checked
+ * against calcStats over the same filtered records, unknown filter values
+ * included. Run after `npm run update:index`:
+ *
+ *   node tests/check_filters.mjs
+ */
+
+import { readFileSync } from 'fs';
+import {
+  filterEvents,
+  filterEventsIndexed,
+  sortEventsIndexed,
+  decodeFacets
+} from '../src/domain/filters.js';
+import { calcStats, statsFromRollup } from '../src/domain/formatters.js';
+import { eventColumns } from '../src/domain/columns.js';
+
+const load = (path) => JSON.parse(readFileSync(new URL(`../${path}`, import.meta.url)));
+const manifest = load('data/manifest.json');
+const full = load(manifest.bundle);
+const summary = load(manifest.summary);
+const facets = decodeFacets(summary.facets);
+const ids = (events) => events.map(e => e.id).join();
+
+// The table's fallback when sortData returns null
+const tableSort = (rows, field, direction) => {
+  const { sortFn } = eventColumns.find(c => c.key === field);
+  return [...rows].sort((a, b) => direction === 'asc' ? sortFn(a, b) : -sortFn(a, b));
+};
+
+// Word prefixes of every searched field, plus a few edge cases
+const queries = new Set(['', ' ', 'starv', 'colonial', 'slave', 'ä']);
+for (const event of full.events) {
+  for (const word of JSON.stringify(event).toLowerCase().split(/[^\p{L}]+/u)) {
+    if (word.length > 2) queries.add(word.slice(0, 5));
+  }
+}
+
+const values = (key) => ['all', ...Object.keys(summary.facets.bits[key])];
+const problems = [];
+let lists = 0;
+
+for (const period of values('period')) {
+  for (const tier of values('tier')) {
+    for (const denial of values('denial')) {
+      for (const search of queries) {
+        const filters = { period, tier, denial, search };
+        const expected = filterEvents(full.events, filters);
+        const rows = filterEventsIndexed(summary.events, facets, filters);
+        lists++;
+        if (ids(rows) !== ids(expected)) {
+          problems.push(`filter ${JSON.stringify(filters)}: ${rows.length} rows, expected ${expected.length}`);
+          continue;
+        }
+
+        for (const field of Object.keys(summary.facets.order)) {
+          for (const direction of ['asc', 'desc']) {
+            const sorted = sortEventsIndexed(rows, summary.events, facets, summary.eventIndex, field, direction);
+            if (ids(sorted) !== ids(tableSort(expected, field, direction))) {
+              problems.push(`sort ${field} ${direction} ${JSON.stringify(filters)}`);
+            }
+          }
+        }
+      }
+    }
+  }
+}
+
+// Stats for every filter combination, plus values no filter option has:
+// an unknown period matches everything (matchesPeriod), an unknown tier or
+// denial matches nothing
+let statLists = 0;
+for (const period of [...values('period'), 'jurassic']) {
+  for (const tier of [...values('tier'), 'no such tier']) {
+    for (const denial of [...values('denial'), 'no such status']) {
+      const filters = { period, tier, denial };
+      const expected = JSON.stringify(calcStats(filterEvents(full.events, filters)));
+      const actual = JSON.stringify(statsFromRollup(summary.rollup, filters));
+      statLists++;
+      if (actual !== expected) problems.push(`stats ${JSON.stringify(filters)}: ${actual}, expected ${expected}`);
+    }
+  }
+}
+
+if (problems.length) {
+  console.error(`❌ ${problems.length} of ${lists + statLists} checks differ:\n  ${problems.slice(0, 20).join('\n  ')}`);
+  process.exit(1);
+}
+console.log(`✓ ${lists} filtered lists (${queries.size} searches) and their sorts match the full records`);
+console.log(`✓ ${statLists} rollup stats match calcStats`);
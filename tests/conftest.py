@@ -0,0 +1,30 @@
+"""
+The scripts run as `python3 scripts/<name>.py`, so the shared package is
+imported as `hpi` and sibling scripts by module name; tests do the same.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+from hpi import corpus  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def parse_cache(tmp_path_factory, monkeypatch):
+    """Keep the tests' temporary corpora out of the checkout's .cache/."""
+    monkeypatch.setattr(corpus, "PARSE_CACHE_PATH", tmp_path_factory.mktemp("cache") / "events.pickle")
+
+
+@pytest.fixture
+def wikipedia_api():
+    """The local Wikipedia API stand-in (tests/fixtures/wikipedia_api.py), on a free port."""
+    from fixtures.wikipedia_api import start
+
+    server = start()
+    yield server
+    server.shutdown()
+    server.server_close()
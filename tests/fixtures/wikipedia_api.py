@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Wikipedia API used by the link scripts (hpi/wikipedia.py).
+
+Answers the two request shapes the scripts send, without network access:
+
+  action=query&titles=A|B|...   normalizations, REDIRECTS and MISSING pages,
+                                formatversion=2 layout (verify_wikipedia_links.py)
+  action=opensearch&search=X    one hit per non-missing query, after redirects
+                                (add_wikipedia_links.py, fix_missing_wikipedia.py)
+
+Every other title exists under its own name. Each server logs its requests
+(server.log: (time, client port, params)), so tests can check batching,
+pacing and connection reuse; run standalone, the counts are printed on exit.
+
+Usage:
+  python tests/fixtures/wikipedia_api.py [--port 8766]
+  python scripts/verify_wikipedia_links.py --dry-run --no-cache --api-url http://127.0.0.1:8766/w/api.php
+
+  server = start()          # in-process, on a free port, served from a thread
+  server.url                # http://127.0.0.1:<port>/w/api.php
+  server.shutdown()
+"""
+
+import argparse
+import json
+import threading
+import time
+import urllib.parse
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Renamed articles (chains are followed, as MediaWiki does)
+REDIRECTS = {
+    "Dead Sea Scrolls": "Dead Sea scrolls",
+    "Opium Wars": "Opium War",
+    "Opium War": "First Opium War",
+}
+
+# Titles without an article
+MISSING = {"Seyfo"}
+
+
+def normalize(title):
+    """MediaWiki title normalization: underscores to spaces, first letter upper-cased."""
+    title = title.replace("_", " ").strip()
+    return title[:1].upper() + title[1:]
+
+
+def resolve(title, redirects):
+    while title in REDIRECTS:
+        redirects.append({"from": title, "to": REDIRECTS[title]})
+        title = REDIRECTS[title]
+    return title
+
+
+def query(params):
+    normalized, redirects, pages = [], [], {}
+    for title in params["titles"].split("|"):
+        name = normalize(title)
+        if name != title:
+            normalized.append({"from": title, "to": name})
+        name = resolve(name, redirects)
+        pages[name] = {"title": name, "missing": True} if name in MISSING else {"pageid": len(pages) + 1, "title": name}
+    return {"batchcomplete": True,
+            "query": {"normalized": normalized, "redirects": redirects, "pages": list(pages.values())}}
+
+
+def opensearch(params):
+    search = params["search"]
+    title = resolve(normalize(search), [])
+    if title in MISSING:
+        return [search, [], [], []]
+    url = "https://en.wikipedia.org/wiki/" + urllib.parse.quote(title.replace(" ", "_"), safe="()")
+    return [search, [title], [""], [url]]
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        params = dict(urllib.parse.parse_qsl(urllib.parse.urlsplit(self.path).query))
+        with self.server.lock:
+            self.server.log.append((time.monotonic(), self.client_address[1], params))
+
+        action = params.get("action")
+        if action == "query":
+            status, data = 200, query(params)
+        elif action == "opensearch":
+            status, data = 200, opensearch(params)
+        else:
+            status, data = 400, {"error": f"unsupported action {action!r}"}
+
+        body = json.dumps(data).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class StandInServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, port=0):
+        super().__init__(("127.0.0.1", port), Handler)
+        self.log = []
+        self.lock = threading.Lock()
+        self.url = f"http://127.0.0.1:{self.server_address[1]}/w/api.php"
+
+    def requests(self):
+        """Counter of requests per action."""
+        with self.lock:
+            return Counter(params.get("action") for _, _, params in self.log)
+
+
+def start(port=0):
+    """Serve from a daemon thread; stop with server.shutdown()."""
+    server = StandInServer(port)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8766)
+    args = parser.parse_args()
+
+    server = StandInServer(args.port)
+    print(f"Serving {server.url} (Ctrl-C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    print(f"Requests: {dict(server.requests())}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+import copy
+
+import pytest
+
+from hpi.audit import audit, audit_columns
+from hpi.corpus import load_events
+
+np = pytest.importorskip("numpy")
+from hpi.columnar import build_columns  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def events():
+    return load_events()
+
+
+def damaged(events):
+    """A copy of the corpus with one problem of each kind audit_columns can see."""
+    events = copy.deepcopy(events)
+    scores = [event["metrics"]["scores"] for event in events]
+    breakdowns = [event["metrics"]["breakdowns"] for event in events]
+    scores[0]["profit"] += 20 if scores[0]["profit"] <= 80 else -20
+    scores[1]["ideology"] = 140
+    del scores[2]["complicity"]
+    del breakdowns[3]["systematic_intensity"]
+    return events
+
+
+def test_corpus_scores_match_their_breakdowns(events):
+    assert audit(events) == []
+    assert audit_columns(build_columns(events)) == []
+
+
+def test_columnar_audit_matches_the_dict_audit(events):
+    events = damaged(events)
+    findings = audit(events)
+    assert [finding.kind for finding in findings] == ["missing", "mismatch", "out_of_range", "missing"]  # category order
+    assert audit_columns(build_columns(events)) == findings
+
+
+def test_dict_audit_also_checks_what_the_columns_drop(events):
+    events = copy.deepcopy(events[:2])
+    events[0]["metrics"]["breakdowns"]["profit"]["plunder"] = True
+    ideology = events[1]["metrics"]["breakdowns"]["ideology"]
+    ideology[next(key for key, value in ideology.items() if value is False)] = 0
+    kinds = {finding.kind for finding in audit(events)}
+    assert kinds == {"unknown_key", "out_of_range"}
+    assert audit_columns(build_columns(events)) == []
@@ -0,0 +1,17 @@
+from build_shards import write_details
+from hpi.shards import detail_filename
+
+
+def test_only_changed_detail_files_are_written(tmp_path):
+    events = [{"id": "a_1900", "name": "A"}, {"id": "b_1901", "name": "B"}]
+    (tmp_path / "gone_1800.json").write_text("{}", encoding="utf-8")
+
+    total, written = write_details(events, tmp_path)
+    assert written == 2
+    assert sorted(p.name for p in tmp_path.iterdir()) == sorted(map(detail_filename, events))
+    assert total == sum(p.stat().st_size for p in tmp_path.iterdir())
+
+    stats = {p.name: p.stat().st_mtime_ns for p in tmp_path.iterdir()}
+    events[1]["name"] = "B (renamed)"
+    assert write_details(events, tmp_path)[1] == 1
+    assert (tmp_path / detail_filename(events[0])).stat().st_mtime_ns == stats[detail_filename(events[0])]
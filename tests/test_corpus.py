@@ -0,0 +1,29 @@
+import os
+import stat
+
+from hpi.corpus import write_text_atomic
+
+
+def mode(path):
+    return stat.S_IMODE(os.stat(path).st_mode)
+
+
+def test_write_text_atomic_keeps_the_file_mode(tmp_path):
+    path = tmp_path / "event.json"
+    path.write_text("{}\n", encoding="utf-8")
+    path.chmod(0o640)
+
+    write_text_atomic(path, '{"id": "x"}\n')
+
+    assert path.read_text(encoding="utf-8") == '{"id": "x"}\n'
+    assert mode(path) == 0o640
+
+
+def test_write_text_atomic_new_file_follows_the_umask(tmp_path):
+    umask = os.umask(0o022)
+    try:
+        write_text_atomic(tmp_path / "new.json", "{}\n")
+    finally:
+        os.umask(umask)
+    assert mode(tmp_path / "new.json") == 0o644
+    assert [p.name for p in tmp_path.iterdir()] == ["new.json"]
@@ -0,0 +1,49 @@
+import os
+import stat
+
+from hpi.corpus import load_corpus
+from hpi.jsonl import JsonlStore, index_path, write_jsonl
+
+
+def mode(path):
+    return stat.S_IMODE(os.stat(path).st_mode)
+
+
+def test_round_trip_and_lookup(tmp_path):
+    items = [(path.name, event) for path, event in load_corpus()]
+    path = tmp_path / "events.jsonl"
+
+    # Any iterable works: the lines are written as they are produced
+    assert write_jsonl(iter(items), path) == len(items)
+
+    with JsonlStore(path) as store:
+        assert list(store) == items
+        name, event = items[-1]
+        assert store.get(event["id"]) == event
+        assert store.name(store.find(event["id"])) == name
+        assert "no_such_event" not in store
+
+
+def test_duplicate_ids_resolve_to_the_first_line(tmp_path):
+    path = tmp_path / "events.jsonl"
+    write_jsonl([("a.json", {"id": "x", "n": 1}), ("b.json", {"id": "x", "n": 2}), ("c.json", {"n": 3})], path)
+    with JsonlStore(path) as store:
+        assert store.get("x") == {"id": "x", "n": 1}
+        assert len(store) == 3
+
+
+def test_rewrite_keeps_the_file_modes(tmp_path):
+    path = tmp_path / "events.jsonl"
+    umask = os.umask(0o022)
+    try:
+        write_jsonl([("a.json", {"id": "a"})], path)
+    finally:
+        os.umask(umask)
+    assert mode(path) == mode(index_path(path)) == 0o644
+
+    path.chmod(0o640)
+    index_path(path).chmod(0o600)
+    write_jsonl([("a.json", {"id": "a"}), ("b.json", {"id": "b"})], path)
+    assert (mode(path), mode(index_path(path))) == (0o640, 0o600)
+    assert not [p for p in tmp_path.iterdir() if p.name.endswith(".tmp")]
+
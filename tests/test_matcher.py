@@ -0,0 +1,101 @@
+import random
+
+import pytest
+
+from add_pattern_tags import (PATTERNS, detect_patterns, detect_patterns_naive, detect_patterns_with_evidence,
+                              get_searchable_segments)
+from hpi.corpus import load_corpus
+from hpi.matcher import KeywordMatcher
+
+
+def naive_finditer(keywords, text):
+    """Every occurrence of every keyword, by repeated str.find."""
+    found = set()
+    for keyword in keywords:
+        start = text.find(keyword)
+        while start != -1:
+            found.add((start, start + len(keyword), keyword))
+            start = text.find(keyword, start + 1)
+    return found
+
+
+def test_corpus_tags_match_the_naive_scan():
+    events = load_corpus()
+    assert events
+    for path, event in events:
+        naive = detect_patterns_naive(event)
+        assert detect_patterns(event) == naive, path.name
+        assert detect_patterns_with_evidence(event)[0] == naive, path.name
+
+
+def test_corpus_evidence_offsets_point_at_the_keyword():
+    for path, event in load_corpus():
+        fields = {field: text.lower() for field, text in get_searchable_segments(event)}
+        _, evidence = detect_patterns_with_evidence(event)
+        for pattern_id, matches in evidence.items():
+            for match in matches:
+                assert pattern_id in PATTERNS
+                text = fields[match["field"]]
+                # A match across the joining space only has its start in the field
+                assert text[match["start"]:match["end"]] == match["keyword"] or match["end"] > len(text), path.name
+
+
+def test_random_texts_match_the_naive_scan():
+    rng = random.Random(7)
+    for _ in range(300):
+        keywords = ["".join(rng.choice("ab") for _ in range(rng.randint(1, 4))) for _ in range(rng.randint(1, 8))]
+        text = "".join(rng.choice("ab ") for _ in range(rng.randint(0, 40)))
+        matcher = KeywordMatcher(keywords)
+        assert set(matcher.finditer(text)) == naive_finditer(set(keywords), text)
+        assert matcher.matched(text) == {keyword for keyword in keywords if keyword in text}
+
+
+def test_overlapping_matches_are_all_reported():
+    matcher = KeywordMatcher(["he", "she", "his", "hers"])
+    assert list(matcher.finditer("ushers")) == [(1, 4, "she"), (2, 4, "he"), (2, 6, "hers")]
+
+
+def test_nested_keywords_are_all_reported():
+    matcher = KeywordMatcher(["ethnic", "ethnic cleansing", "cleansing", "cleans"])
+    assert sorted(matcher.finditer("ethnic cleansing")) == [
+        (0, 6, "ethnic"), (0, 16, "ethnic cleansing"), (7, 13, "cleans"), (7, 16, "cleansing"),
+    ]
+    assert matcher.matched("cleansing") == {"cleansing", "cleans"}
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("animal", {"animal"}),
+    ("animals", set()),                     # followed by a letter
+    ("an animal.", {"animal"}),
+    ("(animal)", {"animal"}),
+    ("animal2", set()),                     # followed by a digit
+    ("sub-human rhetoric", {"sub-human", "human"}),  # "-" is a boundary for the nested word
+    ("inhuman", set()),
+    ("dehumanization", set()),              # stems only match as whole words
+    ("dehumaniz", {"dehumaniz"}),
+    ("der stürmer's", {"der stürmer"}),
+    ("derstürmer", set()),
+])
+def test_word_boundary(text, expected):
+    matcher = KeywordMatcher(["animal", "sub-human", "dehumaniz", "der stürmer", "human"], word_boundary=True)
+    assert matcher.matched(text) == expected
+
+
+def test_word_boundary_keeps_overlapping_whole_words():
+    matcher = KeywordMatcher(["ethnic", "ethnic cleansing", "cleansing"], word_boundary=True)
+    assert matcher.matched("ethnic cleansing") == {"ethnic", "ethnic cleansing", "cleansing"}
+    assert matcher.matched("ethniccleansing") == set()
+
+
+def test_keywords_are_deduplicated_and_must_be_non_empty():
+    assert KeywordMatcher(["famine", "famine", "war"]).keywords == ["famine", "war"]
+    with pytest.raises(ValueError):
+        KeywordMatcher(["famine", ""])
+
+
+def test_match_across_fields_is_attributed_to_the_field_it_starts_in():
+    event = {"analysis": {"root_causes": "Declared martial", "pattern_note": "law everywhere", "tier": ""}}
+    tags, evidence = detect_patterns_with_evidence(event)
+    assert "EMERGENCY_LAWS" in tags
+    assert {"keyword": "martial law", "field": "analysis.root_causes", "start": 9, "end": 20} \
+        in evidence["EMERGENCY_LAWS"]
@@ -0,0 +1,20 @@
+import pytest
+
+from hpi.rollup import Rollup
+
+
+def event(start, end=None, tier="Tier 1"):
+    period = {"start": start} if end is None else {"start": start, "end": end}
+    return {"period": period, "analysis": {"tier": tier}, "metrics": {"mortality": {"min": 1, "max": 2}}}
+
+
+@pytest.mark.parametrize("events, year_min, year_max", [
+    ([event(1800, 1850), event(1900, 1910)], 1800, 1910),
+    ([event(1800, 1850), event(1900)], 1800, 1900),      # open-ended: its start is the latest year
+    ([event(1800, 1750), event(1760, 1770)], 1750, 1800),  # end before start, as calcStats takes it
+    ([event(1900)], 1900, 1900),
+])
+def test_years_span_every_start_and_end(events, year_min, year_max):
+    total = Rollup(events).total
+    assert (total.year_min, total.year_max) == (year_min, year_max)
+
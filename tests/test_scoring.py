@@ -0,0 +1,34 @@
+import pytest
+
+from hpi.scoring import ScoreEngine, get_engine
+
+np = pytest.importorskip("numpy")
+
+
+def test_table_matches_the_historical_formula():
+    engine = get_engine()
+    for category, keys in engine.categories.items():
+        for mask in range(1 << len(keys)):
+            assert engine.score(category, mask) == int(bin(mask).count("1") / len(keys) * 100)
+
+
+def test_score_array_matches_score():
+    engine = get_engine()
+    for category, keys in engine.categories.items():
+        masks = np.arange(-1, 1 << len(keys), dtype=np.int32)
+        expected = [-1] + [engine.score(category, mask) for mask in range(1 << len(keys))]
+        assert engine.score_array(category, masks).tolist() == expected
+
+
+def test_score_array_without_a_table():
+    # 20 keys is over MAX_TABLE_BITS, so scores come from a vectorized popcount
+    engine = ScoreEngine({"wide": tuple(f"k{i}" for i in range(20))})
+    masks = np.array([-1, 0, 1, 0b111, (1 << 20) - 1, 0b10101010101], dtype=np.int32)
+    assert engine.score_array("wide", masks).tolist() == [-1, 0, 5, 15, 100, 30]
+    assert engine.score_array("wide", masks[1:]).tolist() == engine.score_masks("wide", masks[1:].tolist())
+
+
+def test_score_array_keeps_the_shape():
+    engine = get_engine()
+    masks = np.array([[0, -1], [3, 7]], dtype=np.int32)
+    assert engine.score_array("profit", masks).tolist() == [[0, -1], [40, 60]]
@@ -0,0 +1,65 @@
+import random
+
+import pytest
+
+from hpi.sketches import ROLES, HyperLogLog, StatsSketch, TDigest, check
+from sketch_stats import compare_distinct
+
+REGIONS = ["Europe", "Asia", "Africa", "Americas"]
+
+
+def synthetic_events(start, stop, names=20_000):
+    """Deterministic events with participants drawn from a pool of `names` and skewed mortality."""
+    for i in range(start, stop):
+        rng = random.Random(i)
+        yield {
+            "geography": {"region": REGIONS[i % len(REGIONS)]},
+            "participants": {role: [f"{role} {rng.randrange(names)}" for _ in range(rng.randint(0, 3))]
+                             for role in ROLES},
+            "metrics": {"mortality": {"min": round(rng.lognormvariate(8, 2)),
+                                      "max": round(rng.lognormvariate(9, 2))}},
+        }
+
+
+def test_merged_shards_are_within_the_error_bounds():
+    count, shards = 20_000, 4
+    merged = StatsSketch()
+    for shard in range(shards):
+        merged.merge(StatsSketch().update(synthetic_events(count * shard // shards, count * (shard + 1) // shards)))
+
+    assert check(merged, synthetic_events(0, count)) == []
+    single = StatsSketch().update(synthetic_events(0, count))
+    assert compare_distinct(merged, single) == []
+    assert check(single, synthetic_events(0, count)) == []
+
+
+def test_check_reports_estimates_outside_the_bounds():
+    sketch = StatsSketch().update(synthetic_events(0, 5_000))
+    problems = check(sketch, synthetic_events(5_000, 10_000))
+    assert problems
+    assert compare_distinct(sketch, StatsSketch().update(synthetic_events(0, 4_000)))
+
+
+def test_hyperloglog_merge_is_lossless():
+    a, b, both = HyperLogLog(), HyperLogLog(), HyperLogLog()
+    a.update(range(0, 6_000))
+    b.update(range(4_000, 10_000))
+    both.update(range(0, 10_000))
+    assert a.merge(b).registers == both.registers
+    assert abs(both.count() - 10_000) <= 3 * both.relative_error * 10_000
+
+
+def test_hyperloglog_precisions_do_not_merge():
+    with pytest.raises(ValueError):
+        HyperLogLog(10).merge(HyperLogLog(12))
+
+
+def test_tdigest_min_max_are_exact_and_quantiles_ordered():
+    digest = TDigest()
+    values = [random.Random(i).expovariate(1e-4) for i in range(20_000)]
+    digest.update(values)
+    assert digest.quantile(0) == min(values)
+    assert digest.quantile(1) == max(values)
+    quantiles = [digest.quantile(q / 100) for q in range(101)]
+    assert quantiles == sorted(quantiles)
+    assert TDigest().quantile(0.5) is None
@@ -0,0 +1,69 @@
+import hashlib
+import os
+
+from hpi.corpus import load_events, load_knowledge_lost, load_knowledge_saved
+from hpi.joins import Joins
+from update_readme import (DENIED_TABLE_ROWS, GENERATOR_FILES, calc_stats, file_digest, generate_denied_table,
+                           hash_files, stream_corpus)
+
+
+def denied_event(i):
+    return {"name": f"Event {i}", "denial_status": "denied", "participants": {"perpetrators": ["State"]},
+            "metrics": {"mortality": {"min": i * 1000, "max": i * 1000}}}
+
+
+def test_denied_table_lists_every_denied_event():
+    events = [denied_event(i) for i in range(DENIED_TABLE_ROWS + 5)]
+    rows = generate_denied_table(calc_stats(events)).splitlines()[2:]
+    assert len(rows) == DENIED_TABLE_ROWS + 5
+    assert rows[0].startswith(f"| Event {DENIED_TABLE_ROWS + 4} |")
+
+
+def test_stream_mode_keeps_the_deadliest_denied_events():
+    events = [denied_event(i) for i in range(DENIED_TABLE_ROWS + 5)]
+    full = generate_denied_table(calc_stats(events)).splitlines()
+    streamed = generate_denied_table(calc_stats(iter(events), stream=True)).splitlines()
+    assert streamed == full[:2 + DENIED_TABLE_ROWS]
+
+
+def test_stream_mode_renders_the_corpus_stats_the_same():
+    lost, saved = load_knowledge_lost(), load_knowledge_saved()
+    events = load_events()
+    stats = calc_stats(events, Joins(events, lost, saved))
+    streamed, _, _, _ = stream_corpus(lost, saved)
+    assert generate_denied_table(streamed) == generate_denied_table(stats)
+    for key in ("count", "deaths_min", "deaths_max", "year_span", "by_tier", "by_region", "denial_counts"):
+        assert streamed[key] == stats[key], key
+
+
+def test_generator_files_cover_the_hpi_modules():
+    names = {path.name for path in GENERATOR_FILES}
+    assert {"update_readme.py", "corpus.py", "audit.py", "scoring.py", "jsonl.py", "sketches.py"} <= names
+
+
+def test_unchanged_files_are_not_read_again(tmp_path):
+    path = tmp_path / "event.json"
+    path.write_text('{"id": "a"}\n', encoding="utf-8")
+    files = {}
+    assert file_digest(path, {}, files) == hashlib.sha256(b'{"id": "a"}\n').hexdigest()
+
+    # Same mtime and size: the recorded digest is trusted
+    stat = os.stat(path)
+    known = {str(path): [stat.st_mtime_ns, stat.st_size, "recorded"]}
+    assert file_digest(path, known, {}) == "recorded"
+
+    # Any change in size or mtime hashes the contents again
+    path.write_text('{"id": "ab"}\n', encoding="utf-8")
+    assert file_digest(path, known, files) == hashlib.sha256(b'{"id": "ab"}\n').hexdigest()
+    assert files[str(path)][2] == hashlib.sha256(b'{"id": "ab"}\n').hexdigest()
+
+
+def test_missing_files_drop_out_of_the_state(tmp_path):
+    kept, gone = tmp_path / "kept.json", tmp_path / "gone.json"
+    kept.write_text("{}", encoding="utf-8")
+    known = {str(gone): [0, 2, "old"]}
+    files = {}
+    before = hash_files([kept, gone], known, files)
+    assert list(files) == [str(kept)]
+    assert hash_files([kept, gone], files, {}) == before
+    assert hash_files([kept], files, {}) != before
@@ -0,0 +1,96 @@
+import json
+
+import pytest
+
+from hpi.corpus import write_event
+from hpi.wikipedia import WikipediaResolver
+from verify_wikipedia_links import process_events
+
+WIKI = "https://en.wikipedia.org/wiki/"
+
+EVENTS = [
+    {"id": "opium", "name": "British Opium Trade in China", "wikipedia_url": WIKI + "Opium_Wars"},
+    {"id": "seyfo", "name": "Assyrian Genocide (Seyfo)", "wikipedia_url": WIKI + "Seyfo"},
+    {"id": "holodomor", "name": "Holodomor", "wikipedia_url": WIKI + "Holodomor"},
+    {"id": "unlinked", "name": "Unlinked"},
+]
+LOST = [
+    {"name": "Dead Sea Scrolls", "wikipedia_url": WIKI + "Dead_Sea_Scrolls"},
+    {"name": "Qumran fragments", "wikipedia_url": WIKI + "Dead_Sea_Scrolls"},
+    {"name": "Library of Alexandria", "wikipedia_url": WIKI + "Library_of_Alexandria"},
+]
+SAVED = [
+    {"name": "Canton archives", "wikipedia_url": WIKI + "Opium_Wars"},
+]
+
+
+@pytest.fixture
+def link_corpus(tmp_path):
+    """A small corpus with renamed, missing and current links: (events dir, knowledge paths)."""
+    events_dir = tmp_path / "events"
+    events_dir.mkdir()
+    for event in EVENTS:
+        write_event(events_dir / f"{event['id']}.json", event)
+    knowledge = []
+    for name, entries in (("knowledge_lost.json", LOST), ("knowledge_saved.json", SAVED)):
+        path = tmp_path / name
+        path.write_text(json.dumps(entries, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+        knowledge.append(path)
+    return events_dir, knowledge
+
+
+def run(server, link_corpus, dry_run):
+    events_dir, knowledge = link_corpus
+    with WikipediaResolver(server.url, rate=0, workers=2) as resolver:
+        return process_events(dry_run=dry_run, resolver=resolver, events_dir=events_dir, knowledge_paths=knowledge)
+
+
+def test_finds_renamed_and_missing_articles(wikipedia_api, link_corpus, capsys):
+    events_dir, knowledge = link_corpus
+    before = {path: path.read_bytes() for path in [*events_dir.iterdir(), *knowledge]}
+
+    report = run(wikipedia_api, link_corpus, dry_run=True)
+
+    out = capsys.readouterr().out
+    assert f"{WIKI}Opium_Wars\n  → {WIKI}First_Opium_War" in out
+    assert f"{WIKI}Dead_Sea_Scrolls\n  → {WIKI}Dead_Sea_scrolls" in out
+    assert report.collected["missing"] == ["Assyrian Genocide (Seyfo)"]
+    assert sorted(path.name for path in report.written) == ["knowledge_lost.json", "knowledge_saved.json", "opium.json"]
+
+    # One batch for every distinct title, then one for the MANUAL_SEARCH retry ("Seyfo")
+    queries = [params["titles"].split("|") for _, _, params in wikipedia_api.log]
+    assert sorted(queries[0]) == ["Dead Sea Scrolls", "Holodomor", "Library of Alexandria", "Opium Wars", "Seyfo"]
+    assert queries[1:] == [["Seyfo"]]
+
+    # A dry run writes nothing
+    assert {path: path.read_bytes() for path in before} == before
+
+
+def test_rewrites_every_occurrence_and_counts_it(wikipedia_api, link_corpus, capsys):
+    events_dir, (lost_path, saved_path) = link_corpus
+    lost_before = lost_path.read_text(encoding="utf-8")
+
+    report = run(wikipedia_api, link_corpus, dry_run=False)
+
+    # 1 event + 2 lost entries sharing a URL + 1 saved entry
+    assert report.counts["updated"] == 4
+    assert "Updated: 4" in capsys.readouterr().out
+    assert report.unchanged == 3  # holodomor, seyfo, unlinked
+
+    assert json.loads((events_dir / "opium.json").read_text(encoding="utf-8"))["wikipedia_url"] == \
+        WIKI + "First_Opium_War"
+    assert json.loads(lost_path.read_text(encoding="utf-8")) == [
+        {"name": "Dead Sea Scrolls", "wikipedia_url": WIKI + "Dead_Sea_scrolls"},
+        {"name": "Qumran fragments", "wikipedia_url": WIKI + "Dead_Sea_scrolls"},
+        {"name": "Library of Alexandria", "wikipedia_url": WIKI + "Library_of_Alexandria"},
+    ]
+    assert json.loads(saved_path.read_text(encoding="utf-8")) == [
+        {"name": "Canton archives", "wikipedia_url": WIKI + "First_Opium_War"},
+    ]
+    # Only the URLs change; the hand-formatted layout is kept
+    assert lost_path.read_text(encoding="utf-8") == lost_before.replace("Dead_Sea_Scrolls", "Dead_Sea_scrolls")
+
+    # A second run finds nothing left to update
+    report = run(wikipedia_api, link_corpus, dry_run=False)
+    assert report.counts["updated"] == 0
+    assert report.written == []
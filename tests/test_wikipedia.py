@@ -0,0 +1,70 @@
+import pytest
+
+from hpi.wikipedia import QUERY_BATCH, Match, Page, WikipediaResolver
+
+
+def query_batches(server):
+    return [params["titles"].split("|") for _, _, params in server.log if params["action"] == "query"]
+
+
+def test_titles_are_batched(wikipedia_api):
+    titles = [f"Event {i}" for i in range(2 * QUERY_BATCH + 20)] + ["Opium_Wars", "Seyfo", "Opium_Wars"]
+    with WikipediaResolver(wikipedia_api.url, rate=0, workers=2) as resolver:
+        pages = resolver.query_titles(titles)
+
+    batches = query_batches(wikipedia_api)
+    assert len(batches) == 3
+    assert all(len(batch) <= QUERY_BATCH for batch in batches)
+    assert sorted(title for batch in batches for title in batch) == sorted(set(titles))
+
+    assert pages["Opium_Wars"] == Page("First Opium War")  # normalized, then two redirects
+    assert pages["Seyfo"] == Page(None, missing=True)
+    assert pages["Event 7"] == Page("Event 7")
+
+
+def test_rate_limit_holds_across_workers(wikipedia_api):
+    rate, workers, queries = 40, 4, 24
+    with WikipediaResolver(wikipedia_api.url, rate=rate, workers=workers) as resolver:
+        matches = resolver.search_many(f"Event {i}" for i in range(queries))
+
+    assert matches["Event 3"] == Match("Event 3", "https://en.wikipedia.org/wiki/Event_3")
+    times = sorted(t for t, _, _ in wikipedia_api.log)
+    assert len(times) == queries
+    # The bucket saves up at most `workers` tokens, so any k + 1 requests span
+    # at least (k - workers + 1) / rate seconds
+    for i in range(queries):
+        for j in range(i + workers, queries):
+            assert times[j] - times[i] >= (j - i - workers + 1) / rate - 0.01
+
+
+def test_connections_are_reused_across_calls(wikipedia_api):
+    with WikipediaResolver(wikipedia_api.url, rate=0, workers=1) as resolver:
+        resolver.query_titles(["Holodomor"])
+        resolver.query_titles(["Nakba"])
+        resolver.search_many(["Mfecane", "Seyfo"])
+        assert resolver.requests == 4
+        assert resolver.pool.opened == 1
+    assert len({port for _, port, _ in wikipedia_api.log}) == 1
+
+
+def test_workers_keep_their_connections(wikipedia_api):
+    with WikipediaResolver(wikipedia_api.url, rate=0, workers=2) as resolver:
+        for _ in range(3):
+            resolver.search_many([f"Event {i}" for i in range(10)])
+        assert resolver.requests == 30  # no response cache
+        assert resolver.pool.opened <= 2
+
+
+def test_closed_resolver_can_be_reused(wikipedia_api):
+    resolver = WikipediaResolver(wikipedia_api.url, rate=0, workers=1)
+    resolver.search_many(["Holodomor"])
+    resolver.close()
+    assert resolver.search_many(["Nakba"])["Nakba"].title == "Nakba"
+    resolver.close()
+    assert resolver.pool.opened == 2
+
+
+@pytest.mark.parametrize("url", ["ftp://example.org/w/api.php", "example.org"])
+def test_unsupported_api_url(url):
+    with pytest.raises(ValueError):
+        WikipediaResolver(url)